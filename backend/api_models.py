@@ -1,7 +1,8 @@
 import json
-from typing import Any, Dict, List, Optional
+import math
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from export_helpers import _has_cjk_text
 from pilot_store import (
@@ -21,7 +22,10 @@ from api_validation import (
     MAX_ADMIN_NAME_LENGTH,
     MAX_ADMIN_NOTES_LENGTH,
     MAX_ADMIN_SOURCE_LENGTH,
+    MAX_AGENT_SUMMARY_BATCH_QUERIES,
     MAX_ALIAS_TEXT_LENGTH,
+    MAX_BATCH_JOB_ROWS,
+    MAX_CAS_TRIAGE_ROWS,
     MAX_CORRECTION_CONTEXT_CHARS,
     MAX_CORRECTION_SOURCE_LENGTH,
     MAX_CORRECTION_TEXT_LENGTH,
@@ -33,14 +37,20 @@ from api_validation import (
     MAX_EXPORT_ROW_JSON_CHARS,
     MAX_EXPORT_ROWS,
     MAX_EXPORT_SCALAR_CHARS,
+    MAX_LABEL_DOCUMENT_CAS,
+    MAX_LABEL_DOCUMENT_COPIES,
+    MAX_LABEL_DOCUMENT_PAGES,
+    MAX_MENTION_TEXT_CHARS,
     MAX_MISS_CONTEXT_ITEMS,
     MAX_MISS_CONTEXT_JSON_CHARS,
     MAX_MISS_ENDPOINT_LENGTH,
     MAX_MISS_QUERY_KIND_LENGTH,
     MAX_MISS_QUERY_LENGTH,
     MAX_PUBLIC_CAS_QUERY_LENGTH,
+    MAX_PUBLIC_SEARCH_QUERY_LENGTH,
     MAX_REFERENCE_PRIORITY,
     MAX_WORKSPACE_DOCUMENT_JSON_CHARS,
+    MAX_TELEMETRY_BATCH_EVENTS,
     MAX_TELEMETRY_META_JSON_CHARS,
     MAX_TELEMETRY_META_KEYS,
     MISS_QUERY_STATUSES,
@@ -70,6 +80,67 @@ class CASQuery(BaseModel):
         return normalized_values
 
 
+class BatchSearchJobRequest(CASQuery):
+    cas_numbers: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_JOB_ROWS)
+
+
+class LabelDocumentRequest(BaseModel):
+    """CAS numbers and layout options for a label sheet built server-side."""
+
+    cas_numbers: List[str] = Field(..., min_length=1, max_length=MAX_LABEL_DOCUMENT_CAS)
+    copies: int = Field(1, ge=1, le=MAX_LABEL_DOCUMENT_COPIES)
+    template: Literal["icon", "standard", "full"] = "standard"
+    label_size: Literal["small", "medium", "large"] = "medium"
+    page_size: Literal["A4", "Letter"] = "A4"
+    orientation: Literal["portrait", "landscape"] = "portrait"
+    columns: int = Field(2, ge=1, le=6)
+    rows: int = Field(4, ge=1, le=10)
+    margin_mm: float = Field(5, ge=0, le=20)
+    locale: Literal["zh-TW", "en"] = "zh-TW"
+
+    @field_validator("cas_numbers")
+    @classmethod
+    def cas_numbers_must_stay_bounded(cls, value: List[str]) -> List[str]:
+        return CASQuery.cas_numbers_must_stay_bounded(value)
+
+    @model_validator(mode="after")
+    def sheet_must_fit_the_page_budget(self) -> "LabelDocumentRequest":
+        labels = len(self.cas_numbers) * self.copies
+        if math.ceil(labels / (self.columns * self.rows)) > MAX_LABEL_DOCUMENT_PAGES:
+            raise ValueError(f"label sheet would exceed {MAX_LABEL_DOCUMENT_PAGES} pages")
+        return self
+
+
+class CASTriageRequest(BaseModel):
+    """Raw inventory cells; blanks and malformed tokens are triaged, not rejected."""
+
+    cas_numbers: List[str] = Field(..., min_length=1, max_length=MAX_CAS_TRIAGE_ROWS)
+
+    @field_validator("cas_numbers")
+    @classmethod
+    def cas_tokens_must_stay_bounded(cls, value: List[str]) -> List[str]:
+        if any(len(item) > MAX_PUBLIC_CAS_QUERY_LENGTH for item in value):
+            raise ValueError("CAS query is too long")
+        return value
+
+
+class AgentLabelSummaryBatchRequest(BaseModel):
+    """CAS numbers and chemical names, mixed; blank entries become per-item errors."""
+
+    queries: List[str] = Field(..., min_length=1, max_length=MAX_AGENT_SUMMARY_BATCH_QUERIES)
+
+    @field_validator("queries")
+    @classmethod
+    def queries_must_stay_bounded(cls, value: List[str]) -> List[str]:
+        if any(len(item) > MAX_PUBLIC_SEARCH_QUERY_LENGTH for item in value):
+            raise ValueError("Query is too long")
+        return value
+
+
+class MentionExtractionRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=MAX_MENTION_TEXT_CHARS)
+
+
 class GHSReport(BaseModel):
     """Single GHS classification report."""
 
@@ -125,6 +196,10 @@ class TelemetryEventPayload(BaseModel):
         return value
 
 
+class TelemetryBatchPayload(BaseModel):
+    events: List[TelemetryEventPayload] = Field(..., min_length=1, max_length=MAX_TELEMETRY_BATCH_EVENTS)
+
+
 def _validate_export_value(value: Any, *, depth: int = 0) -> None:
     if depth > MAX_EXPORT_NESTING_DEPTH:
         raise ValueError("export payload is too deeply nested")
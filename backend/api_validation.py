@@ -30,7 +30,15 @@ REFERENCE_LINK_TYPE_PRIORITY = {
 }
 MAX_EXPORT_ROWS = 500
 MAX_PUBLIC_CAS_QUERY_LENGTH = 64
+MAX_BATCH_JOB_ROWS = 10_000
+MAX_CAS_TRIAGE_ROWS = 50_000
+MAX_AGENT_SUMMARY_BATCH_QUERIES = 200
+MAX_LABEL_DOCUMENT_CAS = 200
+MAX_LABEL_DOCUMENT_COPIES = 20
+MAX_LABEL_DOCUMENT_PAGES = 200
 MAX_PUBLIC_SEARCH_QUERY_LENGTH = 240
+MAX_MENTION_TEXT_CHARS = 1_000_000
+MAX_MENTION_SPANS_PER_CAS = 50
 MAX_EXPORT_PAYLOAD_JSON_CHARS = 4_000_000
 MAX_EXPORT_ROW_JSON_CHARS = 40_000
 MAX_EXPORT_DICT_KEYS = 80
@@ -54,6 +62,7 @@ ALLOWED_MISS_CONTEXT_KEYS = {
 MAX_WORKSPACE_DOCUMENT_JSON_CHARS = 200000
 MAX_TELEMETRY_META_JSON_CHARS = 2000
 MAX_TELEMETRY_META_KEYS = 24
+MAX_TELEMETRY_BATCH_EVENTS = 50
 MAX_ADMIN_CAS_LENGTH = 32
 MAX_ADMIN_NAME_LENGTH = 240
 MAX_ADMIN_NOTES_LENGTH = 1000
@@ -0,0 +1,174 @@
+"""Background runner for inventory-scale batch search jobs.
+
+``POST /api/search`` holds the request open for every row, which is fine for
+a pasted list of a few dozen CAS numbers but not for a 2,000-8,000 row
+inventory sheet. A job stores its rows in the pilot store, and a small,
+fixed pool of worker tasks looks up each distinct CAS once. Every lookup still
+goes through the process-wide PubChem semaphore and request pacing, and the
+pool is deliberately smaller than that semaphore, so interactive searches keep
+upstream slots while a job drains.
+
+Results are written to SQLite as they finish. Jobs that were still queued or
+running when the process stopped are picked up again on the next startup;
+only lookups without a stored result are repeated. Jobs untouched for longer
+than the retention window are purged at startup and then periodically, so a
+long-running process does not accumulate them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from pilot_store import (
+    DEFAULT_BATCH_SEARCH_JOB_RETENTION_HOURS,
+    DEFAULT_MAX_ACTIVE_BATCH_SEARCH_JOBS,
+    PilotStore,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_JOB_WORKERS = 2
+DEFAULT_BATCH_JOB_PURGE_INTERVAL_SECONDS = 3600
+
+BatchLookup = Callable[[str], Awaitable[dict[str, Any]]]
+
+
+class BatchSearchJobRunner:
+    def __init__(
+        self,
+        *,
+        get_store: Callable[[], PilotStore],
+        lookup: BatchLookup,
+        lookup_key: Callable[[str], str],
+        workers: int = DEFAULT_BATCH_JOB_WORKERS,
+        max_active_jobs: int = DEFAULT_MAX_ACTIVE_BATCH_SEARCH_JOBS,
+        retention_hours: int = DEFAULT_BATCH_SEARCH_JOB_RETENTION_HOURS,
+        purge_interval_seconds: float = DEFAULT_BATCH_JOB_PURGE_INTERVAL_SECONDS,
+        on_purged: Optional[Callable[[int], None]] = None,
+    ):
+        self._get_store = get_store
+        self._lookup = lookup
+        self._lookup_key = lookup_key
+        self.worker_count = max(1, int(workers))
+        self.max_active_jobs = max(1, int(max_active_jobs))
+        self.retention_hours = max(1, int(retention_hours))
+        self.purge_interval_seconds = max(0.0, float(purge_interval_seconds))
+        self._on_purged = on_purged
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._purger: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def pending_lookups(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def startup(self) -> int:
+        """Purge expired jobs, start the worker pool and re-queue unfinished
+        jobs; returns their count."""
+        if self._workers:
+            return 0
+        self.purge_expired()
+        self._queue = asyncio.Queue()
+        store = self._get_store()
+        job_ids = store.list_active_batch_search_job_ids()
+        for job_id in job_ids:
+            self._enqueue_pending(store, job_id)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"batch-search-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        if self.purge_interval_seconds:
+            self._purger = asyncio.create_task(self._purge_periodically(), name="batch-search-purge")
+        if job_ids:
+            logger.info(
+                "Resumed %d unfinished batch search job(s) with %d pending lookups",
+                len(job_ids),
+                self._queue.qsize(),
+            )
+        return len(job_ids)
+
+    async def shutdown(self) -> None:
+        workers, self._workers = self._workers, []
+        if self._purger is not None:
+            workers.append(self._purger)
+            self._purger = None
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    def submit(self, queries: Iterable[str]) -> dict[str, Any]:
+        """Persist a job and queue its distinct lookups.
+
+        Raises ``RuntimeError`` if the runner has not been started and
+        ``BatchSearchJobLimitError`` when too many jobs are still active.
+        """
+        if self._queue is None:
+            raise RuntimeError("batch search job runner is not running")
+        store = self._get_store()
+        job = store.create_batch_search_job(
+            ((query, self._lookup_key(query)) for query in queries),
+            max_active_jobs=self.max_active_jobs,
+        )
+        self._enqueue_pending(store, job["job_id"])
+        return job
+
+    async def join(self) -> None:
+        """Wait until every queued lookup has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def purge_expired(self) -> int:
+        """Delete jobs past the retention window; returns how many."""
+        purged = self._get_store().purge_expired_batch_search_jobs(retention_hours=self.retention_hours)
+        if self._on_purged is not None:
+            self._on_purged(purged)
+        return purged
+
+    async def _purge_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval_seconds)
+            try:
+                self.purge_expired()
+            except Exception:
+                logger.exception("Could not purge expired batch search jobs")
+
+    def _enqueue_pending(self, store: PilotStore, job_id: str) -> None:
+        assert self._queue is not None
+        for lookup_key, query in store.list_pending_batch_search_lookups(job_id):
+            self._queue.put_nowait((job_id, lookup_key, query))
+
+    async def _work(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            job_id, lookup_key, query = await queue.get()
+            try:
+                try:
+                    result = await self._lookup(query)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # One broken row must not stall the job at 99%; report it
+                    # the way the synchronous batch route reports upstream
+                    # failures so the user can retry that row.
+                    logger.exception("Batch search lookup failed for %s", query)
+                    result = {
+                        "cas_number": query,
+                        "found": False,
+                        "upstream_error": True,
+                        "error": "Lookup failed",
+                    }
+                self._get_store().record_batch_search_job_result(job_id, lookup_key, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Could not store batch search result for job %s", job_id)
+            finally:
+                queue.task_done()
@@ -0,0 +1,131 @@
+"""Local-only triage of inventory-sized CAS token lists.
+
+Answers, before any PubChem budget is spent, which rows of an inventory are
+invalid, repeat an earlier row, are already answerable from the GHS cache, or
+genuinely need an upstream lookup. Nothing here performs I/O: dictionary and
+cache membership are supplied by the caller and checked once per distinct
+CAS number.
+
+Inventories repeat the same cell text heavily, so each distinct raw token is
+normalized once with the workbook audit's tolerant normalizer; tokens that
+are already canonical ``NNNNN-NN-N`` strings skip it entirely. Checksums are
+then validated over the distinct normalized numbers in one pass.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Collection, Iterable, Optional, Sequence
+
+from api_validation import CAS_FORMAT_PATTERN
+from cas_tokens import normalize_cas_token_detailed
+
+TRIAGE_CATEGORIES = ("invalid", "duplicate", "cached", "needs_upstream")
+
+# Weights for the check digit: the rightmost non-check digit has weight 1.
+_CHECKSUM_WEIGHTS = tuple(range(1, 11))
+
+
+def _canonical_cas(token: str) -> Optional[str]:
+    """Return ``token`` when it already is a canonical CAS string."""
+    if CAS_FORMAT_PATTERN.fullmatch(token) and not token.startswith("0"):
+        return token
+    return None
+
+
+def _normalize_distinct_tokens(tokens: Iterable[Any]) -> dict[Any, tuple[str, str]]:
+    """Map each distinct raw token to ``(normalized, format_error_reason)``."""
+    normalized: dict[Any, tuple[str, str]] = {}
+    for token in tokens:
+        if token in normalized:
+            continue
+        canonical = _canonical_cas(token) if isinstance(token, str) else None
+        if canonical is not None:
+            normalized[token] = (canonical, "")
+            continue
+        detail = normalize_cas_token_detailed(token)
+        if not detail["formatValid"]:
+            reason = "empty" if not detail["rawNormalized"] else "format"
+            normalized[token] = (detail["normalized"], reason)
+        else:
+            normalized[token] = (detail["normalized"], "")
+    return normalized
+
+
+def valid_checksums(cas_numbers: Iterable[str]) -> set[str]:
+    """Return the format-valid CAS numbers whose check digit matches."""
+    valid = set()
+    weights = _CHECKSUM_WEIGHTS
+    for cas in cas_numbers:
+        digits = cas.replace("-", "")
+        body = digits[-2::-1]
+        checksum = sum(weight * (ord(char) - 48) for weight, char in zip(weights, body))
+        if checksum % 10 == ord(digits[-1]) - 48:
+            valid.add(cas)
+    return valid
+
+
+def triage_cas_tokens(
+    tokens: Sequence[Any],
+    *,
+    known_cas: Collection[str] = frozenset(),
+    cached_cas: Callable[[set[str]], Collection[str]] = lambda cas_numbers: (),
+) -> dict[str, Any]:
+    """Classify every row of ``tokens`` without touching the network.
+
+    ``known_cas`` is the set of CAS numbers the local dictionary can name and
+    ``cached_cas`` receives the distinct valid CAS numbers and returns the
+    ones whose GHS data is already cached. Each row gets exactly one
+    category from ``TRIAGE_CATEGORIES``; ``in_dictionary`` is reported
+    alongside because a dictionary hit supplies names but not GHS data.
+    """
+    normalized_by_token = _normalize_distinct_tokens(tokens)
+    format_valid = {
+        normalized
+        for normalized, reason in normalized_by_token.values()
+        if not reason
+    }
+    checksum_valid = valid_checksums(format_valid)
+    in_dictionary = {cas for cas in checksum_valid if cas in known_cas}
+    cached = set(cached_cas(checksum_valid)) & checksum_valid
+
+    counts = {category: 0 for category in TRIAGE_CATEGORIES}
+    counts["in_dictionary"] = 0
+    first_row_by_cas: dict[str, int] = {}
+    upstream_cas_numbers: list[str] = []
+    rows = []
+    for index, token in enumerate(tokens):
+        normalized, reason = normalized_by_token[token]
+        first_index = None
+        if reason:
+            category = "invalid"
+        elif normalized not in checksum_valid:
+            category, reason = "invalid", "checksum"
+        elif normalized in first_row_by_cas:
+            category = "duplicate"
+            first_index = first_row_by_cas[normalized]
+        else:
+            first_row_by_cas[normalized] = index
+            if normalized in cached:
+                category = "cached"
+            else:
+                category = "needs_upstream"
+                upstream_cas_numbers.append(normalized)
+        known = category != "invalid" and normalized in in_dictionary
+        counts[category] += 1
+        counts["in_dictionary"] += known
+        rows.append({
+            "index": index,
+            "cas_number": normalized if category != "invalid" else None,
+            "category": category,
+            "reason": reason or None,
+            "duplicate_of": first_index,
+            "in_dictionary": known,
+        })
+
+    counts["total"] = len(rows)
+    counts["unique"] = len(first_row_by_cas)
+    return {
+        "counts": counts,
+        "upstream_cas_numbers": upstream_cas_numbers,
+        "rows": rows,
+    }
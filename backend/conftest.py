@@ -0,0 +1,6 @@
+import os
+
+# Tests that do not swap in their own store use backend/data/pilot.db, and the
+# name-index snapshot is written next to the store. Keep it off so test runs
+# leave no snapshot in the tree; snapshot tests opt back in with tmp_path.
+os.environ.setdefault("NAME_INDEX_SNAPSHOT", "off")
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import math
 import re
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 from openpyxl import load_workbook
 
-from api_validation import CAS_FORMAT_PATTERN, has_valid_cas_checksum
+from api_validation import has_valid_cas_checksum
 from candidate_discovery import build_candidate_bundle, clean_text, has_cjk
+from cas_tokens import normalize_cas_token_detailed, normalize_cell_text, to_half_width
 from chemical_dict import CAS_TO_EN, CAS_TO_ZH
 
 AUDIT_SOURCE = "inventory-workbook-audit"
@@ -21,10 +21,6 @@ HANDOFF_RECORD_KEYS = (
     "duplicates",
 )
 
-CAS_DIGITS_PATTERN = re.compile(r"^\d{5,10}$")
-CAS_PREFIX_PATTERN = re.compile(r"^cas\s*(?:no\.?|number|#|[:\uff1a])?\s*", re.I)
-DASH_PATTERN = re.compile(r"[\u2010-\u2015\u2212\ufe58\ufe63\uff0d]")
-TRAILING_PUNCTUATION_PATTERN = re.compile(r"[\.,;:\uff0c\u3002\uff1b\uff1a]+$")
 HEADER_STRIP_PATTERN = re.compile(r"[\s\.:#_/\-()\uff08\uff09]+")
 
 KNOWN_CAS_HEADER_CELLS = frozenset(
@@ -72,28 +68,6 @@ CHINESE_NAME_HEADER_CELLS = frozenset(
 )
 
 
-def to_half_width(value: Any = "") -> str:
-    text = normalize_cell_text(value)
-    return "".join(
-        chr(ord(char) - 0xFEE0) if 0xFF01 <= ord(char) <= 0xFF5E else char
-        for char in text
-    )
-
-
-def normalize_cell_text(value: Any = "") -> str:
-    if value is None:
-        return ""
-    if isinstance(value, bool):
-        return str(value)
-    if isinstance(value, int):
-        return str(value)
-    if isinstance(value, float):
-        if math.isfinite(value) and value.is_integer():
-            return str(int(value))
-        return str(value)
-    return str(value)
-
-
 def normalize_header_cell(value: Any = "") -> str:
     return HEADER_STRIP_PATTERN.sub("", to_half_width(value).strip().lower())
 
@@ -109,63 +83,6 @@ def find_header_index(row: Iterable[Any], candidates: frozenset[str]) -> Optiona
     return None
 
 
-def rehyphenate_cas_digits(value: str) -> str:
-    digits = str(value or "").strip()
-    if not CAS_DIGITS_PATTERN.fullmatch(digits):
-        return ""
-    first_group = digits[:-3]
-    if len(first_group) < 2 or len(first_group) > 7:
-        return ""
-    return f"{first_group}-{digits[-3:-1]}-{digits[-1]}"
-
-
-def canonicalize_cas_leading_zeros(value: str) -> str:
-    if not CAS_FORMAT_PATTERN.fullmatch(value):
-        return ""
-    first_group, middle_group, check_digit = value.split("-")
-    canonical_first_group = first_group.lstrip("0")
-    if not canonical_first_group or canonical_first_group == first_group:
-        return ""
-    return f"{canonical_first_group}-{middle_group}-{check_digit}"
-
-
-def normalize_cas_token_detailed(value: Any = "") -> dict[str, Any]:
-    raw = normalize_cell_text(value)
-    raw_normalized = (
-        DASH_PATTERN.sub("-", to_half_width(raw))
-        .strip()
-        .replace("\u3000", "")
-    )
-    raw_normalized = CAS_PREFIX_PATTERN.sub("", raw_normalized)
-    raw_normalized = re.sub(r"\s+", "", raw_normalized)
-    raw_normalized = re.sub(r"\.0+$", "", raw_normalized)
-    raw_normalized = TRAILING_PUNCTUATION_PATTERN.sub("", raw_normalized).strip()
-
-    rehyphenated = rehyphenate_cas_digits(raw_normalized)
-    normalized_candidate = rehyphenated or raw_normalized
-    leading_zero_canonical = canonicalize_cas_leading_zeros(normalized_candidate)
-    normalized = leading_zero_canonical or normalized_candidate
-    format_valid = bool(CAS_FORMAT_PATTERN.fullmatch(normalized))
-    checksum_valid = bool(format_valid and has_valid_cas_checksum(normalized))
-    reason = ""
-    if not format_valid:
-        reason = "format"
-    elif not checksum_valid:
-        reason = "checksum"
-
-    return {
-        "raw": raw,
-        "rawNormalized": raw_normalized,
-        "normalized": normalized,
-        "wasRehyphenated": bool(rehyphenated and rehyphenated != raw_normalized),
-        "wasLeadingZeroCanonicalized": bool(leading_zero_canonical),
-        "formatValid": format_valid,
-        "checksumValid": checksum_valid,
-        "valid": checksum_valid,
-        "reason": reason,
-    }
-
-
 def _row_value(row: tuple[Any, ...], index: Optional[int]) -> str:
     if index is None or index >= len(row):
         return ""
@@ -0,0 +1,359 @@
+"""Server-side GHS label sheets built from looked-up chemical results.
+
+The client sends CAS numbers and layout options instead of a rendered HTML
+document. Every interpolated value is escaped here, the document has no
+scripts, event handlers or remote URLs, and each pictogram SVG is embedded
+once per document as a CSS data URL that labels reference by class. That
+makes the output trusted by construction, so it skips the regex scan that
+``PrintPdfRequest`` applies to client-supplied markup.
+
+Pages use the same ``<div class="page">`` blocks as the client print
+document, so large sheets are chunked by the renderer in the same way.
+``build_label_sheet`` resolves the labels and page grid once; the HTML here
+and the native renderer in ``pdf_native`` are both drawn from that sheet.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from html import escape
+import math
+from pathlib import Path
+from string import Template
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from pdf_render import PrintPdfMeta, PrintPdfPage, PrintPdfRequest
+
+PICTOGRAM_DIR = Path(__file__).parent / "ghs_pictograms"
+PICTOGRAM_CODES = tuple(f"GHS0{index}" for index in range(1, 10))
+
+PAGE_SIZES_MM = {
+    "A4": {"portrait": (210, 297), "landscape": (297, 210)},
+    "Letter": {"portrait": (216, 279), "landscape": (279, 216)},
+}
+LABEL_GAP_MM = 3
+PAGE_NUMBER_HEIGHT_MM = 4
+
+# Font and pictogram sizes per label size, mirroring the client's
+# small/medium/large typography presets.
+TYPOGRAPHY_BY_SIZE = {
+    "small": {"font_px": 10, "title_px": 12, "signal_px": 11, "hazard_px": 8, "pictogram_mm": 9},
+    "medium": {"font_px": 12, "title_px": 14, "signal_px": 13, "hazard_px": 9, "pictogram_mm": 12},
+    "large": {"font_px": 14, "title_px": 16, "signal_px": 15, "hazard_px": 11, "pictogram_mm": 15},
+}
+# Statements shown per template and label size; None shows all of them.
+STATEMENT_BUDGETS = {
+    "icon": {"small": (0, 0), "medium": (0, 0), "large": (0, 0)},
+    "standard": {"small": (1, 0), "medium": (2, 2), "large": (3, 3)},
+    "full": {"small": (None, None), "medium": (None, None), "large": (None, None)},
+}
+LABEL_PURPOSE_BY_TEMPLATE = {"icon": "identification", "standard": "complete", "full": "complete"}
+
+_TEXT = {
+    "zh-TW": {"lang": "zh-Hant-TW", "page": "第 {current} / {total} 頁", "more": "另有 {count} 項，請參閱 SDS"},
+    "en": {"lang": "en", "page": "Page {current} of {total}", "more": "{count} more, see SDS"},
+}
+
+_DOCUMENT_TEMPLATE = Template(
+    '<!DOCTYPE html><html lang="$lang"><head><meta charset="UTF-8">'
+    "<title>GHS labels</title><style>$styles</style></head>"
+    '<body class="print-body print-template-$template">$pages</body></html>'
+)
+_PAGE_TEMPLATE = Template(
+    '<div class="page"><div class="page-grid">$labels</div>'
+    '<div class="page-number">$page_number</div></div>'
+)
+_LABEL_TEMPLATE = Template(
+    '<section class="label">'
+    '<header class="label-header"><h2 class="label-name">$name</h2>'
+    '<p class="label-subname">$subname</p><p class="label-cas">CAS $cas</p></header>'
+    '<div class="label-pictograms">$pictograms</div>'
+    "$signal$hazards$precautions"
+    "</section>"
+)
+_PICTOGRAM_TEMPLATE = Template('<span class="ghs-pic ghs-$code" role="img" aria-label="$title"></span>')
+_STATEMENTS_TEMPLATE = Template('<ul class="label-$kind">$items</ul>')
+_STYLES_TEMPLATE = Template(
+    """
+@page { size: ${page_width}mm ${page_height}mm; margin: ${margin}mm; }
+* { box-sizing: border-box; }
+html, body { margin: 0; padding: 0; }
+body { font-family: 'Microsoft JhengHei', 'PingFang TC', 'Noto Sans TC', 'Helvetica Neue', Arial, sans-serif; font-size: ${font_px}px; color: #000; }
+.page { position: relative; height: ${content_height}mm; page-break-after: always; overflow: hidden; }
+.page:last-child { page-break-after: auto; }
+.page-grid { display: grid; grid-template-columns: repeat(${columns}, ${label_width}mm); grid-auto-rows: ${label_height}mm; gap: ${gap}mm; }
+.label { border: 0.5mm solid #000; border-radius: 2mm; padding: 2.5mm; overflow: hidden; display: flex; flex-direction: column; gap: 1mm; page-break-inside: avoid; }
+.label-header { display: flex; flex-wrap: wrap; align-items: baseline; column-gap: 2mm; }
+.label-name { font-size: ${title_px}px; margin: 0; line-height: 1.2; }
+.label-subname { margin: 0; font-size: ${hazard_px}px; }
+.label-cas { margin: 0; font-family: Consolas, Monaco, 'Courier New', monospace; font-size: ${hazard_px}px; }
+.label-pictograms { display: flex; flex-wrap: wrap; gap: 1mm; }
+.ghs-pic { display: inline-block; width: ${pictogram_mm}mm; height: ${pictogram_mm}mm; background-size: contain; background-repeat: no-repeat; }
+.label-signal { margin: 0; font-weight: 700; font-size: ${signal_px}px; }
+.label-signal-danger { color: #c00; }
+.label-hazards, .label-precautions { margin: 0; padding-left: 3.5mm; font-size: ${hazard_px}px; line-height: 1.25; }
+.label-precautions { color: #333; }
+.page-number { position: absolute; right: 0; bottom: 0; font-size: 8px; color: #555; }
+$pictogram_rules"""
+)
+
+
+def _load_pictogram_data_urls() -> dict[str, str]:
+    data_urls = {}
+    for code in PICTOGRAM_CODES:
+        encoded = base64.b64encode((PICTOGRAM_DIR / f"{code}.svg").read_bytes()).decode("ascii")
+        data_urls[code] = f"data:image/svg+xml;base64,{encoded}"
+    return data_urls
+
+
+_PICTOGRAM_DATA_URLS = _load_pictogram_data_urls()
+
+
+def page_geometry(page_size: str, orientation: str) -> tuple[int, int]:
+    return PAGE_SIZES_MM[page_size][orientation]
+
+
+@dataclass(frozen=True)
+class LabelContent:
+    """What one label shows, after locale choice and statement budgets.
+
+    Statements are ``(code, text)`` pairs; an overflow note ("3 more, see
+    SDS") is a trailing pair with an empty code.
+    """
+
+    name: str
+    subname: str
+    cas: str
+    pictograms: tuple[tuple[str, str], ...]
+    signal_word: str
+    danger: bool
+    hazards: tuple[tuple[str, str], ...]
+    precautions: tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class LabelSheet:
+    """Labels plus the page grid they are laid out on.
+
+    Both the HTML document and the native PDF renderer are drawn from this,
+    so the two outputs share one geometry and one set of label texts.
+    """
+
+    labels: tuple[LabelContent, ...]
+    template: str
+    label_size: str
+    locale: str
+    page: PrintPdfPage
+    columns: int
+    rows: int
+
+    @property
+    def per_page(self) -> int:
+        return self.columns * self.rows
+
+    @property
+    def page_count(self) -> int:
+        return math.ceil(len(self.labels) / self.per_page)
+
+    @property
+    def meta(self) -> PrintPdfMeta:
+        return PrintPdfMeta(
+            label_purpose=LABEL_PURPOSE_BY_TEMPLATE[self.template],
+            page_count_expected=self.page_count,
+        )
+
+    @property
+    def typography(self) -> dict[str, int]:
+        return TYPOGRAPHY_BY_SIZE[self.label_size]
+
+    @property
+    def content_height_mm(self) -> float:
+        return self.page.height_mm - 2 * self.page.margin_mm
+
+    @property
+    def label_width_mm(self) -> float:
+        content_width = self.page.width_mm - 2 * self.page.margin_mm
+        return (content_width - (self.columns - 1) * LABEL_GAP_MM) / self.columns
+
+    @property
+    def label_height_mm(self) -> float:
+        # Leave room for the page number under the last row.
+        return (
+            self.content_height_mm - PAGE_NUMBER_HEIGHT_MM - (self.rows - 1) * LABEL_GAP_MM
+        ) / self.rows
+
+    def page_labels(self, index: int) -> tuple[LabelContent, ...]:
+        return self.labels[index * self.per_page:(index + 1) * self.per_page]
+
+    def page_number(self, index: int) -> str:
+        return _TEXT[self.locale]["page"].format(current=index + 1, total=self.page_count)
+
+    def used_pictograms(self) -> list[str]:
+        return sorted({code for label in self.labels for code, _ in label.pictograms})
+
+
+def _limit(items: Sequence[Any], budget: Optional[int]) -> tuple[Sequence[Any], int]:
+    if budget is None or len(items) <= budget:
+        return items, 0
+    return items[:budget], len(items) - budget
+
+
+def _statements(
+    statements: Sequence[Mapping[str, Any]],
+    budget: Optional[int],
+    locale: str,
+) -> tuple[tuple[str, str], ...]:
+    shown, hidden = _limit(statements, budget)
+    if budget == 0 or not shown:
+        return ()
+    text_key = "text_zh" if locale == "zh-TW" else "text_en"
+    lines = [
+        (str(statement.get("code") or ""), str(statement.get(text_key) or statement.get("text_en") or ""))
+        for statement in shown
+    ]
+    if hidden:
+        lines.append(("", _TEXT[locale]["more"].format(count=hidden)))
+    return tuple(lines)
+
+
+def label_content(result: Mapping[str, Any], *, template: str, label_size: str, locale: str) -> LabelContent:
+    name_en = str(result.get("name_en") or "")
+    name_zh = str(result.get("name_zh") or "")
+    name, subname = (name_zh, name_en) if locale == "zh-TW" and name_zh else (name_en or name_zh, "")
+    if subname == name:
+        subname = ""
+    signal_word = (
+        result.get("signal_word_zh") if locale == "zh-TW" and result.get("signal_word_zh")
+        else result.get("signal_word")
+    )
+    hazard_budget, precaution_budget = STATEMENT_BUDGETS[template][label_size]
+    return LabelContent(
+        name=name or str(result.get("cas_number") or ""),
+        subname=subname,
+        cas=str(result.get("cas_number") or ""),
+        pictograms=tuple(
+            (code, str(pictogram.get("name") or code))
+            for pictogram in result.get("ghs_pictograms") or []
+            if (code := pictogram.get("code")) in _PICTOGRAM_DATA_URLS
+        ),
+        signal_word=str(signal_word or ""),
+        danger=str(result.get("signal_word") or "").strip().lower() == "danger",
+        hazards=_statements(result.get("hazard_statements") or [], hazard_budget, locale),
+        precautions=_statements(result.get("precautionary_statements") or [], precaution_budget, locale),
+    )
+
+
+def build_label_sheet(
+    results: Iterable[Mapping[str, Any]],
+    *,
+    template: str = "standard",
+    label_size: str = "medium",
+    page_size: str = "A4",
+    orientation: str = "portrait",
+    columns: int = 2,
+    rows: int = 4,
+    margin_mm: float = 5,
+    locale: str = "zh-TW",
+) -> LabelSheet:
+    """Resolve ``results`` (``ChemicalResult`` dicts) into a ``LabelSheet``.
+
+    Labels fill ``columns`` x ``rows`` grids, one grid per page, and are
+    sized to the printable area.
+    """
+    labels = tuple(
+        label_content(result, template=template, label_size=label_size, locale=locale)
+        for result in results
+    )
+    if not labels:
+        raise ValueError("at least one label is required")
+    page_width, page_height = page_geometry(page_size, orientation)
+    return LabelSheet(
+        labels=labels,
+        template=template,
+        label_size=label_size,
+        locale=locale,
+        page=PrintPdfPage(
+            width_mm=page_width,
+            height_mm=page_height,
+            orientation=orientation,
+            margin_mm=margin_mm,
+        ),
+        columns=columns,
+        rows=rows,
+    )
+
+
+def _statement_list(kind: str, statements: Sequence[tuple[str, str]]) -> str:
+    if not statements:
+        return ""
+    items = [
+        f"<li><b>{escape(code)}</b> {escape(text)}</li>" if code else f"<li>{escape(text)}</li>"
+        for code, text in statements
+    ]
+    return _STATEMENTS_TEMPLATE.substitute(kind=kind, items="".join(items))
+
+
+def _label_html(label: LabelContent) -> str:
+    pictograms = "".join(
+        _PICTOGRAM_TEMPLATE.substitute(code=code, title=escape(title))
+        for code, title in label.pictograms
+    )
+    signal = ""
+    if label.signal_word:
+        signal = (
+            f'<p class="label-signal{" label-signal-danger" if label.danger else ""}">'
+            f"{escape(label.signal_word)}</p>"
+        )
+    return _LABEL_TEMPLATE.substitute(
+        name=escape(label.name),
+        subname=escape(label.subname),
+        cas=escape(label.cas),
+        pictograms=pictograms,
+        signal=signal,
+        hazards=_statement_list("hazards", label.hazards),
+        precautions=_statement_list("precautions", label.precautions),
+    )
+
+
+def label_sheet_document(sheet: LabelSheet) -> PrintPdfRequest:
+    """Render ``sheet`` as a print request for the browser renderer.
+
+    The returned request carries the page geometry and expected page count
+    for the renderer's output contract.
+    """
+    pages = "".join(
+        _PAGE_TEMPLATE.substitute(
+            labels="".join(_label_html(label) for label in sheet.page_labels(index)),
+            page_number=escape(sheet.page_number(index)),
+        )
+        for index in range(sheet.page_count)
+    )
+    styles = _STYLES_TEMPLATE.substitute(
+        page_width=sheet.page.width_mm,
+        page_height=sheet.page.height_mm,
+        margin=f"{sheet.page.margin_mm:g}",
+        content_height=f"{sheet.content_height_mm:g}",
+        columns=sheet.columns,
+        label_width=f"{sheet.label_width_mm:.2f}",
+        label_height=f"{sheet.label_height_mm:.2f}",
+        gap=LABEL_GAP_MM,
+        pictogram_rules="\n".join(
+            f'.ghs-{code} {{ background-image: url("{_PICTOGRAM_DATA_URLS[code]}"); }}'
+            for code in sheet.used_pictograms()
+        ),
+        **sheet.typography,
+    )
+    html = _DOCUMENT_TEMPLATE.substitute(
+        lang=_TEXT[sheet.locale]["lang"],
+        styles=styles,
+        template=sheet.template,
+        pages=pages,
+    )
+    # Trusted by construction: skip the client-markup validators.
+    return PrintPdfRequest.model_construct(html=html, page=sheet.page, meta=sheet.meta)
+
+
+def build_label_document(results: Iterable[Mapping[str, Any]], **options: Any) -> PrintPdfRequest:
+    """Lay ``results`` out with ``build_label_sheet`` and render it as HTML."""
+    return label_sheet_document(build_label_sheet(results, **options))
@@ -0,0 +1,239 @@
+"""Find chemical name and CAS mentions in pasted free text.
+
+Lab users paste SDS paragraphs, purchase orders and inventory notes. Instead
+of asking ``resolve_name_to_cas`` about every possible substring, the name
+keys of the resolution index are compiled once into an Aho-Corasick automaton
+and the text is scanned in a single pass. CAS-shaped tokens are found with a
+regex and kept only when their check digit is valid.
+
+Spans are Python string (code point) offsets into the submitted text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping, Optional
+
+MIN_ZH_MENTION_CHARS = 2
+MIN_EN_MENTION_CHARS = 3
+
+_CAS_MENTION_RE = re.compile(r"(?<![\d-])(\d{2,7})-(\d{2})-(\d)(?![\d-])")
+_PARENTHETICAL_NAME_RE = re.compile(r"([^()]+?)\s*\(([^()]+)\)")
+_WHITESPACE_CHARS = "\t\n\r\x0b\x0c 　"
+_WHITESPACE_TABLE = str.maketrans(_WHITESPACE_CHARS, " " * len(_WHITESPACE_CHARS))
+
+
+def _is_ascii_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def fold_mention_text(text: str) -> str:
+    """Lowercase and flatten whitespace without changing any offsets."""
+    folded = text.translate(_WHITESPACE_TABLE)
+    lowered = folded.lower()
+    if len(lowered) == len(folded):
+        return lowered
+    # A few code points (e.g. U+0130) lowercase to two characters; keep those
+    # as-is so span offsets still index the caller's text.
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in folded)
+
+
+@dataclass(frozen=True)
+class Mention:
+    start: int
+    end: int
+    cas_number: str
+    kind: str
+
+
+class MentionAutomaton:
+    """Aho-Corasick automaton over folded name keys mapped to CAS numbers.
+
+    Keys that start or end with an ASCII letter or digit only match on ASCII
+    word boundaries, so ``ethanol`` is not reported inside ``methanol``. CJK
+    keys have no such boundary. Overlapping matches resolve leftmost-longest.
+    """
+
+    def __init__(self, patterns: Mapping[str, str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[tuple[int, ...]] = [()]
+        self._lengths: list[int] = []
+        self._cas: list[str] = []
+        self._left_boundary: list[bool] = []
+        self._right_boundary: list[bool] = []
+        for key, cas in patterns.items():
+            self._add(key, cas)
+        self._link()
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def _add(self, key: str, cas: str) -> None:
+        goto = self._goto
+        state = 0
+        for ch in key:
+            next_state = goto[state].get(ch)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][ch] = next_state
+                goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        if self._outputs[state]:
+            return
+        pattern_id = len(self._lengths)
+        self._lengths.append(len(key))
+        self._cas.append(cas)
+        self._left_boundary.append(_is_ascii_word_char(key[0]))
+        self._right_boundary.append(_is_ascii_word_char(key[-1]))
+        self._outputs[state] = (pattern_id,)
+
+    def _link(self) -> None:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[child] = target if target != child else 0
+                if outputs[fail[child]]:
+                    outputs[child] = outputs[child] + outputs[fail[child]]
+
+    def _raw_matches(self, folded: str) -> list[tuple[int, tuple[int, ...]]]:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches: list[tuple[int, tuple[int, ...]]] = []
+        append = matches.append
+        state = 0
+        end = 0
+        for ch in folded:
+            end += 1
+            next_state = goto[state].get(ch)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(ch)
+            if next_state is None:
+                state = 0
+                continue
+            state = next_state
+            found = outputs[state]
+            if found:
+                append((end, found))
+        return matches
+
+    def find(self, text: str, *, folded: Optional[str] = None) -> list[Mention]:
+        folded = fold_mention_text(text) if folded is None else folded
+        text_length = len(folded)
+        candidates: list[tuple[int, int, int]] = []
+        for end, pattern_ids in self._raw_matches(folded):
+            for pattern_id in pattern_ids:
+                start = end - self._lengths[pattern_id]
+                if (
+                    self._left_boundary[pattern_id]
+                    and start > 0
+                    and _is_ascii_word_char(folded[start - 1])
+                ):
+                    continue
+                if (
+                    self._right_boundary[pattern_id]
+                    and end < text_length
+                    and _is_ascii_word_char(folded[end])
+                ):
+                    continue
+                candidates.append((start, end, pattern_id))
+        return [
+            Mention(start, end, self._cas[pattern_id], "name")
+            for start, end, pattern_id in _leftmost_longest(candidates)
+        ]
+
+
+def _leftmost_longest(candidates: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+    candidates.sort(key=lambda item: (item[0], -item[1]))
+    selected: list[tuple[int, int, int]] = []
+    covered_until = 0
+    for candidate in candidates:
+        if candidate[0] >= covered_until:
+            selected.append(candidate)
+            covered_until = candidate[1]
+    return selected
+
+
+def build_mention_automaton(
+    exact_maps: Iterable[tuple[str, Mapping[str, str]]],
+    normalize_cas: Callable[[Optional[str]], Optional[str]],
+) -> MentionAutomaton:
+    """Compile ``(locale, {name: cas})`` maps, earlier maps winning on key clashes.
+
+    Seed names such as ``methyl alcohol (methanol)`` also contribute the outer
+    and parenthesized parts as keys, but only when no other name claims the
+    same part for a different CAS.
+    """
+    patterns: dict[str, str] = {}
+    derived: dict[str, set[str]] = {}
+    for locale, exact_map in exact_maps:
+        minimum = MIN_ZH_MENTION_CHARS if locale == "zh" else MIN_EN_MENTION_CHARS
+        for name, cas in exact_map.items():
+            key = fold_mention_text(str(name or "").strip())
+            if len(key) < minimum or key in patterns or _CAS_MENTION_RE.fullmatch(key):
+                continue
+            normalized = normalize_cas(cas)
+            if not normalized:
+                continue
+            patterns[key] = normalized
+            parenthetical = _PARENTHETICAL_NAME_RE.fullmatch(key)
+            if parenthetical:
+                for part in parenthetical.groups():
+                    part = part.strip()
+                    if len(part) >= minimum:
+                        derived.setdefault(part, set()).add(normalized)
+    for key, cas_numbers in derived.items():
+        if key not in patterns and len(cas_numbers) == 1:
+            patterns[key] = next(iter(cas_numbers))
+    return MentionAutomaton(patterns)
+
+
+def find_cas_mentions(
+    text: str,
+    normalize_cas: Callable[[Optional[str]], Optional[str]],
+) -> list[Mention]:
+    mentions: list[Mention] = []
+    for match in _CAS_MENTION_RE.finditer(text):
+        normalized = normalize_cas(match.group(0))
+        if normalized:
+            mentions.append(Mention(match.start(), match.end(), normalized, "cas"))
+    return mentions
+
+
+def extract_mentions(
+    text: str,
+    automaton: MentionAutomaton,
+    normalize_cas: Callable[[Optional[str]], Optional[str]],
+) -> list[Mention]:
+    """Return name and CAS mentions in text order; CAS tokens win overlaps."""
+    cas_mentions = find_cas_mentions(text, normalize_cas)
+    name_mentions = automaton.find(text)
+    if not cas_mentions:
+        return name_mentions
+    merged: list[Mention] = []
+    cas_index = 0
+    for mention in name_mentions:
+        while cas_index < len(cas_mentions) and cas_mentions[cas_index].end <= mention.start:
+            merged.append(cas_mentions[cas_index])
+            cas_index += 1
+        if cas_index < len(cas_mentions) and cas_mentions[cas_index].start < mention.end:
+            continue
+        merged.append(mention)
+    merged.extend(cas_mentions[cas_index:])
+    return merged
@@ -0,0 +1,93 @@
+"""On-disk snapshot of the built name-resolution index.
+
+Every worker process used to pay for ``_build_name_resolution_index`` on its
+first name search: normalizing each seed, manual, and alias key and deriving
+the compact lookup maps. The snapshot stores the finished index as a
+``marshal`` payload of plain dicts, lists, and tuples next to the pilot store,
+so later processes load it instead of rebuilding.
+
+A snapshot is only trusted when the caller's key (seed dictionary signature,
+dictionary data version, index schema hash, digest of the store rows the index
+was built from) hashes to the value in the header and the payload checksum
+matches. Anything else is a miss and the caller rebuilds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Mapping
+
+NAME_INDEX_SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b"GHSNIDX\x00"
+# magic, format version, key digest, payload digest, payload length
+_HEADER = struct.Struct("<8sI32s32sQ")
+
+
+class NameIndexSnapshotError(ValueError):
+    """Raised when a snapshot is missing its key, stale, or corrupt."""
+
+
+def snapshot_key_digest(key: Mapping[str, Any]) -> bytes:
+    encoded = json.dumps(
+        dict(key),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).digest()
+
+
+def encode_name_index_snapshot(key: Mapping[str, Any], payload: Any) -> bytes:
+    body = marshal.dumps(payload)
+    return _HEADER.pack(
+        _MAGIC,
+        NAME_INDEX_SNAPSHOT_FORMAT_VERSION,
+        snapshot_key_digest(key),
+        hashlib.sha256(body).digest(),
+        len(body),
+    ) + body
+
+
+def decode_name_index_snapshot(data: bytes, key: Mapping[str, Any]) -> Any:
+    if len(data) < _HEADER.size:
+        raise NameIndexSnapshotError("snapshot is truncated")
+    magic, version, key_digest, body_digest, body_length = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != NAME_INDEX_SNAPSHOT_FORMAT_VERSION:
+        raise NameIndexSnapshotError("snapshot format is not supported")
+    if key_digest != snapshot_key_digest(key):
+        raise NameIndexSnapshotError("snapshot key does not match")
+    body = memoryview(data)[_HEADER.size:]
+    if len(body) != body_length or hashlib.sha256(body).digest() != body_digest:
+        raise NameIndexSnapshotError("snapshot payload checksum mismatch")
+    try:
+        return marshal.loads(body)
+    except (EOFError, TypeError, ValueError) as exc:
+        raise NameIndexSnapshotError(f"snapshot payload is unreadable: {exc}") from exc
+
+
+def read_name_index_snapshot(path: Path, key: Mapping[str, Any]) -> Any:
+    """Return the payload stored under ``key``; raises ``OSError`` if absent."""
+    return decode_name_index_snapshot(Path(path).read_bytes(), key)
+
+
+def write_name_index_snapshot(path: Path, key: Mapping[str, Any], payload: Any) -> int:
+    """Atomically replace the snapshot so concurrent workers never read a torn file."""
+    path = Path(path)
+    data = encode_name_index_snapshot(key, payload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return len(data)
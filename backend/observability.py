@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import json
 import logging
+import logging.handlers
 import math
+import queue
 import re
+import threading
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -33,6 +37,107 @@ ALLOWED_FRONTEND_EVENT_TYPES = {
 }
 
 
+# Events emitted since process start, per source and type, for /ops/report.
+# Frontend events choose their own ``source`` string, so the number of
+# distinct keys is capped; later newcomers are folded into one bucket.
+MAX_EVENT_COUNT_KEYS = 500
+EVENT_COUNT_OVERFLOW_SOURCE = "_other"
+_EVENT_COUNTS: Counter = Counter()
+_EVENT_COUNTS_LOCK = threading.Lock()
+
+
+class _StructuredEvent:
+    """Log message that serializes its event only when a handler formats it."""
+
+    __slots__ = ("record",)
+
+    def __init__(self, record: dict[str, Any]):
+        self.record = record
+
+    def __str__(self) -> str:
+        return json.dumps(
+            {"event": self.record},
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records as-is so JSON encoding happens on the listener thread.
+
+    The stock handler formats in the caller's thread. Event records are
+    built fresh per call and never mutated afterwards, so handing the
+    record object across threads is safe.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_queue_handler: Optional[_DeferredQueueHandler] = None
+
+
+def start_event_log_queue() -> bool:
+    """Route structured event logging through a background thread.
+
+    Request handlers then only enqueue; encoding and the write to the
+    root logger's handlers happen off the event loop. Returns False when
+    the queue was already running.
+    """
+    global _log_listener, _log_queue_handler
+    if _log_listener is not None:
+        return False
+    handlers = list(logging.getLogger().handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_queue_handler = _DeferredQueueHandler(log_queue)
+    _log_listener = logging.handlers.QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True,
+    )
+    _log_listener.start()
+    LOGGER.addHandler(_log_queue_handler)
+    LOGGER.propagate = False
+    return True
+
+
+def stop_event_log_queue() -> None:
+    """Flush queued events and restore direct logging."""
+    global _log_listener, _log_queue_handler
+    if _log_listener is None:
+        return
+    LOGGER.removeHandler(_log_queue_handler)
+    LOGGER.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+    _log_queue_handler = None
+
+
+def event_counts() -> dict[str, dict[str, int]]:
+    """Return emitted event counts grouped by source, then type."""
+    with _EVENT_COUNTS_LOCK:
+        items = sorted(_EVENT_COUNTS.items())
+    grouped: dict[str, dict[str, int]] = {}
+    for (source, event_type), count in items:
+        grouped.setdefault(source, {})[event_type] = count
+    return grouped
+
+
+def _count_event(record: dict[str, Any]) -> None:
+    key = (record["source"], record["type"])
+    with _EVENT_COUNTS_LOCK:
+        if key not in _EVENT_COUNTS and len(_EVENT_COUNTS) >= MAX_EVENT_COUNT_KEYS:
+            key = (EVENT_COUNT_OVERFLOW_SOURCE, record["type"])
+        _EVENT_COUNTS[key] += record["count"]
+
+
+def reset_event_counts() -> None:
+    with _EVENT_COUNTS_LOCK:
+        _EVENT_COUNTS.clear()
+
+
 def _truncate(value: Any, limit: int = MAX_EVENT_STRING_LENGTH) -> str:
     text = str(value or "").strip()
     return text[:limit]
@@ -134,17 +239,27 @@ def emit_structured_event(
         count=(payload or {}).get("count", 1),
         meta=(payload or {}).get("meta", payload or {}),
     )
-    LOGGER.info(
-        json.dumps(
-            {"event": record},
-            ensure_ascii=False,
-            sort_keys=True,
-            separators=(",", ":"),
-        )
-    )
+    _count_event(record)
+    LOGGER.info("%s", _StructuredEvent(record))
     return record
 
 
+def record_telemetry_events(payloads: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Record a batch of frontend events; return ``(accepted, rejected)``.
+
+    One unsupported event does not drop the rest of a print session's burst;
+    each rejection names the event's position in the batch.
+    """
+    accepted = []
+    rejected = []
+    for index, payload in enumerate(payloads):
+        try:
+            accepted.append(record_telemetry_event(payload))
+        except ValueError as exc:
+            rejected.append({"index": index, "detail": str(exc)})
+    return accepted, rejected
+
+
 def record_telemetry_event(payload: dict[str, Any]) -> dict[str, Any]:
     event_type = _truncate(payload.get("type"), 80)
     if event_type not in ALLOWED_FRONTEND_EVENT_TYPES:
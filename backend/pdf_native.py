@@ -0,0 +1,887 @@
+"""Native vector PDFs for server-built label sheets, without Chromium.
+
+``NativeLabelPdfRenderer`` draws a ``LabelSheet`` straight to PDF content
+streams: text in one TrueType face that is subset and embedded per
+document, GHS pictograms as vector form XObjects converted once from the
+SVGs in ``ghs_pictograms``, and the page grid from the sheet's
+``PrintPdfPage``. A sheet takes milliseconds per page instead of a browser
+round trip, so /api/print/labels/pdf can use it when Chromium is
+unavailable, or for every sheet.
+
+The layout follows the label stylesheet in ``label_document`` closely but
+not pixel for pixel: there is no text shaping (complex scripts are out of
+scope), and bold is synthesized with a stroked fill because only one face
+is embedded. The face must have TrueType outlines: CFF-flavoured fonts such
+as the Noto Sans CJK ``.ttc`` that Chromium uses are rejected at startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+import hashlib
+from io import BytesIO
+import logging
+from pathlib import Path
+import re
+import struct
+import time
+from typing import Any, Optional, Sequence, Union
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+from label_document import (
+    LABEL_GAP_MM,
+    PICTOGRAM_DIR,
+    LabelContent,
+    LabelSheet,
+)
+from pdf_render import (
+    DEFAULT_MAX_RENDERED_PDF_BYTES,
+    PDF_POINTS_PER_MM,
+    PdfRenderUnavailableError,
+    PrintPdfRequest,
+    validate_rendered_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+FONT_DIR = Path(__file__).parent / "fonts"
+FONT_SUFFIXES = (".ttf", ".ttc")
+# Collection faces whose family names carry one of these are preferred, so
+# a CJK collection resolves to its Traditional Chinese (Taiwan) face.
+PREFERRED_FACE_MARKERS = ("TW", "TC", "Traditional")
+DEFAULT_NATIVE_MAX_CONCURRENT = 2
+
+PT_PER_PX = 0.75
+BORDER_MM = 0.5
+BORDER_RADIUS_MM = 2
+PADDING_MM = 2.5
+BLOCK_GAP_MM = 1
+LIST_INDENT_MM = 3.5
+PAGE_NUMBER_PX = 8
+# CSS colours from the label stylesheet, as PDF ``rg`` operands.
+BLACK = "0 0 0"
+DANGER_RED = "0.8 0 0"
+PRECAUTION_GREY = "0.2 0.2 0.2"
+PAGE_NUMBER_GREY = "0.333 0.333 0.333"
+# Synthetic bold: stroke the glyph outline with this fraction of the size.
+BOLD_STROKE_RATIO = 0.03
+# Cubic Bezier handle length for a quarter circle.
+_ARC_KAPPA = 0.5523
+
+_CJK_CHAR = (
+    "\u2e80-\u2fff\u3000-\u30ff\u3100-\u31ff\u3400-\u4dbf\u4e00-\u9fff"
+    "\uac00-\ud7af\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef"
+)
+# Break opportunities: any CJK character, a run of whitespace, or a word.
+_WRAP_TOKEN = re.compile(rf"[{_CJK_CHAR}]|\s+|[^\s{_CJK_CHAR}]+")
+_SVG_PATH_TOKEN = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_SVG_TRANSFORM = re.compile(r"(matrix|translate|scale)\s*\(([^)]*)\)")
+_SVG_NS = "{http://www.w3.org/2000/svg}"
+_SVG_PARAMETERS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "Z": 0}
+_SVG_LINECAPS = {"butt": 0, "round": 1, "square": 2}
+_SVG_LINEJOINS = {"miter": 0, "round": 1, "bevel": 2}
+# TrueType tables a CIDFontType2 program needs; hinting programs are kept
+# verbatim so glyph instructions still resolve.
+_HINTING_TABLES = ("cvt ", "fpgm", "prep")
+_SUBSET_TABLES = ("glyf", "head", "hhea", "maxp", *_HINTING_TABLES)
+_COMPOSITE_ARGS_ARE_WORDS = 0x0001
+_COMPOSITE_HAS_SCALE = 0x0008
+_COMPOSITE_MORE_COMPONENTS = 0x0020
+_COMPOSITE_HAS_XY_SCALE = 0x0040
+_COMPOSITE_HAS_2X2 = 0x0080
+
+
+def _num(value: float) -> str:
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text in {"", "-0"} else text
+
+
+def _svg_color(value: str) -> Optional[str]:
+    value = value.strip().lower()
+    if value in {"", "none", "transparent"}:
+        return None
+    if value == "black":
+        return BLACK
+    if value == "white":
+        return "1 1 1"
+    if re.fullmatch(r"#[0-9a-f]{3}", value):
+        value = "#" + "".join(channel * 2 for channel in value[1:])
+    if not re.fullmatch(r"#[0-9a-f]{6}", value):
+        raise ValueError(f"unsupported SVG colour {value!r}")
+    return " ".join(_num(int(value[index:index + 2], 16) / 255) for index in (1, 3, 5))
+
+
+def _svg_transform(value: str) -> str:
+    operators = []
+    for name, raw_args in _SVG_TRANSFORM.findall(value):
+        args = [float(arg) for arg in re.split(r"[\s,]+", raw_args.strip()) if arg]
+        if name == "matrix" and len(args) == 6:
+            matrix = args
+        elif name == "translate" and len(args) in {1, 2}:
+            matrix = [1, 0, 0, 1, args[0], args[1] if len(args) == 2 else 0]
+        elif name == "scale" and len(args) in {1, 2}:
+            matrix = [args[0], 0, 0, args[-1], 0, 0]
+        else:
+            raise ValueError(f"unsupported SVG transform {name}({raw_args})")
+        operators.append(" ".join(_num(arg) for arg in matrix) + " cm")
+    return "\n".join(operators)
+
+
+def _svg_path_operators(data: str) -> list[str]:
+    """Translate SVG path data (M, L, H, V, C, Z, absolute or relative)."""
+    tokens = _SVG_PATH_TOKEN.findall(data)
+    operators = []
+    command = ""
+    x = y = start_x = start_y = 0.0
+    index = 0
+    while index < len(tokens):
+        if tokens[index].isalpha():
+            command = tokens[index]
+            index += 1
+        upper = command.upper()
+        if upper not in _SVG_PARAMETERS:
+            raise ValueError(f"unsupported SVG path command {command!r}")
+        if upper == "Z":
+            operators.append("h")
+            x, y = start_x, start_y
+            continue
+        count = _SVG_PARAMETERS[upper]
+        args = [float(token) for token in tokens[index:index + count]]
+        if len(args) != count:
+            raise ValueError("truncated SVG path data")
+        index += count
+        relative = command.islower()
+        if upper == "H":
+            x = args[0] + (x if relative else 0)
+            operators.append(f"{_num(x)} {_num(y)} l")
+            continue
+        if upper == "V":
+            y = args[0] + (y if relative else 0)
+            operators.append(f"{_num(x)} {_num(y)} l")
+            continue
+        points = [
+            (args[offset] + (x if relative else 0), args[offset + 1] + (y if relative else 0))
+            for offset in range(0, count, 2)
+        ]
+        coordinates = " ".join(f"{_num(px)} {_num(py)}" for px, py in points)
+        x, y = points[-1]
+        if upper == "M":
+            operators.append(f"{coordinates} m")
+            start_x, start_y = x, y
+            # Further coordinate pairs after a moveto are implicit linetos.
+            command = "l" if relative else "L"
+        else:
+            operators.append(f"{coordinates} {'c' if upper == 'C' else 'l'}")
+    return operators
+
+
+def _svg_element_operators(element: ElementTree.Element) -> list[str]:
+    tag = element.tag.removeprefix(_SVG_NS)
+    if tag in {"defs", "title", "desc", "metadata"}:
+        return []
+    operators = []
+    if tag == "path":
+        style = dict(element.attrib)
+        for declaration in element.get("style", "").split(";"):
+            if ":" in declaration:
+                key, value = declaration.split(":", 1)
+                style[key.strip()] = value.strip()
+        fill = _svg_color(style.get("fill", "black"))
+        stroke = _svg_color(style.get("stroke", "none"))
+        even_odd = style.get("fill-rule") == "evenodd"
+        if fill is not None:
+            operators.append(f"{fill} rg")
+        if stroke is not None:
+            operators.append(f"{stroke} RG {_num(float(style.get('stroke-width', '1')))} w")
+            operators.append(f"{_SVG_LINECAPS[style.get('stroke-linecap', 'butt')]} J")
+            operators.append(f"{_SVG_LINEJOINS[style.get('stroke-linejoin', 'miter')]} j")
+            operators.append(f"{_num(float(style.get('stroke-miterlimit', '4')))} M")
+        operators.extend(_svg_path_operators(element.get("d", "")))
+        paint = {(True, True): "B", (True, False): "f", (False, True): "S"}.get(
+            (fill is not None, stroke is not None), "n"
+        )
+        operators.append(paint + ("*" if even_odd and paint in {"B", "f"} else ""))
+    elif tag in {"svg", "g"}:
+        for child in element:
+            operators.extend(_svg_element_operators(child))
+    else:
+        raise ValueError(f"unsupported SVG element <{tag}>")
+    if not operators:
+        return []
+    transform = _svg_transform(element.get("transform", ""))
+    return ["q", *([transform] if transform else []), *operators, "Q"]
+
+
+@dataclass(frozen=True)
+class _Pictogram:
+    width: float
+    height: float
+    stream: bytes
+
+
+@lru_cache(maxsize=None)
+def _pictogram(code: str) -> _Pictogram:
+    """Convert one pictogram SVG to a compressed form XObject stream.
+
+    The stream draws in SVG user space (y down), so placements flip it.
+    The bundled SVGs use only groups, transforms and filled or stroked
+    paths; anything else is rejected rather than drawn wrong.
+    """
+    root = ElementTree.parse(PICTOGRAM_DIR / f"{code}.svg").getroot()
+    view_box = root.get("viewBox")
+    if view_box:
+        _, _, width, height = (float(part) for part in re.split(r"[\s,]+", view_box.strip()))
+    else:
+        width, height = float(root.get("width", "70")), float(root.get("height", "70"))
+    operators = "\n".join(_svg_element_operators(root))
+    return _Pictogram(width=width, height=height, stream=zlib.compress(operators.encode("ascii")))
+
+
+class LabelFont:
+    """One TrueType face, with metrics for layout and per-document subsets.
+
+    fontTools parses the face once at startup. Subsets are then cut
+    straight from the raw ``glyf``/``loca`` data, which keeps a large CJK
+    face at a few milliseconds per document instead of a full subsetter run.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        from fontTools.ttLib import TTCollection, TTFont
+
+        self.path = Path(path)
+        if self.path.suffix.lower() == ".ttc":
+            faces = TTCollection(str(self.path), lazy=True).fonts
+            font = next(
+                (
+                    candidate for candidate in faces
+                    if any(marker in _family_name(candidate) for marker in PREFERRED_FACE_MARKERS)
+                ),
+                faces[0],
+            )
+        else:
+            font = TTFont(str(self.path), lazy=True)
+        if "glyf" not in font:
+            raise ValueError(f"{self.path.name} has no TrueType outlines")
+        self.family = _family_name(font)
+        self.postscript_name = re.sub(
+            r"[^A-Za-z0-9-]", "", str(font["name"].getDebugName(6) or self.family)
+        ) or "LabelFont"
+        head, hhea = font["head"], font["hhea"]
+        self.units_per_em = head.unitsPerEm
+        self.ascent = hhea.ascent / self.units_per_em
+        self.descent = hhea.descent / self.units_per_em
+        self.bbox = [
+            round(value * 1000 / self.units_per_em)
+            for value in (head.xMin, head.yMin, head.xMax, head.yMax)
+        ]
+        os2 = font["OS/2"] if "OS/2" in font else None
+        cap_height = getattr(os2, "sCapHeight", 0) or hhea.ascent
+        self.cap_height = round(cap_height * 1000 / self.units_per_em)
+
+        glyph_order = font.getGlyphOrder()
+        hmtx = font["hmtx"].metrics
+        self._metrics = [hmtx[name] for name in glyph_order]
+        self._glyph_ids = {
+            codepoint: font.getGlyphID(name) for codepoint, name in font.getBestCmap().items()
+        }
+        self._advances = {
+            codepoint: self._metrics[glyph_id][0] / self.units_per_em
+            for codepoint, glyph_id in self._glyph_ids.items()
+        }
+        self._missing_advance = self._metrics[0][0] / self.units_per_em
+        self._locations = list(font["loca"].locations)
+        self._tables = {tag: bytes(font.reader[tag]) for tag in _SUBSET_TABLES if tag in font.reader}
+
+    def width(self, text: str, size: float) -> float:
+        advances = self._advances
+        return sum(advances.get(ord(char), self._missing_advance) for char in text) * size
+
+    def _glyph(self, glyph_id: int) -> bytes:
+        return self._tables["glyf"][self._locations[glyph_id]:self._locations[glyph_id + 1]]
+
+    def subset(self, text: str) -> tuple[bytes, dict[str, int], dict[int, int]]:
+        """Subset the face to ``text``; return font bytes, glyph ids, widths.
+
+        Characters the face lacks map to glyph 0 (.notdef). The subset has
+        only the tables a PDF viewer reads from an embedded CIDFontType2
+        program; there is no ``cmap``, since text is encoded by glyph id.
+        """
+        old_ids = {char: self._glyph_ids.get(ord(char), 0) for char in set(text)}
+        retained = {0, *old_ids.values()}
+        pending = list(retained)
+        while pending:
+            glyph = self._glyph(pending.pop())
+            for offset in _component_offsets(glyph):
+                (component,) = struct.unpack_from(">H", glyph, offset)
+                if component not in retained:
+                    retained.add(component)
+                    pending.append(component)
+        order = sorted(retained)
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(order)}
+
+        glyf = bytearray()
+        loca = [0]
+        for old_id in order:
+            glyph = bytearray(self._glyph(old_id))
+            for offset in _component_offsets(glyph):
+                (component,) = struct.unpack_from(">H", glyph, offset)
+                struct.pack_into(">H", glyph, offset, new_ids[component])
+            glyf += glyph + b"\0" * (-len(glyph) % 4)
+            loca.append(len(glyf))
+        head = bytearray(self._tables["head"])
+        struct.pack_into(">I", head, 8, 0)  # checkSumAdjustment, set below
+        struct.pack_into(">h", head, 50, 1)  # indexToLocFormat: long offsets
+        hhea = bytearray(self._tables["hhea"])
+        struct.pack_into(">H", hhea, 34, len(order))  # numberOfHMetrics
+        maxp = bytearray(self._tables["maxp"])
+        struct.pack_into(">H", maxp, 4, len(order))  # numGlyphs
+        tables = {
+            **{tag: self._tables[tag] for tag in _HINTING_TABLES if tag in self._tables},
+            "glyf": bytes(glyf),
+            "head": bytes(head),
+            "hhea": bytes(hhea),
+            "hmtx": b"".join(struct.pack(">Hh", *self._metrics[old_id]) for old_id in order),
+            "loca": struct.pack(f">{len(loca)}I", *loca),
+            "maxp": bytes(maxp),
+        }
+        widths = {
+            new_id: round(self._metrics[old_id][0] * 1000 / self.units_per_em)
+            for new_id, old_id in enumerate(order)
+        }
+        return (
+            _sfnt(tables),
+            {char: new_ids[old_id] for char, old_id in old_ids.items()},
+            widths,
+        )
+
+
+def _component_offsets(glyph: Union[bytes, bytearray]) -> list[int]:
+    """Byte offsets of the glyph ids referenced by a composite glyph."""
+    if len(glyph) < 10 or struct.unpack_from(">h", glyph, 0)[0] >= 0:
+        return []
+    offsets = []
+    offset = 10
+    while True:
+        (flags,) = struct.unpack_from(">H", glyph, offset)
+        offsets.append(offset + 2)
+        offset += 4 + (4 if flags & _COMPOSITE_ARGS_ARE_WORDS else 2)
+        if flags & _COMPOSITE_HAS_SCALE:
+            offset += 2
+        elif flags & _COMPOSITE_HAS_XY_SCALE:
+            offset += 4
+        elif flags & _COMPOSITE_HAS_2X2:
+            offset += 8
+        if not flags & _COMPOSITE_MORE_COMPONENTS:
+            return offsets
+
+
+def _table_checksum(data: bytes) -> int:
+    padded = data + b"\0" * (-len(data) % 4)
+    return sum(struct.unpack(f">{len(padded) // 4}I", padded)) & 0xFFFFFFFF
+
+
+def _sfnt(tables: dict[str, bytes]) -> bytes:
+    """Assemble a TrueType font file from raw tables."""
+    count = len(tables)
+    entry_selector = count.bit_length() - 1
+    search_range = 16 << entry_selector
+    output = bytearray(
+        struct.pack(">IHHHH", 0x00010000, count, search_range, entry_selector, count * 16 - search_range)
+    )
+    offset = 12 + 16 * count
+    body = bytearray()
+    head_offset = 0
+    for tag in sorted(tables):
+        data = tables[tag]
+        if tag == "head":
+            head_offset = offset + len(body)
+        output += struct.pack(">4sIII", tag.encode("latin-1"), _table_checksum(data), offset + len(body), len(data))
+        body += data + b"\0" * (-len(data) % 4)
+    output += body
+    struct.pack_into(">I", output, head_offset + 8, (0xB1B0AFBA - _table_checksum(bytes(output))) & 0xFFFFFFFF)
+    return bytes(output)
+
+
+def _family_name(font: Any) -> str:
+    names = font["name"]
+    return str(names.getDebugName(16) or names.getDebugName(1) or "")
+
+
+def find_label_font(path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """Return ``path`` if given, else the first TrueType file in ``fonts/``."""
+    if path:
+        return Path(path)
+    if not FONT_DIR.is_dir():
+        return None
+    return next(
+        (
+            candidate for candidate in sorted(FONT_DIR.iterdir())
+            if candidate.suffix.lower() in FONT_SUFFIXES and candidate.is_file()
+        ),
+        None,
+    )
+
+
+@dataclass(frozen=True)
+class _TextRun:
+    x: float
+    y: float
+    size: float
+    text: str
+    color: str
+    bold: bool = False
+
+
+class _PdfObjects:
+    """Numbered PDF objects, serialized with a classic xref table."""
+
+    def __init__(self):
+        self._bodies: list[bytes] = []
+
+    def reserve(self) -> int:
+        self._bodies.append(b"")
+        return len(self._bodies)
+
+    def set(self, ref: int, body: Union[str, bytes]) -> int:
+        self._bodies[ref - 1] = body.encode("latin-1") if isinstance(body, str) else body
+        return ref
+
+    def add(self, body: Union[str, bytes]) -> int:
+        return self.set(self.reserve(), body)
+
+    def add_stream(self, data: bytes, entries: str = "", *, compressed: bool = False) -> int:
+        if not compressed:
+            data = zlib.compress(data)
+        head = f"<< /Length {len(data)} /Filter /FlateDecode {entries}>>\nstream\n"
+        return self.add(head.encode("latin-1") + data + b"\nendstream")
+
+    def serialize(self, root: int, info: int) -> bytes:
+        output = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(self._bodies, start=1):
+            offsets.append(len(output))
+            output += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+        xref_offset = len(output)
+        output += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode("ascii")
+        output += b"".join(f"{offset:010d} 00000 n \n".encode("ascii") for offset in offsets)
+        output += (
+            f"trailer\n<< /Size {len(offsets) + 1} /Root {root} 0 R /Info {info} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("ascii")
+        return bytes(output)
+
+
+def _wrap(
+    fragments: Sequence[tuple[str, bool]],
+    font: LabelFont,
+    size: float,
+    max_width: float,
+) -> list[list[tuple[str, bool]]]:
+    """Greedy line breaking at spaces and between CJK characters."""
+    lines: list[list[tuple[str, bool]]] = [[]]
+    line_width = 0.0
+    pending_space: Optional[tuple[str, bool]] = None
+
+    def place(text: str, bold: bool) -> None:
+        nonlocal line_width
+        line = lines[-1]
+        if line and line[-1][1] == bold:
+            line[-1] = (line[-1][0] + text, bold)
+        else:
+            line.append((text, bold))
+        line_width += font.width(text, size)
+
+    for text, bold in fragments:
+        for token in _WRAP_TOKEN.findall(text):
+            if token.isspace():
+                pending_space = (" ", bold) if lines[-1] else None
+                continue
+            width = font.width(token, size)
+            space_width = font.width(" ", size) if pending_space else 0.0
+            if lines[-1] and line_width + space_width + width > max_width:
+                lines.append([])
+                line_width = 0.0
+                pending_space = None
+            if pending_space:
+                place(*pending_space)
+                pending_space = None
+            if width <= max_width or len(token) == 1:
+                place(token, bold)
+                continue
+            for char in token:
+                if lines[-1] and line_width + font.width(char, size) > max_width:
+                    lines.append([])
+                    line_width = 0.0
+                place(char, bold)
+    return [line for line in lines if line]
+
+
+class _SheetPainter:
+    """Lays out a ``LabelSheet`` into page operator lists and text runs."""
+
+    def __init__(self, sheet: LabelSheet, font: LabelFont):
+        self.sheet = sheet
+        self.font = font
+        self.page_height = sheet.page.height_mm * PDF_POINTS_PER_MM
+        typography = sheet.typography
+        self.title_size = typography["title_px"] * PT_PER_PX
+        self.signal_size = typography["signal_px"] * PT_PER_PX
+        self.small_size = typography["hazard_px"] * PT_PER_PX
+        self.pictogram_size = typography["pictogram_mm"] * PDF_POINTS_PER_MM
+        self.pictogram_names = {
+            code: f"P{index}" for index, code in enumerate(sheet.used_pictograms(), start=1)
+        }
+        self.items: list[Union[str, _TextRun]] = []
+
+    def paint_page(self, index: int) -> list[Union[str, _TextRun]]:
+        self.items = []
+        sheet = self.sheet
+        mm = PDF_POINTS_PER_MM
+        margin = sheet.page.margin_mm * mm
+        label_width = sheet.label_width_mm * mm
+        label_height = sheet.label_height_mm * mm
+        gap = LABEL_GAP_MM * mm
+        for slot, label in enumerate(sheet.page_labels(index)):
+            row, column = divmod(slot, sheet.columns)
+            self._label(
+                label,
+                margin + column * (label_width + gap),
+                margin + row * (label_height + gap),
+                label_width,
+                label_height,
+            )
+        page_number = sheet.page_number(index)
+        size = PAGE_NUMBER_PX * PT_PER_PX
+        right = (sheet.page.width_mm - sheet.page.margin_mm) * mm
+        bottom = margin + sheet.content_height_mm * mm
+        self._text(
+            right - self.font.width(page_number, size),
+            bottom + self.font.descent * size,
+            size,
+            page_number,
+            PAGE_NUMBER_GREY,
+        )
+        return self.items
+
+    def _y(self, top: float) -> float:
+        """Convert a distance from the page top to a PDF y coordinate."""
+        return self.page_height - top
+
+    def _text(self, x: float, top_baseline: float, size: float, text: str, color: str, bold: bool = False) -> None:
+        self.items.append(_TextRun(x, self._y(top_baseline), size, text, color, bold))
+
+    def _label(self, label: LabelContent, left: float, top: float, width: float, height: float) -> None:
+        mm = PDF_POINTS_PER_MM
+        border = BORDER_MM * mm
+        self.items.append(
+            f"{_num(border)} w {BLACK} RG "
+            + _rounded_rect(
+                left + border / 2,
+                self._y(top + height - border / 2),
+                width - border,
+                height - border,
+                BORDER_RADIUS_MM * mm - border / 2,
+            )
+            + " S"
+        )
+        inset = border + PADDING_MM * mm
+        x, y = left + inset, top + inset
+        inner_width, bottom = width - 2 * inset, top + height - inset
+        # overflow: hidden
+        self.items.append(
+            f"q {_num(left + border)} {_num(self._y(top + height - border))} "
+            f"{_num(width - 2 * border)} {_num(height - 2 * border)} re W n"
+        )
+        y = self._paragraph([(label.name, True)], x, y, inner_width, self.title_size, 1.2, BLACK, bottom)
+        cas_line = f"{label.subname}  CAS {label.cas}" if label.subname else f"CAS {label.cas}"
+        y = self._paragraph([(cas_line, False)], x, y, inner_width, self.small_size, 1.2, BLACK, bottom)
+        if label.pictograms and y < bottom:
+            y += BLOCK_GAP_MM * mm
+            y = self._pictograms(label.pictograms, x, y, inner_width)
+        if label.signal_word and y < bottom:
+            y += BLOCK_GAP_MM * mm
+            color = DANGER_RED if label.danger else BLACK
+            y = self._paragraph(
+                [(label.signal_word, True)], x, y, inner_width, self.signal_size, 1.2, color, bottom
+            )
+        for statements, color in ((label.hazards, BLACK), (label.precautions, PRECAUTION_GREY)):
+            if statements and y < bottom:
+                y += BLOCK_GAP_MM * mm
+                y = self._statements(statements, x, y, inner_width, color, bottom)
+        self.items.append("Q")
+
+    def _paragraph(
+        self,
+        fragments: Sequence[tuple[str, bool]],
+        x: float,
+        top: float,
+        width: float,
+        size: float,
+        line_height: float,
+        color: str,
+        bottom: float,
+    ) -> float:
+        leading = size * line_height
+        # Centre the font's ascent-descent box in the line box, like CSS.
+        baseline_offset = (leading - (self.font.ascent - self.font.descent) * size) / 2 + self.font.ascent * size
+        for line in _wrap(fragments, self.font, size, width):
+            if top >= bottom:
+                break
+            cursor = x
+            for text, bold in line:
+                self._text(cursor, top + baseline_offset, size, text, color, bold)
+                cursor += self.font.width(text, size)
+            top += leading
+        return top
+
+    def _statements(
+        self,
+        statements: Sequence[tuple[str, str]],
+        x: float,
+        top: float,
+        width: float,
+        color: str,
+        bottom: float,
+    ) -> float:
+        indent = LIST_INDENT_MM * PDF_POINTS_PER_MM
+        size = self.small_size
+        leading = size * 1.25
+        radius = size * 0.15
+        for code, text in statements:
+            if top >= bottom:
+                break
+            # Disc list marker, drawn rather than typeset so the font needs no bullet glyph.
+            self.items.append(
+                f"{color} rg "
+                + _rounded_rect(
+                    x + indent / 2 - radius,
+                    self._y(top + leading / 2 + radius),
+                    2 * radius,
+                    2 * radius,
+                    radius,
+                )
+                + " f"
+            )
+            fragments = [(code, True), (" " + text, False)] if code else [(text, False)]
+            top = self._paragraph(fragments, x + indent, top, width - indent, size, 1.25, color, bottom)
+        return top
+
+    def _pictograms(self, pictograms: Sequence[tuple[str, str]], x: float, top: float, width: float) -> float:
+        size = self.pictogram_size
+        gap = BLOCK_GAP_MM * PDF_POINTS_PER_MM
+        cursor = x
+        for code, _title in pictograms:
+            if cursor > x and cursor + size > x + width:
+                cursor = x
+                top += size + gap
+            pictogram = _pictogram(code)
+            self.items.append(
+                f"q {_num(size / pictogram.width)} 0 0 {_num(-size / pictogram.height)} "
+                f"{_num(cursor)} {_num(self._y(top))} cm /{self.pictogram_names[code]} Do Q"
+            )
+            cursor += size + gap
+        return top + size
+
+
+def _rounded_rect(x: float, y: float, width: float, height: float, radius: float) -> str:
+    """Path operators for a rounded rectangle with lower-left corner (x, y)."""
+    r = max(0.0, min(radius, width / 2, height / 2))
+    k = r * _ARC_KAPPA
+    right, top = x + width, y + height
+    points = [
+        f"{_num(x + r)} {_num(y)} m",
+        f"{_num(right - r)} {_num(y)} l",
+        f"{_num(right - r + k)} {_num(y)} {_num(right)} {_num(y + r - k)} {_num(right)} {_num(y + r)} c",
+        f"{_num(right)} {_num(top - r)} l",
+        f"{_num(right)} {_num(top - r + k)} {_num(right - r + k)} {_num(top)} {_num(right - r)} {_num(top)} c",
+        f"{_num(x + r)} {_num(top)} l",
+        f"{_num(x + r - k)} {_num(top)} {_num(x)} {_num(top - r + k)} {_num(x)} {_num(top - r)} c",
+        f"{_num(x)} {_num(y + r)} l",
+        f"{_num(x)} {_num(y + r - k)} {_num(x + r - k)} {_num(y)} {_num(x + r)} {_num(y)} c",
+        "h",
+    ]
+    return " ".join(points)
+
+
+def _to_unicode_cmap(glyph_ids: dict[str, int]) -> bytes:
+    entries = sorted((glyph_id, char) for char, glyph_id in glyph_ids.items() if glyph_id)
+    blocks = []
+    for start in range(0, len(entries), 100):
+        chunk = entries[start:start + 100]
+        lines = "\n".join(
+            f"<{glyph_id:04X}> <{char.encode('utf-16-be').hex().upper()}>" for glyph_id, char in chunk
+        )
+        blocks.append(f"{len(chunk)} beginbfchar\n{lines}\nendbfchar")
+    return (
+        "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        + "\n".join(blocks)
+        + "\nendcmap\nCMapName currentdict /CMap defineresource pop\nend\nend"
+    ).encode("ascii")
+
+
+def render_label_sheet(sheet: LabelSheet, font: LabelFont) -> bytes:
+    """Draw ``sheet`` as a PDF with ``font`` embedded as a subset."""
+    painter = _SheetPainter(sheet, font)
+    pages = [painter.paint_page(index) for index in range(sheet.page_count)]
+    used_text = "".join(
+        item.text for page in pages for item in page if isinstance(item, _TextRun)
+    )
+    font_data, glyph_ids, widths = font.subset(used_text)
+
+    objects = _PdfObjects()
+    catalog, page_tree, info = objects.reserve(), objects.reserve(), objects.reserve()
+    objects.set(info, "<< /Producer (GHS label native renderer) >>")
+
+    tag = "".join(
+        chr(ord("A") + byte % 26) for byte in hashlib.sha256(used_text.encode("utf-8")).digest()[:6]
+    )
+    base_font = f"{tag}+{font.postscript_name}"
+    font_file = objects.add_stream(font_data, f"/Length1 {len(font_data)} ")
+    descriptor = objects.add(
+        f"<< /Type /FontDescriptor /FontName /{base_font} /Flags 4 "
+        f"/FontBBox [{' '.join(str(value) for value in font.bbox)}] /ItalicAngle 0 "
+        f"/Ascent {round(font.ascent * 1000)} /Descent {round(font.descent * 1000)} "
+        f"/CapHeight {font.cap_height} /StemV 80 /FontFile2 {font_file} 0 R >>"
+    )
+    used_glyphs = sorted(set(glyph_ids.values()))
+    width_array = " ".join(f"{glyph_id} [{widths.get(glyph_id, 0)}]" for glyph_id in used_glyphs)
+    cid_font = objects.add(
+        f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base_font} "
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        f"/FontDescriptor {descriptor} 0 R /CIDToGIDMap /Identity /DW 1000 /W [{width_array}] >>"
+    )
+    to_unicode = objects.add_stream(_to_unicode_cmap(glyph_ids))
+    font_ref = objects.add(
+        f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_font} /Encoding /Identity-H "
+        f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>"
+    )
+    xobjects = []
+    for code, name in painter.pictogram_names.items():
+        pictogram = _pictogram(code)
+        ref = objects.add_stream(
+            pictogram.stream,
+            f"/Type /XObject /Subtype /Form /BBox [0 0 {_num(pictogram.width)} {_num(pictogram.height)}] ",
+            compressed=True,
+        )
+        xobjects.append(f"/{name} {ref} 0 R")
+    resources = objects.add(
+        f"<< /Font << /F1 {font_ref} 0 R >> /XObject << {' '.join(xobjects)} >> >>"
+    )
+
+    media_box = (
+        f"[0 0 {_num(sheet.page.width_mm * PDF_POINTS_PER_MM)} {_num(painter.page_height)}]"
+    )
+    page_refs = []
+    for items in pages:
+        content = []
+        for item in items:
+            if isinstance(item, str):
+                content.append(item)
+                continue
+            encoded = "".join(f"{glyph_ids[char]:04X}" for char in item.text)
+            mode = (
+                f"2 Tr {_num(item.size * BOLD_STROKE_RATIO)} w {item.color} RG "
+                if item.bold else "0 Tr "
+            )
+            content.append(
+                f"BT {item.color} rg {mode}/F1 {_num(item.size)} Tf "
+                f"{_num(item.x)} {_num(item.y)} Td <{encoded}> Tj ET"
+            )
+        stream = objects.add_stream("\n".join(content).encode("latin-1"))
+        page_refs.append(objects.add(
+            f"<< /Type /Page /Parent {page_tree} 0 R /MediaBox {media_box} "
+            f"/Resources {resources} 0 R /Contents {stream} 0 R >>"
+        ))
+    objects.set(
+        page_tree,
+        f"<< /Type /Pages /Count {len(page_refs)} "
+        f"/Kids [{' '.join(f'{ref} 0 R' for ref in page_refs)}] >>",
+    )
+    objects.set(catalog, f"<< /Type /Catalog /Pages {page_tree} 0 R >>")
+    return objects.serialize(catalog, info)
+
+
+class NativeLabelPdfRenderer:
+    """Renders label sheets natively; validated like browser output."""
+
+    def __init__(
+        self,
+        *,
+        font_path: Optional[Union[str, Path]] = None,
+        max_output_bytes: int = DEFAULT_MAX_RENDERED_PDF_BYTES,
+        max_concurrent: int = DEFAULT_NATIVE_MAX_CONCURRENT,
+    ):
+        self.font_path = font_path
+        self.max_output_bytes = max(1, int(max_output_bytes))
+        self._semaphore = asyncio.Semaphore(max(1, int(max_concurrent)))
+        self._font: Optional[LabelFont] = None
+        self._startup_error: Optional[str] = None
+        self._renders = 0
+        self._failures = 0
+        self._last_render_ms: Optional[int] = None
+
+    @property
+    def available(self) -> bool:
+        return self._font is not None
+
+    @property
+    def startup_error(self) -> Optional[str]:
+        return self._startup_error
+
+    async def startup(self) -> None:
+        if self._font is not None:
+            return
+        path = find_label_font(self.font_path)
+        if path is None:
+            self._startup_error = f"no TrueType font in {FONT_DIR}"
+        else:
+            try:
+                self._font = await asyncio.to_thread(LabelFont, path)
+                self._startup_error = None
+            except Exception as exc:
+                self._startup_error = f"{path.name}: {exc!r}"
+        if self._font is None:
+            logger.warning(
+                "Native label PDF renderer unavailable; label sheets need Chromium: %s",
+                self._startup_error,
+            )
+
+    async def render(self, sheet: LabelSheet) -> bytes:
+        font = self._font
+        if font is None:
+            raise PdfRenderUnavailableError("Native label PDF renderer has no usable font")
+        started_at = time.monotonic()
+        try:
+            async with self._semaphore:
+                pdf_bytes = await asyncio.to_thread(self._render_validated, sheet, font)
+        except Exception:
+            self._failures += 1
+            raise
+        self._renders += 1
+        self._last_render_ms = int((time.monotonic() - started_at) * 1000)
+        return pdf_bytes
+
+    def _render_validated(self, sheet: LabelSheet, font: LabelFont) -> bytes:
+        pdf_bytes = render_label_sheet(sheet, font)
+        validate_rendered_pdf(
+            pdf_bytes,
+            PrintPdfRequest.model_construct(html="", page=sheet.page, meta=sheet.meta),
+            max_output_bytes=self.max_output_bytes,
+        )
+        return pdf_bytes
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "available": self.available,
+            "font": self._font.family if self._font is not None else None,
+            "startupError": self._startup_error,
+            "renders": self._renders,
+            "failures": self._failures,
+            "lastRenderMs": self._last_render_ms,
+        }
@@ -1,11 +1,21 @@
 import asyncio
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
 from io import BytesIO
+import json
 import logging
+import math
+import os
+from pathlib import Path
 import re
-from typing import Any, Literal, Optional
+import time
+from typing import Any, Iterator, Literal, Optional, Union
 
+from cachetools import TTLCache
 from pydantic import BaseModel, Field, field_validator
-from pypdf import PdfReader
+from pypdf import PdfReader, PdfWriter
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +24,69 @@ MAX_PRINT_PDF_HTML_BYTES = 3 * 1024 * 1024
 DEFAULT_RENDER_TIMEOUT_MS = 10_000
 DEFAULT_MAX_CONCURRENT_RENDERS = 2
 DEFAULT_MAX_RENDERED_PDF_BYTES = 64 * 1024 * 1024
+# Pre-warmed contexts kept between renders; 0 renders each job in a fresh
+# context that is closed afterwards.
+DEFAULT_CONTEXT_POOL_SIZE = 0
+DEFAULT_MAX_RENDERS_PER_CONTEXT = 50
+RENDER_PHASES = ("acquire", "set_content", "pdf", "optimize", "validate", "reset", "merge")
+# Pages per chunk when a large document is split on page boundaries and the
+# chunks rendered on parallel slots; 0 always renders in one piece.
+DEFAULT_CHUNK_PAGES = 0
+# Every Nth output gets the strict full parse; the rest get the structural
+# page-tree check. 1 = always strict, 0 = never.
+DEFAULT_STRICT_VALIDATION_EVERY = 1
+# Renders allowed to wait for a slot once all are busy; 0 rejects at once.
+DEFAULT_MAX_QUEUED_RENDERS = 0
+QUEUE_WAIT_BUCKETS_MS = (50, 250, 1000, 5000)
+# How long a render waits for a browser that is still starting before it is
+# answered with pdf_renderer_unavailable.
+DEFAULT_STARTUP_WAIT_MS = 10_000
+# After a failed launch the next render retries it at most this often, so a
+# host without Chromium does not relaunch it on every request.
+STARTUP_RETRY_SECONDS = 60
+_RECENT_RENDER_SAMPLES = 32
+# Bump when a change here alters the PDF produced for the same request, so
+# cached output from the previous code is never served.
+PDF_RENDER_CACHE_FORMAT = 2
+DEFAULT_RENDER_CACHE_TTL_SECONDS = 3600
 PDF_POINTS_PER_MM = 72 / 25.4
+# A rewrite that saves less than this is discarded and the browser's bytes
+# are served as they are.
+MIN_OPTIMIZED_SAVINGS_BYTES = 1024
 PDF_GEOMETRY_TOLERANCE_POINTS = 3
 
+# The print document is <body> followed by one top-level page block per
+# printed page (see frontend/src/utils/printLabels.js).
+_BODY_OPEN_PATTERN = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
+_BODY_CLOSE_PATTERN = re.compile(r"</body\s*>", re.IGNORECASE)
+_PAGE_BLOCK_PATTERN = re.compile(r'<div\s+class="page"\s*>')
 _SCRIPT_TAG_PATTERN = re.compile(r"<\s*script\b", re.IGNORECASE)
 _JAVASCRIPT_URL_PATTERN = re.compile(r"javascript\s*:", re.IGNORECASE)
 _EVENT_HANDLER_ATTR_PATTERN = re.compile(
     r"<[^>]+\s+on[a-z][a-z0-9_:-]*\s*=",
     re.IGNORECASE,
 )
+# Subset fonts are named with a six-letter tag, e.g. /AAAAAA+NotoSansCJKtc.
+_SUBSET_FONT_NAME_PATTERN = re.compile(r"^/?[A-Z]{6}\+")
+_EMBEDDED_FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+# Byte counts of the render running in this context; see pdf_output_sizes().
+_output_sizes: ContextVar[Optional[Counter]] = ContextVar("pdf_output_sizes", default=None)
+
+
+# Loaded once per pooled context so the CJK and monospace faces used by the
+# label stylesheet are resolved and cached before the first real job.
+_FONT_PRIMING_DOCUMENT = """<!DOCTYPE html>
+<html>
+  <body>
+    <p style="font-family: 'Microsoft JhengHei', 'PingFang TC', 'Noto Sans TC', 'Helvetica Neue', Arial, sans-serif">
+      危險 警告 鹽酸 Hydrochloric acid 0123456789
+    </p>
+    <p style="font-family: Consolas, Monaco, 'Courier New', monospace">H225 P210 64-17-5</p>
+  </body>
+</html>
+"""
+_BLANK_DOCUMENT = "<!DOCTYPE html><html><body></body></html>"
 
 
 class PrintPdfPage(BaseModel):
@@ -69,8 +133,14 @@ class PdfRenderUnavailableError(PdfRenderError):
 
 
 class PdfRenderBusyError(PdfRenderError):
-    def __init__(self, message: str = "PDF renderer is busy"):
+    def __init__(
+        self,
+        message: str = "PDF renderer is busy",
+        *,
+        retry_after_seconds: Optional[int] = None,
+    ):
         super().__init__("pdf_render_busy", message)
+        self.retry_after_seconds = retry_after_seconds
 
 
 async def block_non_data_route(route: Any) -> None:
@@ -87,6 +157,10 @@ def _format_mm(value: float) -> str:
     return f"{value:g}mm"
 
 
+def _render_timeout() -> PdfRenderError:
+    return PdfRenderError("pdf_render_timeout", "PDF render exceeded the request timeout")
+
+
 def _invalid_pdf(reason: str) -> PdfRenderError:
     logger.warning(
         "Rejected generated PDF output",
@@ -98,44 +172,385 @@ def _invalid_pdf(reason: str) -> PdfRenderError:
     )
 
 
+def _check_page_geometry(width: float, height: float, payload: PrintPdfRequest) -> None:
+    if (
+        abs(width - payload.page.width_mm * PDF_POINTS_PER_MM) > PDF_GEOMETRY_TOLERANCE_POINTS
+        or abs(height - payload.page.height_mm * PDF_POINTS_PER_MM) > PDF_GEOMETRY_TOLERANCE_POINTS
+    ):
+        raise _invalid_pdf("page_geometry_mismatch")
+
+
+def _structural_media_boxes(reader: PdfReader, expected_pages: int) -> list[Any]:
+    """Walk the page tree and return each leaf's (inherited) MediaBox.
+
+    Reads only the page-tree dictionaries: no page objects are built and no
+    content streams are touched. Stops at the first sign of a tree that
+    does not hold exactly ``expected_pages`` leaves.
+    """
+    root = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+    if int(root.get("/Count", -1)) != expected_pages:
+        raise _invalid_pdf("page_count_mismatch")
+    boxes = []
+    visited: set[int] = set()
+    stack = [(root, None)]
+    while stack:
+        node, inherited = stack.pop()
+        if id(node) in visited or len(visited) > 2 * expected_pages + 1:
+            raise _invalid_pdf("malformed_document")
+        visited.add(id(node))
+        box = node.get("/MediaBox", inherited)
+        if node.get("/Type") == "/Pages" or "/Kids" in node:
+            kids = [kid.get_object() for kid in node["/Kids"]]
+            stack.extend((kid, box) for kid in reversed(kids))
+            continue
+        if box is None:
+            raise _invalid_pdf("invalid_media_box")
+        boxes.append(box.get_object())
+    if len(boxes) != expected_pages:
+        raise _invalid_pdf("page_count_mismatch")
+    return boxes
+
+
 def validate_rendered_pdf(
     pdf_bytes: bytes,
     payload: PrintPdfRequest,
     *,
     max_output_bytes: int = DEFAULT_MAX_RENDERED_PDF_BYTES,
+    strict: bool = True,
 ) -> None:
-    """Validate browser output without logging or retaining document data."""
+    """Validate browser output without logging or retaining document data.
+
+    ``strict`` parses the whole cross-reference table strictly and builds
+    every page object. The structural mode only checks the page tree's
+    count and each page's MediaBox, which is enough for the page contract
+    and several times cheaper on long documents. Both are CPU-bound; the
+    renderer calls this from a worker thread.
+    """
     if not isinstance(pdf_bytes, bytes) or not pdf_bytes.startswith(b"%PDF-"):
         raise _invalid_pdf("invalid_header")
     if len(pdf_bytes) > max_output_bytes:
         raise _invalid_pdf("byte_limit_exceeded")
 
+    expected_pages = payload.meta.page_count_expected
     try:
-        reader = PdfReader(BytesIO(pdf_bytes), strict=True)
+        reader = PdfReader(BytesIO(pdf_bytes), strict=strict)
         if reader.is_encrypted:
             raise _invalid_pdf("encrypted_output")
-        pages = list(reader.pages)
+        pages = list(reader.pages) if strict else _structural_media_boxes(reader, expected_pages)
     except PdfRenderError:
         raise
     except Exception as exc:
         raise _invalid_pdf("malformed_document") from exc
 
-    if len(pages) != payload.meta.page_count_expected:
+    if len(pages) != expected_pages:
         raise _invalid_pdf("page_count_mismatch")
-
-    expected_width = payload.page.width_mm * PDF_POINTS_PER_MM
-    expected_height = payload.page.height_mm * PDF_POINTS_PER_MM
     for page in pages:
         try:
-            width = float(page.mediabox.width)
-            height = float(page.mediabox.height)
+            if strict:
+                width, height = float(page.mediabox.width), float(page.mediabox.height)
+            else:
+                width = float(page[2]) - float(page[0])
+                height = float(page[3]) - float(page[1])
         except Exception as exc:
             raise _invalid_pdf("invalid_media_box") from exc
-        if (
-            abs(width - expected_width) > PDF_GEOMETRY_TOLERANCE_POINTS
-            or abs(height - expected_height) > PDF_GEOMETRY_TOLERANCE_POINTS
-        ):
-            raise _invalid_pdf("page_geometry_mismatch")
+        _check_page_geometry(width, height, payload)
+
+
+def _unsubset_embedded_fonts(pdf: Union[PdfReader, PdfWriter]) -> int:
+    """Count distinct embedded font programs that are not subsets."""
+    seen: set[int] = set()
+    programs: set[int] = set()
+    pending = [page.get("/Resources") for page in pdf.pages]
+    while pending:
+        resources = pending.pop()
+        resources = resources.get_object() if resources is not None else None
+        if not isinstance(resources, dict):
+            continue
+        fonts = resources.get("/Font")
+        for ref in (fonts.get_object().values() if fonts is not None else ()):
+            font = ref.get_object()
+            if id(font) in seen:
+                continue
+            seen.add(id(font))
+            for face in [font, *(item.get_object() for item in font.get("/DescendantFonts", ()))]:
+                descriptor = face.get("/FontDescriptor")
+                descriptor = descriptor.get_object() if descriptor is not None else {}
+                if _SUBSET_FONT_NAME_PATTERN.match(str(face.get("/BaseFont", ""))):
+                    continue
+                programs.update(
+                    id(descriptor[key].get_object()) for key in _EMBEDDED_FONT_FILE_KEYS if key in descriptor
+                )
+        xobjects = resources.get("/XObject")
+        for ref in (xobjects.get_object().values() if xobjects is not None else ()):
+            xobject = ref.get_object()
+            if id(xobject) not in seen and xobject.get("/Subtype") == "/Form":
+                seen.add(id(xobject))
+                pending.append(xobject.get("/Resources"))
+    return len(programs)
+
+
+def optimize_rendered_pdf(pdf_bytes: bytes) -> tuple[bytes, dict[str, int]]:
+    """Shrink rendered output without changing what it draws.
+
+    Identical objects (the same pictogram image or font program repeated on
+    every page or in every merged chunk) are stored once, objects nothing
+    refers to are dropped, and uncompressed page content is Flate-encoded.
+    Fonts are only checked: Chromium and the native renderer embed subsets,
+    so any full program is counted in ``unsubsetFonts`` for the ops report
+    rather than re-subset here. The original bytes are returned when the
+    rewrite saves less than ``MIN_OPTIMIZED_SAVINGS_BYTES``.
+    """
+    reader = PdfReader(BytesIO(pdf_bytes))
+    writer = PdfWriter(clone_from=reader)
+    for page in writer.pages:
+        contents = page.get("/Contents")
+        streams = contents.get_object() if contents is not None else []
+        if not isinstance(streams, list):
+            streams = [streams]
+        if streams and all("/Filter" not in stream.get_object() for stream in streams):
+            page.compress_content_streams()
+    writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+    output = BytesIO()
+    writer.write(output)
+    optimized = output.getvalue()
+    if len(pdf_bytes) - len(optimized) < MIN_OPTIMIZED_SAVINGS_BYTES:
+        optimized = pdf_bytes
+    return optimized, {
+        "inputBytes": len(pdf_bytes),
+        "outputBytes": len(optimized),
+        "unsubsetFonts": _unsubset_embedded_fonts(writer),
+    }
+
+
+@contextmanager
+def pdf_output_sizes() -> Iterator[Counter]:
+    """Collect byte counts for the renders awaited inside the block.
+
+    ``rawBytes`` is what the browser produced (summed over chunks) before
+    ``optimize_rendered_pdf``; it stays 0 for cache hits.
+    """
+    sizes: Counter = Counter()
+    token = _output_sizes.set(sizes)
+    try:
+        yield sizes
+    finally:
+        _output_sizes.reset(token)
+
+
+def record_raw_output_bytes(size: int) -> None:
+    sizes = _output_sizes.get()
+    if sizes is not None:
+        sizes["rawBytes"] += size
+
+
+def split_print_document(payload: PrintPdfRequest, chunk_pages: int) -> Optional[list[PrintPdfRequest]]:
+    """Split ``payload`` into requests of at most ``chunk_pages`` pages.
+
+    Every chunk keeps the document head and body attributes and takes a run
+    of consecutive page blocks. Returns ``None`` when the document is small
+    enough, or when its page blocks do not account for exactly
+    ``page_count_expected`` pages, so it is rendered in one piece.
+
+    ``payload`` was either validated or built by the server, and a chunk is
+    a slice of it, so chunks are not put through the client-markup
+    validators again.
+    """
+    expected = payload.meta.page_count_expected
+    if chunk_pages <= 0 or expected <= chunk_pages:
+        return None
+    html = payload.html
+    body_open = _BODY_OPEN_PATTERN.search(html)
+    body_close = None
+    for body_close in _BODY_CLOSE_PATTERN.finditer(html):
+        pass
+    if body_open is None or body_close is None or body_close.start() < body_open.end():
+        return None
+    starts = [
+        match.start()
+        for match in _PAGE_BLOCK_PATTERN.finditer(html, body_open.end(), body_close.start())
+    ]
+    if len(starts) != expected:
+        return None
+    prefix, suffix = html[: starts[0]], html[body_close.start():]
+    starts.append(body_close.start())
+    chunks = []
+    for first in range(0, expected, chunk_pages):
+        last = min(first + chunk_pages, expected)
+        chunks.append(
+            PrintPdfRequest.model_construct(
+                html=prefix + html[starts[first]:starts[last]] + suffix,
+                page=payload.page,
+                meta=PrintPdfMeta.model_construct(
+                    label_purpose=payload.meta.label_purpose,
+                    page_count_expected=last - first,
+                ),
+            )
+        )
+    return chunks
+
+
+def render_cache_key(
+    payload: PrintPdfRequest,
+    *,
+    renderer_version: str = "",
+    font_config: str = "",
+) -> str:
+    """Digest of everything that shapes the rendered PDF for ``payload``."""
+    material = json.dumps(
+        {
+            "format": PDF_RENDER_CACHE_FORMAT,
+            "html": payload.html,
+            "page": payload.page.model_dump(),
+            "meta": payload.meta.model_dump(),
+            "renderer": renderer_version,
+            "fonts": font_config,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class PdfRenderCache:
+    """Byte-bounded cache of validated PDFs keyed by ``render_cache_key``.
+
+    Only digests and PDF bytes are held; document content is never logged.
+    The memory tier is a TTL cache sized in bytes. The optional disk tier
+    stores one ``<key>.pdf`` file per entry, expires files by mtime and
+    evicts the oldest once ``max_disk_bytes`` is exceeded; disk I/O runs in
+    a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl_seconds: int = DEFAULT_RENDER_CACHE_TTL_SECONDS,
+        directory: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = 0,
+    ):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self.directory = Path(directory) if directory and max_disk_bytes > 0 else None
+        self.max_disk_bytes = max(0, int(max_disk_bytes)) if self.directory else 0
+        self._memory: TTLCache = TTLCache(
+            maxsize=max(1, self.max_bytes),
+            ttl=self.ttl_seconds,
+            getsizeof=len,
+        )
+        self._counts: Counter = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.directory is not None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        pdf_bytes = self._memory.get(key)
+        if pdf_bytes is not None:
+            self._counts["memory_hits"] += 1
+            return pdf_bytes
+        if self.directory is not None:
+            try:
+                pdf_bytes = await asyncio.to_thread(self._read_disk, key)
+            except OSError as exc:
+                logger.warning("PDF render cache read failed: %r", exc)
+                pdf_bytes = None
+            if pdf_bytes is not None:
+                self._counts["disk_hits"] += 1
+                self._remember(key, pdf_bytes)
+                return pdf_bytes
+        self._counts["misses"] += 1
+        return None
+
+    async def put(self, key: str, pdf_bytes: bytes) -> None:
+        self._remember(key, pdf_bytes)
+        if self.directory is not None and len(pdf_bytes) <= self.max_disk_bytes:
+            try:
+                await asyncio.to_thread(self._write_disk, key, pdf_bytes)
+            except OSError as exc:
+                logger.warning("PDF render cache write failed: %r", exc)
+        self._counts["stores"] += 1
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*.pdf"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, Any]:
+        hits = self._counts["memory_hits"] + self._counts["disk_hits"]
+        lookups = hits + self._counts["misses"]
+        return {
+            "enabled": self.enabled,
+            "ttlSeconds": self.ttl_seconds,
+            "maxBytes": self.max_bytes,
+            "bytes": int(self._memory.currsize),
+            "entries": len(self._memory),
+            "disk": self.directory is not None,
+            "maxDiskBytes": self.max_disk_bytes,
+            **{key: self._counts[key] for key in ("memory_hits", "disk_hits", "misses", "stores")},
+            "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, pdf_bytes: bytes) -> None:
+        if 0 < len(pdf_bytes) <= self.max_bytes:
+            self._memory[key] = pdf_bytes
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self.directory / f"{key}.pdf"
+        try:
+            modified = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - modified > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        pdf_bytes = path.read_bytes()
+        # Entries were validated before they were stored; a truncated or
+        # foreign file is dropped rather than served.
+        if not pdf_bytes.startswith(b"%PDF-"):
+            path.unlink(missing_ok=True)
+            return None
+        return pdf_bytes
+
+    def _write_disk(self, key: str, pdf_bytes: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.pdf"
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_bytes(pdf_bytes)
+        os.replace(partial, path)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class _RenderContext:
+    """One sandboxed browser context and its page, reused between jobs."""
+
+    __slots__ = ("context", "page", "renders")
+
+    def __init__(self, context: Any, page: Any):
+        self.context = context
+        self.page = page
+        self.renders = 0
 
 
 class PrintPdfRenderer:
@@ -146,13 +561,67 @@ class PrintPdfRenderer:
         timeout_ms: int = DEFAULT_RENDER_TIMEOUT_MS,
         max_concurrent: int = DEFAULT_MAX_CONCURRENT_RENDERS,
         max_output_bytes: int = DEFAULT_MAX_RENDERED_PDF_BYTES,
+        context_pool_size: int = DEFAULT_CONTEXT_POOL_SIZE,
+        max_renders_per_context: int = DEFAULT_MAX_RENDERS_PER_CONTEXT,
+        max_queued_renders: int = DEFAULT_MAX_QUEUED_RENDERS,
+        max_queue_wait_ms: Optional[int] = None,
+        cache: Optional[PdfRenderCache] = None,
+        font_config: str = "",
+        chunk_pages: int = DEFAULT_CHUNK_PAGES,
+        strict_validation_every: int = DEFAULT_STRICT_VALIDATION_EVERY,
+        optimize_output: bool = True,
+        startup_wait_ms: int = DEFAULT_STARTUP_WAIT_MS,
     ):
         self._browser = browser
         self._playwright = None
         self._startup_error: Optional[Exception] = None
+        self.startup_wait_ms = max(0, int(startup_wait_ms))
+        self._startup_task: Optional[asyncio.Task] = None
+        self._startup_failed_at: Optional[float] = None
+        self._startup_attempts = 0
+        self._startup_phase_ms: dict[str, float] = {}
         self.timeout_ms = timeout_ms
         self.max_output_bytes = max(1, int(max_output_bytes))
-        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Jobs beyond the running ones wait FIFO on the semaphore, up to a
+        # depth and for no longer than the wait budget (by default one
+        # render timeout), instead of bouncing straight back as 503s.
+        self.max_queued_renders = max(0, int(max_queued_renders))
+        self.max_queue_wait_ms = max(
+            0, int(timeout_ms if max_queue_wait_ms is None else max_queue_wait_ms)
+        )
+        self._queued = 0
+        self._running = 0
+        self._recent_render_seconds: deque[float] = deque(maxlen=_RECENT_RENDER_SAMPLES)
+        self._queue_counts: Counter = Counter()
+        self._queue_depth_histogram: Counter = Counter()
+        self._queue_wait_histogram: Counter = Counter()
+        # More idle contexts than concurrent renders would never be used.
+        self.context_pool_size = max(0, min(int(context_pool_size), max_concurrent))
+        self.max_renders_per_context = max(1, int(max_renders_per_context))
+        self._idle_contexts: list[_RenderContext] = []
+        self._warming_contexts = 0
+        # Contexts being blanked for reuse still belong to the pool: a render
+        # that finds no idle context waits for one of them rather than
+        # opening a cold context the pool has no room to keep.
+        self._resetting_contexts = 0
+        self._context_returned = asyncio.Event()
+        self._pool_tasks: set[asyncio.Task] = set()
+        self._pool_counts: Counter = Counter()
+        self._phase_counts: Counter = Counter()
+        self._phase_total_ms: Counter = Counter()
+        self._phase_max_ms: dict[str, float] = {}
+        # Identical requests (reprints, the same sheet twice) are answered
+        # from previously validated output without taking a render slot.
+        self.cache = cache if cache is not None and cache.enabled else None
+        self.font_config = font_config
+        self.chunk_pages = max(0, int(chunk_pages))
+        self._chunk_counts: Counter = Counter()
+        self.strict_validation_every = max(0, int(strict_validation_every))
+        self._validation_counts: Counter = Counter()
+        self.optimize_output = bool(optimize_output)
+        self._optimize_counts: Counter = Counter()
 
     @property
     def available(self) -> bool:
@@ -162,31 +631,134 @@ class PrintPdfRenderer:
     def startup_error(self) -> Optional[Exception]:
         return self._startup_error
 
+    @property
+    def startup_state(self) -> str:
+        if self.available:
+            return "ready"
+        if self._startup_task is not None and not self._startup_task.done():
+            return "starting"
+        return "failed" if self._startup_attempts else "not_started"
+
+    def start_in_background(self) -> Optional[asyncio.Task]:
+        """Launch the browser in a task so the caller need not wait for it.
+
+        Returns the running startup task, or a new one if startup has never
+        run or the last launch failed more than ``STARTUP_RETRY_SECONDS``
+        ago; otherwise None.
+        """
+        task = self._startup_task
+        if task is not None and not task.done():
+            return task
+        if self.available:
+            return None
+        if self._startup_attempts and (
+            self._startup_failed_at is None
+            or time.monotonic() - self._startup_failed_at < STARTUP_RETRY_SECONDS
+        ):
+            return None
+        self._startup_task = asyncio.create_task(self.startup())
+        return self._startup_task
+
+    async def wait_for_startup(self) -> bool:
+        """Wait up to ``startup_wait_ms`` for the browser, starting it if
+        needed; returns whether it is available."""
+        if self.available:
+            return True
+        task = self.start_in_background()
+        if task is None:
+            return False
+        try:
+            # Shielded: a request giving up must not cancel the launch.
+            await asyncio.wait_for(asyncio.shield(task), timeout=self.startup_wait_ms / 1000)
+        except asyncio.TimeoutError:
+            return False
+        return self.available
+
+    async def _await_startup(self) -> None:
+        if await self.wait_for_startup():
+            return
+        if self.startup_state == "starting":
+            raise PdfRenderUnavailableError("PDF renderer is still starting")
+        raise PdfRenderUnavailableError()
+
+    def _observe_startup_phase(self, phase: str, started: float) -> None:
+        self._startup_phase_ms[phase] = round((time.perf_counter() - started) * 1000, 2)
+
     async def startup(self) -> None:
         if self._browser is not None:
             return
+        self._startup_attempts += 1
+        self._startup_phase_ms = {}
+        started = time.perf_counter()
         try:
             from playwright.async_api import async_playwright
 
+            phase_started = time.perf_counter()
             self._playwright = await async_playwright().start()
+            self._observe_startup_phase("playwright", phase_started)
+            phase_started = time.perf_counter()
             self._browser = await self._playwright.chromium.launch()
+            self._observe_startup_phase("launch", phase_started)
             self._startup_error = None
+            self._startup_failed_at = None
         except Exception as exc:  # pragma: no cover - environment dependent
             self._startup_error = exc
+            self._startup_failed_at = time.monotonic()
             self._browser = None
+            self._observe_startup_phase("total", started)
             # Surface the launch failure in runtime logs: a silent failure
             # here degrades /api/print/pdf to opaque 503s in production.
             logger.error(
                 "PDF renderer startup failed; /api/print/pdf will return 503: %r",
                 exc,
+                extra={"startup_total_ms": self._startup_phase_ms["total"]},
             )
             if self._playwright is not None:
                 try:
                     await self._playwright.stop()
                 finally:
                     self._playwright = None
+            return
+        phase_started = time.perf_counter()
+        await self.warm_pool()
+        self._observe_startup_phase("warm_pool", phase_started)
+        self._observe_startup_phase("total", started)
+        logger.info(
+            "PDF renderer started",
+            extra={f"startup_{phase}_ms": ms for phase, ms in self._startup_phase_ms.items()},
+        )
+
+    async def warm_pool(self) -> int:
+        """Fill the context pool up to its size; return contexts added."""
+        added = 0
+        while (
+            self._browser is not None
+            and self._pooled_context_count() < self.context_pool_size
+        ):
+            self._warming_contexts += 1
+            try:
+                render_context = await self._new_render_context(prime=True)
+            except Exception as exc:
+                logger.warning("PDF context warm-up failed: %r", exc)
+                self._pool_counts["warm_failed"] += 1
+                break
+            finally:
+                self._warming_contexts -= 1
+            self._idle_contexts.append(render_context)
+            added += 1
+        return added
 
     async def shutdown(self) -> None:
+        if self._startup_task is not None and not self._startup_task.done():
+            self._startup_task.cancel()
+            await asyncio.gather(self._startup_task, return_exceptions=True)
+        for task in list(self._pool_tasks):
+            task.cancel()
+        if self._pool_tasks:
+            await asyncio.gather(*self._pool_tasks, return_exceptions=True)
+        idle, self._idle_contexts = self._idle_contexts, []
+        for render_context in idle:
+            await self._close_render_context(render_context)
         if self._browser is not None:
             await self._browser.close()
             self._browser = None
@@ -194,57 +766,432 @@ class PrintPdfRenderer:
             await self._playwright.stop()
             self._playwright = None
 
-    async def render(self, payload: PrintPdfRequest) -> bytes:
-        if self._browser is None:
-            raise PdfRenderUnavailableError()
-        if self._semaphore.locked():
-            raise PdfRenderBusyError()
-        await self._semaphore.acquire()
+    @property
+    def renderer_version(self) -> str:
+        return str(getattr(self._browser, "version", "") or "")
+
+    async def render(self, payload: PrintPdfRequest, *, use_cache: bool = True) -> bytes:
+        await self._await_startup()
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = render_cache_key(
+                payload,
+                renderer_version=self.renderer_version,
+                font_config=self.font_config,
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        chunks = split_print_document(payload, self.chunk_pages)
+        if chunks is None:
+            pdf_bytes = await self._render_in_slot(payload)
+        else:
+            pdf_bytes = await self._render_chunked(payload, chunks)
+        if cache_key is not None:
+            await self.cache.put(cache_key, pdf_bytes)
+        return pdf_bytes
+
+    async def _render_in_slot(self, payload: PrintPdfRequest) -> bytes:
+        await self._wait_for_render_slot()
+        try:
+            return await self._render_holding_slot(payload)
+        finally:
+            self._semaphore.release()
+
+    async def _render_chunked(self, payload: PrintPdfRequest, chunks: list[PrintPdfRequest]) -> bytes:
+        """Render ``chunks`` on every idle slot and merge them in order.
+
+        The job is admitted through the queue like any other render, then
+        also takes whichever slots are free at that moment (never jumping
+        queued jobs), so large documents finish faster on an idle renderer
+        without starving anyone. The whole job, merge included, gets one
+        render timeout, the same budget as an unchunked render; chunks still
+        pending when it runs out are cancelled.
+        """
+        await self._wait_for_render_slot()
+        deadline = time.monotonic() + self.timeout_ms / 1000
+        slots = 1
+        while slots < len(chunks) and not self._semaphore.locked():
+            await self._semaphore.acquire()
+            slots += 1
+        self._chunk_counts["jobs"] += 1
+        self._chunk_counts["chunks"] += len(chunks)
+        self._chunk_counts["slots"] += slots
+        pending = iter(enumerate(chunks))
+        results: list[bytes] = [b""] * len(chunks)
+
+        async def drain() -> None:
+            for index, chunk in pending:
+                results[index] = await self._render_holding_slot(chunk)
+
+        tasks = [asyncio.create_task(drain()) for _ in range(slots)]
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=deadline - time.monotonic())
+        except asyncio.TimeoutError as exc:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise _render_timeout() from exc
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            for _ in range(slots):
+                self._semaphore.release()
+        started = time.perf_counter()
+        try:
+            merged = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self._merge_chunks,
+                    results,
+                    payload,
+                    strict=self._next_validation_is_strict(),
+                ),
+                timeout=deadline - time.monotonic(),
+            )
+        except asyncio.TimeoutError as exc:
+            raise _render_timeout() from exc
+        self._observe_phase("merge", started)
+        return merged
+
+    def _merge_chunks(self, parts: list[bytes], payload: PrintPdfRequest, *, strict: bool) -> bytes:
+        writer = PdfWriter()
+        try:
+            for part in parts:
+                writer.append(PdfReader(BytesIO(part)))
+            if self.optimize_output:
+                # Chunks each embed their own copy of the shared pictograms.
+                writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+            output = BytesIO()
+            writer.write(output)
+        except Exception as exc:
+            raise _invalid_pdf("merge_failed") from exc
+        pdf_bytes = output.getvalue()
+        validate_rendered_pdf(
+            pdf_bytes,
+            payload,
+            max_output_bytes=self.max_output_bytes,
+            strict=strict,
+        )
+        return pdf_bytes
+
+    def _next_validation_is_strict(self) -> bool:
+        every = self.strict_validation_every
+        strict = bool(every) and sum(self._validation_counts.values()) % every == 0
+        self._validation_counts["strict" if strict else "structural"] += 1
+        return strict
+
+    async def _render_holding_slot(self, payload: PrintPdfRequest) -> bytes:
+        self._running += 1
+        started = time.perf_counter()
         try:
             return await asyncio.wait_for(
-                self._render_with_context(payload),
+                self._dispatch(payload),
                 timeout=self.timeout_ms / 1000,
             )
         except asyncio.TimeoutError as exc:
-            raise PdfRenderError(
-                "pdf_render_timeout",
-                "PDF render exceeded the request timeout",
-            ) from exc
+            raise _render_timeout() from exc
         except PdfRenderError:
             raise
         except Exception as exc:
             raise PdfRenderError("pdf_render_failed", "PDF render failed") from exc
         finally:
-            self._semaphore.release()
+            self._recent_render_seconds.append(time.perf_counter() - started)
+            self._running -= 1
 
-    async def _render_with_context(self, payload: PrintPdfRequest) -> bytes:
+    def _dispatch(self, payload: PrintPdfRequest):
+        if self.context_pool_size:
+            return self._render_with_pooled_context(payload)
+        return self._render_with_context(payload)
+
+    def estimated_wait_seconds(self, position: Optional[int] = None) -> Optional[float]:
+        """Expected wait for a job at ``position`` in the queue (default: next).
+
+        Based on the mean of recent render durations with every slot
+        draining in parallel; ``None`` until a render has completed.
+        """
+        if not self._recent_render_seconds:
+            return None
+        if position is None:
+            position = self._queued
+        mean_seconds = sum(self._recent_render_seconds) / len(self._recent_render_seconds)
+        return (position + 1) * mean_seconds / self.max_concurrent
+
+    def _retry_after_seconds(self) -> int:
+        estimate = self.estimated_wait_seconds()
+        if estimate is None:
+            estimate = self.timeout_ms / 1000
+        return max(1, math.ceil(estimate))
+
+    async def _wait_for_render_slot(self) -> None:
+        if not self._semaphore.locked():
+            self._queue_depth_histogram[0] += 1
+            await self._semaphore.acquire()
+            self._observe_queue_wait(0.0)
+            return
+        estimate = self.estimated_wait_seconds()
+        if self._queued >= self.max_queued_renders or (
+            estimate is not None and estimate * 1000 > self.max_queue_wait_ms
+        ):
+            self._queue_counts["rejected"] += 1
+            raise PdfRenderBusyError(retry_after_seconds=self._retry_after_seconds())
+        self._queued += 1
+        self._queue_depth_histogram[min(self._queued, self.max_queued_renders)] += 1
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(),
+                timeout=self.max_queue_wait_ms / 1000,
+            )
+        except asyncio.TimeoutError as exc:
+            self._queue_counts["timed_out"] += 1
+            raise PdfRenderBusyError(
+                "PDF render queue wait exceeded the request budget",
+                retry_after_seconds=self._retry_after_seconds(),
+            ) from exc
+        finally:
+            self._queued -= 1
+        self._queue_counts["queued"] += 1
+        self._observe_queue_wait(time.perf_counter() - queued_at)
+
+    def _observe_queue_wait(self, seconds: float) -> None:
+        waited_ms = seconds * 1000
+        for bound in QUEUE_WAIT_BUCKETS_MS:
+            if waited_ms < bound:
+                self._queue_wait_histogram[f"<{bound}"] += 1
+                return
+        self._queue_wait_histogram[f">={QUEUE_WAIT_BUCKETS_MS[-1]}"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Pool, queue, cache and per-phase timing metrics for tuning."""
+        phases = {}
+        for phase in RENDER_PHASES:
+            count = self._phase_counts[phase]
+            phases[phase] = {
+                "count": count,
+                "avgMs": round(self._phase_total_ms[phase] / count, 2) if count else 0.0,
+                "maxMs": round(self._phase_max_ms.get(phase, 0.0), 2),
+            }
+        return {
+            "available": self.available,
+            "startup": {
+                "state": self.startup_state,
+                "attempts": self._startup_attempts,
+                "phasesMs": dict(self._startup_phase_ms),
+            },
+            "pool": {
+                "size": self.context_pool_size,
+                "idle": len(self._idle_contexts),
+                "resetting": self._resetting_contexts,
+                "maxRendersPerContext": self.max_renders_per_context,
+                **{
+                    key: self._pool_counts[key]
+                    for key in ("created", "reused", "recycled", "pool_full", "discarded", "warm_failed")
+                },
+            },
+            "phases": phases,
+            "queue": {
+                "running": self._running,
+                "waiting": self._queued,
+                "maxDepth": self.max_queued_renders,
+                "maxWaitMs": self.max_queue_wait_ms,
+                "estimatedWaitMs": (
+                    None if (estimate := self.estimated_wait_seconds()) is None
+                    else round(estimate * 1000)
+                ),
+                **{key: self._queue_counts[key] for key in ("queued", "rejected", "timed_out")},
+                "depthHistogram": {
+                    str(depth): self._queue_depth_histogram[depth]
+                    for depth in sorted(self._queue_depth_histogram)
+                },
+                "waitHistogramMs": {
+                    label: self._queue_wait_histogram[label]
+                    for label in [f"<{bound}" for bound in QUEUE_WAIT_BUCKETS_MS]
+                    + [f">={QUEUE_WAIT_BUCKETS_MS[-1]}"]
+                },
+            },
+            "cache": self.cache.stats() if self.cache is not None else {"enabled": False},
+            "validation": {
+                "strictEvery": self.strict_validation_every,
+                **{key: self._validation_counts[key] for key in ("strict", "structural")},
+            },
+            "chunking": {
+                "chunkPages": self.chunk_pages,
+                **{key: self._chunk_counts[key] for key in ("jobs", "chunks", "slots")},
+            },
+            "optimization": {
+                "enabled": self.optimize_output,
+                **{
+                    key: self._optimize_counts[key]
+                    for key in ("documents", "rewritten", "failed", "inputBytes", "outputBytes", "unsubsetFonts")
+                },
+            },
+        }
+
+    def _observe_phase(self, phase: str, started: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._phase_counts[phase] += 1
+        self._phase_total_ms[phase] += elapsed_ms
+        self._phase_max_ms[phase] = max(self._phase_max_ms.get(phase, 0.0), elapsed_ms)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._pool_tasks.add(task)
+        task.add_done_callback(self._pool_tasks.discard)
+
+    async def _new_render_context(self, *, prime: bool) -> _RenderContext:
         context = await self._browser.new_context(java_script_enabled=False)
         try:
             await context.route("**/*", block_non_data_route)
             page = await context.new_page()
-            await page.set_content(
-                payload.html,
-                wait_until="load",
-                timeout=self.timeout_ms,
-            )
-            margin = _format_mm(payload.page.margin_mm)
-            pdf_bytes = await page.pdf(
-                print_background=True,
-                prefer_css_page_size=True,
-                width=_format_mm(payload.page.width_mm),
-                height=_format_mm(payload.page.height_mm),
-                margin={
-                    "top": margin,
-                    "right": margin,
-                    "bottom": margin,
-                    "left": margin,
-                },
-            )
-            validate_rendered_pdf(
-                pdf_bytes,
-                payload,
-                max_output_bytes=self.max_output_bytes,
-            )
+            if prime:
+                await page.set_content(
+                    _FONT_PRIMING_DOCUMENT,
+                    wait_until="load",
+                    timeout=self.timeout_ms,
+                )
+                await page.pdf(width="100mm", height="100mm")
+                await page.set_content(_BLANK_DOCUMENT, timeout=self.timeout_ms)
+        except BaseException:
+            await context.close()
+            raise
+        self._pool_counts["created"] += 1
+        return _RenderContext(context, page)
+
+    async def _close_render_context(self, render_context: _RenderContext) -> None:
+        try:
+            await render_context.context.close()
+        except Exception as exc:  # pragma: no cover - browser already gone
+            logger.debug("Closing PDF context failed: %r", exc)
+
+    def _pooled_context_count(self) -> int:
+        return len(self._idle_contexts) + self._warming_contexts + self._resetting_contexts
+
+    async def _render_with_pooled_context(self, payload: PrintPdfRequest) -> bytes:
+        started = time.perf_counter()
+        while not self._idle_contexts and self._resetting_contexts:
+            await self._context_returned.wait()
+        if self._idle_contexts:
+            render_context = self._idle_contexts.pop()
+            self._pool_counts["reused"] += 1
+        else:
+            render_context = await self._new_render_context(prime=False)
+        self._observe_phase("acquire", started)
+        healthy = False
+        try:
+            pdf_bytes = await self._render_on_page(render_context.page, payload)
+            healthy = True
             return pdf_bytes
+        finally:
+            render_context.renders += 1
+            self._release_render_context(render_context, healthy=healthy)
+
+    def _release_render_context(self, render_context: _RenderContext, *, healthy: bool) -> None:
+        """Keep or retire a finished context, doing the browser work in the background.
+
+        The response does not wait for the page reset, and a cancelled
+        (timed-out) render still releases its context.
+        """
+        if not healthy:
+            reason = "discarded"
+        elif render_context.renders >= self.max_renders_per_context:
+            reason = "recycled"
+        elif self._pooled_context_count() >= self.context_pool_size:
+            reason = "pool_full"
+        else:
+            self._resetting_contexts += 1
+            self._spawn(self._reset_render_context(render_context))
+            return
+        self._pool_counts[reason] += 1
+        self._spawn(self._retire_render_context(render_context))
+
+    async def _reset_render_context(self, render_context: _RenderContext) -> None:
+        started = time.perf_counter()
+        try:
+            # Drop the finished document before the context is reused so
+            # no label content survives into the next job.
+            await render_context.page.set_content(_BLANK_DOCUMENT, timeout=self.timeout_ms)
+        except Exception:
+            reset = False
+        else:
+            reset = True
+            self._observe_phase("reset", started)
+            self._idle_contexts.append(render_context)
+        finally:
+            self._resetting_contexts -= 1
+            self._context_returned.set()
+            self._context_returned = asyncio.Event()
+        if not reset:
+            self._pool_counts["discarded"] += 1
+            await self._retire_render_context(render_context)
+
+    async def _retire_render_context(self, render_context: _RenderContext) -> None:
+        await self._close_render_context(render_context)
+        await self.warm_pool()
+
+    async def _render_on_page(self, page: Any, payload: PrintPdfRequest) -> bytes:
+        started = time.perf_counter()
+        await page.set_content(
+            payload.html,
+            wait_until="load",
+            timeout=self.timeout_ms,
+        )
+        self._observe_phase("set_content", started)
+        started = time.perf_counter()
+        margin = _format_mm(payload.page.margin_mm)
+        pdf_bytes = await page.pdf(
+            print_background=True,
+            prefer_css_page_size=True,
+            width=_format_mm(payload.page.width_mm),
+            height=_format_mm(payload.page.height_mm),
+            margin={
+                "top": margin,
+                "right": margin,
+                "bottom": margin,
+                "left": margin,
+            },
+        )
+        self._observe_phase("pdf", started)
+        pdf_bytes = await self._optimize(pdf_bytes)
+        started = time.perf_counter()
+        # Parsing a long PDF is CPU-bound: keep it off the event loop.
+        await asyncio.to_thread(
+            validate_rendered_pdf,
+            pdf_bytes,
+            payload,
+            max_output_bytes=self.max_output_bytes,
+            strict=self._next_validation_is_strict(),
+        )
+        self._observe_phase("validate", started)
+        return pdf_bytes
+
+    async def _optimize(self, pdf_bytes: bytes) -> bytes:
+        record_raw_output_bytes(len(pdf_bytes))
+        if not self.optimize_output:
+            return pdf_bytes
+        started = time.perf_counter()
+        try:
+            optimized, report = await asyncio.to_thread(optimize_rendered_pdf, pdf_bytes)
+        except Exception as exc:
+            # Output pypdf cannot rewrite is left for validation to judge.
+            self._optimize_counts["failed"] += 1
+            logger.warning("Rendered PDF optimization failed: %r", exc)
+            return pdf_bytes
+        self._observe_phase("optimize", started)
+        self._optimize_counts["documents"] += 1
+        self._optimize_counts["rewritten"] += optimized is not pdf_bytes
+        self._optimize_counts.update(report)
+        return optimized
+
+    async def _render_with_context(self, payload: PrintPdfRequest) -> bytes:
+        started = time.perf_counter()
+        context = await self._browser.new_context(java_script_enabled=False)
+        try:
+            await context.route("**/*", block_non_data_route)
+            page = await context.new_page()
+            self._observe_phase("acquire", started)
+            return await self._render_on_page(page, payload)
         finally:
             await context.close()
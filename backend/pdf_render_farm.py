@@ -0,0 +1,341 @@
+"""Render-farm mode for label PDFs: one Chromium per worker process.
+
+``PdfRenderFarm`` is a drop-in ``PrintPdfRenderer`` that keeps admission
+(queueing, Retry-After, the output cache) in the API process but hands each
+render to one of N spawned worker processes over a pipe. Every worker owns
+its own browser and runs ``optimize_rendered_pdf`` and
+``validate_rendered_pdf`` itself, so the ``pypdf`` rewrite, the strict parse
+and Chromium's CPU time stay off the API process.
+
+A worker serves one job at a time. A worker that exits, stops answering, or
+overruns the render timeout is killed and restarted in the background with
+exponential backoff; the job it held fails with ``pdf_render_failed``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from pdf_render import (
+    DEFAULT_CONTEXT_POOL_SIZE,
+    DEFAULT_MAX_RENDERS_PER_CONTEXT,
+    DEFAULT_MAX_RENDERED_PDF_BYTES,
+    DEFAULT_RENDER_TIMEOUT_MS,
+    DEFAULT_STRICT_VALIDATION_EVERY,
+    PdfRenderError,
+    PrintPdfRenderer,
+    PrintPdfRequest,
+    pdf_output_sizes,
+    record_raw_output_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_STARTUP_TIMEOUT_SECONDS = 30
+WORKER_SHUTDOWN_TIMEOUT_SECONDS = 5
+WORKER_RESTART_BACKOFF_SECONDS = 1
+WORKER_RESTART_MAX_BACKOFF_SECONDS = 60
+WORKER_STATES = ("starting", "ready", "busy", "restarting", "stopped")
+
+BrowserFactory = Callable[[], Awaitable[Any]]
+
+
+def _render_worker_main(conn: Any, options: dict[str, Any]) -> None:
+    """Entry point of a spawned render worker."""
+    asyncio.run(_serve_render_jobs(conn, options))
+
+
+async def _serve_render_jobs(conn: Any, options: dict[str, Any]) -> None:
+    browser_factory: Optional[BrowserFactory] = options.pop("browser_factory", None)
+    browser = await browser_factory() if browser_factory is not None else None
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=1, **options)
+    await renderer.startup()
+    if not renderer.available:
+        conn.send(("unavailable", repr(renderer.startup_error)))
+        return
+    await renderer.warm_pool()
+    conn.send(("ready", renderer.renderer_version))
+    try:
+        while True:
+            try:
+                message = await asyncio.to_thread(conn.recv)
+            except EOFError:
+                break
+            if message is None:
+                break
+            job_id, payload = message
+            try:
+                with pdf_output_sizes() as sizes:
+                    pdf_bytes = await renderer.render(payload, use_cache=False)
+            except PdfRenderError as exc:
+                conn.send((job_id, "error", exc.code, str(exc)))
+            else:
+                conn.send((job_id, "ok", pdf_bytes, sizes["rawBytes"]))
+    finally:
+        await renderer.shutdown()
+
+
+class _RenderWorker:
+    """API-side handle for one worker process and its pipe."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Any = None
+        self.conn: Any = None
+        self.state = "stopped"
+        self.renders = 0
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def roundtrip(self, job_id: int, payload: PrintPdfRequest) -> tuple:
+        """Send one job and block for its answer (runs in a worker thread)."""
+        try:
+            self.conn.send((job_id, payload))
+            while True:
+                reply = self.conn.recv()
+                if reply[0] == job_id:
+                    return reply
+        except (EOFError, OSError) as exc:
+            raise PdfRenderError(
+                "pdf_render_failed",
+                "PDF render worker exited",
+            ) from exc
+
+    def kill(self) -> None:
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def health(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "pid": self.process.pid if self.process is not None else None,
+            "state": self.state,
+            "alive": self.alive,
+            "renders": self.renders,
+            "restarts": self.restarts,
+            "lastError": self.last_error,
+            "uptimeSeconds": (
+                round(time.monotonic() - self.started_at)
+                if self.started_at is not None and self.state in {"ready", "busy"}
+                else None
+            ),
+        }
+
+
+class PdfRenderFarm(PrintPdfRenderer):
+    """``PrintPdfRenderer`` that renders in ``workers`` child processes."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        timeout_ms: int = DEFAULT_RENDER_TIMEOUT_MS,
+        max_output_bytes: int = DEFAULT_MAX_RENDERED_PDF_BYTES,
+        context_pool_size: int = DEFAULT_CONTEXT_POOL_SIZE,
+        max_renders_per_context: int = DEFAULT_MAX_RENDERS_PER_CONTEXT,
+        strict_validation_every: int = DEFAULT_STRICT_VALIDATION_EVERY,
+        optimize_output: bool = True,
+        browser_factory: Optional[BrowserFactory] = None,
+        **kwargs: Any,
+    ):
+        self.worker_count = max(1, int(workers))
+        super().__init__(
+            timeout_ms=timeout_ms,
+            max_concurrent=self.worker_count,
+            max_output_bytes=max_output_bytes,
+            strict_validation_every=strict_validation_every,
+            optimize_output=optimize_output,
+            **kwargs,
+        )
+        # Each worker keeps its own (at most one-context) pool.
+        self._worker_options = {
+            "timeout_ms": timeout_ms,
+            "max_output_bytes": max_output_bytes,
+            "context_pool_size": min(1, max(0, int(context_pool_size))),
+            "max_renders_per_context": max_renders_per_context,
+            "strict_validation_every": strict_validation_every,
+            "optimize_output": optimize_output,
+            "browser_factory": browser_factory,
+        }
+        self._workers = [_RenderWorker(index) for index in range(self.worker_count)]
+        self._idle_workers: asyncio.Queue[_RenderWorker] = asyncio.Queue()
+        self._job_ids = itertools.count(1)
+        self._worker_version = ""
+        self._closing = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        return any(worker.state in {"ready", "busy"} for worker in self._workers)
+
+    @property
+    def renderer_version(self) -> str:
+        return self._worker_version
+
+    async def startup(self) -> None:
+        self._closing = False
+        self._startup_attempts += 1
+        started = time.perf_counter()
+        await asyncio.gather(*(self._start_worker(worker) for worker in self._workers))
+        # Failed workers restart on their own backoff, so a farm startup is
+        # never retried on demand.
+        self._observe_startup_phase("workers", started)
+        if not self.available:
+            logger.error(
+                "PDF render farm has no ready workers; /api/print/pdf will return 503: %s",
+                self._workers[0].last_error,
+            )
+            return
+        logger.info(
+            "PDF render farm started",
+            extra={
+                "startup_workers_ms": self._startup_phase_ms["workers"],
+                "ready_workers": sum(worker.state == "ready" for worker in self._workers),
+            },
+        )
+
+    async def shutdown(self) -> None:
+        self._closing = True
+        await super().shutdown()
+        await asyncio.gather(*(self._stop_worker(worker) for worker in self._workers))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def worker_health(self) -> list[dict[str, Any]]:
+        return [worker.health() for worker in self._workers]
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "workers": self.worker_health()}
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking pipe or process call on the farm's own threads.
+
+        A busy worker blocks a thread for the whole render, so these calls
+        stay out of the default executor that ``asyncio.to_thread`` shares
+        with the rest of the API. Two threads per worker cover a render that
+        is still blocked in ``recv`` while its worker is being killed.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2 * self.worker_count,
+                thread_name_prefix="pdf-render-farm",
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _start_worker(self, worker: _RenderWorker) -> None:
+        worker.state = "starting"
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_render_worker_main,
+            args=(child_conn, dict(self._worker_options)),
+            name=f"pdf-render-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process, worker.conn = process, parent_conn
+        try:
+            await self._run_blocking(process.start)
+            child_conn.close()
+            ready = await self._run_blocking(parent_conn.poll, WORKER_STARTUP_TIMEOUT_SECONDS)
+            status, detail = parent_conn.recv() if ready else ("timeout", "no ready signal")
+        except (EOFError, OSError) as exc:
+            status, detail = "exited", repr(exc)
+        if status != "ready":
+            worker.last_error = f"{status}: {detail}"
+            worker.consecutive_failures += 1
+            await self._run_blocking(worker.kill)
+            self._schedule_restart(worker)
+            return
+        self._worker_version = detail
+        worker.state = "ready"
+        worker.consecutive_failures = 0
+        worker.started_at = time.monotonic()
+        self._idle_workers.put_nowait(worker)
+
+    async def _stop_worker(self, worker: _RenderWorker) -> None:
+        if worker.conn is not None and worker.alive:
+            try:
+                worker.conn.send(None)
+                await self._run_blocking(worker.process.join, WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+            except (OSError, ValueError):
+                pass
+        await self._run_blocking(worker.kill)
+        worker.state = "stopped"
+
+    def _schedule_restart(self, worker: _RenderWorker) -> None:
+        if self._closing:
+            worker.state = "stopped"
+            return
+        worker.state = "restarting"
+        worker.restarts += 1
+        delay = 0.0
+        if worker.consecutive_failures:
+            delay = min(
+                WORKER_RESTART_MAX_BACKOFF_SECONDS,
+                WORKER_RESTART_BACKOFF_SECONDS * 2 ** (worker.consecutive_failures - 1),
+            )
+
+        async def restart() -> None:
+            await asyncio.sleep(delay)
+            await self._start_worker(worker)
+
+        self._spawn(restart())
+
+    def _retire(self, worker: _RenderWorker, reason: str) -> None:
+        logger.warning("Restarting PDF render worker %d: %s", worker.index, reason)
+        worker.last_error = reason
+        worker.state = "restarting"
+
+        async def kill_and_restart() -> None:
+            # kill() joins the process for up to WORKER_SHUTDOWN_TIMEOUT_SECONDS.
+            await self._run_blocking(worker.kill)
+            self._schedule_restart(worker)
+
+        self._spawn(kill_and_restart())
+
+    def _dispatch(self, payload: PrintPdfRequest):
+        return self._render_in_worker(payload)
+
+    async def _render_in_worker(self, payload: PrintPdfRequest) -> bytes:
+        while True:
+            worker = await self._idle_workers.get()
+            if worker.alive:
+                break
+            self._retire(worker, "exited while idle")
+        worker.state = "busy"
+        try:
+            reply = await self._run_blocking(worker.roundtrip, next(self._job_ids), payload)
+        except PdfRenderError as exc:
+            self._retire(worker, str(exc))
+            raise
+        except BaseException:
+            # Timed out or cancelled: the worker may still be busy with the
+            # job, so it cannot take another one.
+            self._retire(worker, "render abandoned")
+            raise
+        worker.renders += 1
+        worker.state = "ready"
+        self._idle_workers.put_nowait(worker)
+        if reply[1] == "error":
+            raise PdfRenderError(reply[2], reply[3])
+        record_raw_output_bytes(reply[3])
+        return reply[2]
@@ -64,6 +64,8 @@ def create_pilot_admin_router(
     ops_recent_events,
     is_dictionary_miss_capture_enabled: Callable[[], bool],
     record_ops_counter: Callable[..., None],
+    event_counts: Callable[[], dict],
+    pdf_render_stats: Callable[[], dict],
 ) -> APIRouter:
     router = APIRouter(dependencies=[Depends(_set_private_no_store)])
 
@@ -85,6 +87,8 @@ def create_pilot_admin_router(
                 },
             },
             "recentEvents": list(ops_recent_events),
+            "eventCounts": event_counts(),
+            "pdfRender": pdf_render_stats(),
             "dictionary": pilot_store.get_dictionary_summary(limit=10),
         }
 
@@ -4,6 +4,7 @@ import json
 import re
 import sqlite3
 import threading
+import uuid
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -21,6 +22,7 @@ ALIAS_STATUSES = ("approved", "pending", "needs_evidence", "rejected")
 ALIAS_REVIEW_STATUSES = ("pending", "needs_evidence")
 ALIAS_PURGEABLE_STATUSES = ("pending",)
 ACTIVE_REFERENCE_STATUS = "active"
+DICTIONARY_DATA_VERSION_KEY = "dictionary_data_version"
 REFERENCE_LINK_STATUSES = {"active", "inactive"}
 MISS_QUERY_STATUSES = {"open", "needs_evidence", "resolved", "ignored"}
 CORRECTION_REQUEST_STATUS_ORDER = (
@@ -55,6 +57,10 @@ DEFAULT_MAX_OPEN_CORRECTION_REPORTS = 50_000
 DEFAULT_MAX_OPEN_CORRECTION_REPORTS_PER_CAS = 500
 DEFAULT_MAX_OPEN_CORRECTION_BYTES = 32 * 1024 * 1024
 DEFAULT_MAX_OPEN_CORRECTION_BYTES_PER_CAS = 512 * 1024
+BATCH_SEARCH_JOB_ACTIVE_STATUSES = ("queued", "running")
+BATCH_SEARCH_JOB_COMPLETED_STATUS = "completed"
+DEFAULT_MAX_ACTIVE_BATCH_SEARCH_JOBS = 4
+DEFAULT_BATCH_SEARCH_JOB_RETENTION_HOURS = 72
 
 _ALIAS_REVIEW_BYTES_SQL = """
     length(CAST(COALESCE(alias_text, '') AS BLOB))
@@ -87,6 +93,20 @@ _REFERENCE_LINK_TYPES = {"sds", "regulatory", "occupational", "reference"}
 _SAFE_REFERENCE_SCHEMES = {"http", "https"}
 
 
+class BatchSearchJobLimitError(ValueError):
+    def __init__(self, max_active_jobs: int):
+        self.max_active_jobs = int(max_active_jobs)
+        super().__init__(
+            f"batch search job quota exceeded ({self.max_active_jobs} active jobs)"
+        )
+
+    def as_detail(self) -> dict[str, str]:
+        return {
+            "code": "batch_job_queue_full",
+            "message": "Too many batch search jobs are still running; retry later",
+        }
+
+
 class ReviewQueueLimitError(ValueError):
     def __init__(self, *, queue: str, limit_type: str):
         self.queue = str(queue or "review queue").strip().replace("_", " ")
@@ -359,7 +379,6 @@ class PilotStore:
         self.db_path = Path(db_path)
         self._conn: Optional[sqlite3.Connection] = None
         self._lock = threading.RLock()
-        self.dictionary_data_version = 0
         self.max_pending_alias_rows = max(1, int(max_pending_alias_rows))
         self.max_pending_alias_rows_per_cas = max(
             1, int(max_pending_alias_rows_per_cas)
@@ -384,8 +403,26 @@ class PilotStore:
         )
         self.review_retention_days = max(1, int(review_retention_days))
 
-    def _bump_dictionary_data_version_locked(self) -> None:
-        self.dictionary_data_version += 1
+    @property
+    def dictionary_data_version(self) -> int:
+        """Change sequence for dictionary entries, aliases and reference links.
+
+        The counter lives in ``dictionary_meta`` and is bumped inside the
+        writing transaction, so every process sharing the database (uvicorn
+        workers, ``scripts/manage_dictionary_growth.py``) sees the new value
+        on its next read and can drop indexes built from older data.
+        """
+        row = self._fetchone(
+            "SELECT value FROM dictionary_meta WHERE key = ?",
+            (DICTIONARY_DATA_VERSION_KEY,),
+        )
+        return int(row["value"]) if row is not None else 0
+
+    def _bump_dictionary_data_version_locked(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "UPDATE dictionary_meta SET value = value + 1 WHERE key = ?",
+            (DICTIONARY_DATA_VERSION_KEY,),
+        )
 
     @contextmanager
     def _immediate_transaction(
@@ -439,6 +476,11 @@ class PilotStore:
               PRIMARY KEY (scope, doc_type, doc_key)
             );
 
+            CREATE TABLE IF NOT EXISTS dictionary_meta (
+              key TEXT PRIMARY KEY,
+              value INTEGER NOT NULL
+            );
+
             CREATE TABLE IF NOT EXISTS dictionary_entries (
               cas_number TEXT PRIMARY KEY,
               name_en TEXT,
@@ -536,8 +578,48 @@ class PilotStore:
               ON dictionary_correction_requests(cas_number, status);
             CREATE INDEX IF NOT EXISTS idx_dictionary_correction_requests_issue_type
               ON dictionary_correction_requests(issue_type, status);
+
+            CREATE TABLE IF NOT EXISTS batch_search_jobs (
+              id TEXT PRIMARY KEY,
+              status TEXT NOT NULL DEFAULT 'queued',
+              total_rows INTEGER NOT NULL,
+              unique_lookups INTEGER NOT NULL,
+              completed_lookups INTEGER NOT NULL DEFAULT 0,
+              found_rows INTEGER NOT NULL DEFAULT 0,
+              not_found_rows INTEGER NOT NULL DEFAULT 0,
+              upstream_error_rows INTEGER NOT NULL DEFAULT 0,
+              created_at TEXT NOT NULL,
+              updated_at TEXT NOT NULL,
+              completed_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_batch_search_jobs_status
+              ON batch_search_jobs(status, created_at);
+
+            CREATE TABLE IF NOT EXISTS batch_search_job_lookups (
+              job_id TEXT NOT NULL
+                REFERENCES batch_search_jobs(id) ON DELETE CASCADE,
+              lookup_key TEXT NOT NULL,
+              query TEXT NOT NULL,
+              row_count INTEGER NOT NULL,
+              result_json TEXT,
+              completed_at TEXT,
+              PRIMARY KEY (job_id, lookup_key)
+            );
+
+            CREATE TABLE IF NOT EXISTS batch_search_job_rows (
+              job_id TEXT NOT NULL
+                REFERENCES batch_search_jobs(id) ON DELETE CASCADE,
+              row_index INTEGER NOT NULL,
+              query TEXT NOT NULL,
+              lookup_key TEXT NOT NULL,
+              PRIMARY KEY (job_id, row_index)
+            );
             """
         )
+        conn.execute(
+            "INSERT OR IGNORE INTO dictionary_meta(key, value) VALUES (?, 0)",
+            (DICTIONARY_DATA_VERSION_KEY,),
+        )
         self._ensure_dictionary_entry_schema_locked()
         self._ensure_correction_request_schema_locked()
         conn.commit()
@@ -742,8 +824,8 @@ class PilotStore:
                 conn,
                 manual_entry,
             )
+            self._bump_dictionary_data_version_locked(conn)
             conn.commit()
-            self._bump_dictionary_data_version_locked()
         return self.get_manual_entry_by_cas(cas_number, include_unapproved=True) or {}
 
     def _sync_manual_entry_status_to_correction_candidates_locked(
@@ -1108,9 +1190,8 @@ class PilotStore:
             return None
 
         now = utc_now_iso()
-        with self._immediate_transaction(
-            after_commit=self._bump_dictionary_data_version_locked,
-        ) as conn:
+        with self._immediate_transaction() as conn:
+            self._bump_dictionary_data_version_locked(conn)
             existing = conn.execute(
                 """
                 SELECT id, status, source, confidence, notes, hit_count
@@ -1788,30 +1869,32 @@ class PilotStore:
             return None
         status = normalize_reference_link_status(status)
         updated_at = utc_now_iso()
-        self._execute(
-            """
-            INSERT INTO dictionary_reference_links(
-              cas_number,
-              cid,
-              link_type,
-              label,
-              url,
-              source,
-              priority,
-              status,
-              updated_at
+        with self._immediate_transaction() as conn:
+            self._bump_dictionary_data_version_locked(conn)
+            conn.execute(
+                """
+                INSERT INTO dictionary_reference_links(
+                  cas_number,
+                  cid,
+                  link_type,
+                  label,
+                  url,
+                  source,
+                  priority,
+                  status,
+                  updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cas_number, link_type, url) DO UPDATE SET
+                  cid = excluded.cid,
+                  label = excluded.label,
+                  source = excluded.source,
+                  priority = excluded.priority,
+                  status = excluded.status,
+                  updated_at = excluded.updated_at
+                """,
+                (cas_number, cid, link_type, label, url, source, priority, status, updated_at),
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(cas_number, link_type, url) DO UPDATE SET
-              cid = excluded.cid,
-              label = excluded.label,
-              source = excluded.source,
-              priority = excluded.priority,
-              status = excluded.status,
-              updated_at = excluded.updated_at
-            """,
-            (cas_number, cid, link_type, label, url, source, priority, status, updated_at),
-        )
         links = self.list_reference_links(cas_number, include_inactive=True)
         for link in links:
             if link["url"] == url and link["linkType"] == link_type:
@@ -2732,6 +2815,249 @@ class PilotStore:
             conn.commit()
             return self._fetch_correction_request_by_id(request_id)
 
+    # Batch search jobs ---------------------------------------------------
+    def _batch_search_job_row_to_dict(self, row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "total": int(row["total_rows"]),
+            "unique_lookups": int(row["unique_lookups"]),
+            "completed_lookups": int(row["completed_lookups"]),
+            "found": int(row["found_rows"]),
+            "not_found": int(row["not_found_rows"]),
+            "upstream_error": int(row["upstream_error_rows"]),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "completed_at": row["completed_at"],
+        }
+
+    def create_batch_search_job(
+        self,
+        rows: Iterable[tuple[str, str]],
+        *,
+        max_active_jobs: int = DEFAULT_MAX_ACTIVE_BATCH_SEARCH_JOBS,
+    ) -> dict[str, Any]:
+        """Persist a job from ``(query, lookup_key)`` rows.
+
+        Rows sharing a lookup key are looked up once; the first query seen
+        for a key is the one sent to the search pipeline.
+        """
+        rows = [(str(query), str(lookup_key)) for query, lookup_key in rows]
+        if not rows:
+            raise ValueError("batch search job needs at least one row")
+        lookups: dict[str, list[Any]] = {}
+        for query, lookup_key in rows:
+            lookup = lookups.setdefault(lookup_key, [query, 0])
+            lookup[1] += 1
+        job_id = uuid.uuid4().hex
+        now = utc_now_iso()
+        with self._immediate_transaction() as conn:
+            active_count = conn.execute(
+                "SELECT COUNT(*) FROM batch_search_jobs WHERE status IN (?, ?)",
+                BATCH_SEARCH_JOB_ACTIVE_STATUSES,
+            ).fetchone()[0]
+            if int(active_count) >= max(1, int(max_active_jobs)):
+                raise BatchSearchJobLimitError(max_active_jobs)
+            conn.execute(
+                """
+                INSERT INTO batch_search_jobs(
+                  id, status, total_rows, unique_lookups, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    BATCH_SEARCH_JOB_ACTIVE_STATUSES[0],
+                    len(rows),
+                    len(lookups),
+                    now,
+                    now,
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT INTO batch_search_job_lookups(job_id, lookup_key, query, row_count)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (job_id, lookup_key, query, row_count)
+                    for lookup_key, (query, row_count) in lookups.items()
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT INTO batch_search_job_rows(job_id, row_index, query, lookup_key)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (job_id, index, query, lookup_key)
+                    for index, (query, lookup_key) in enumerate(rows)
+                ),
+            )
+        job = self.get_batch_search_job(job_id)
+        assert job is not None
+        return job
+
+    def get_batch_search_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        row = self._fetchone(
+            "SELECT * FROM batch_search_jobs WHERE id = ?",
+            (str(job_id or ""),),
+        )
+        return self._batch_search_job_row_to_dict(row) if row is not None else None
+
+    def list_active_batch_search_job_ids(self) -> list[str]:
+        return [
+            row["id"]
+            for row in self._fetchall(
+                """
+                SELECT id
+                FROM batch_search_jobs
+                WHERE status IN (?, ?)
+                ORDER BY created_at, id
+                """,
+                BATCH_SEARCH_JOB_ACTIVE_STATUSES,
+            )
+        ]
+
+    def list_pending_batch_search_lookups(self, job_id: str) -> list[tuple[str, str]]:
+        """Return ``(lookup_key, query)`` pairs that have no stored result yet."""
+        return [
+            (row["lookup_key"], row["query"])
+            for row in self._fetchall(
+                """
+                SELECT lookup_key, query
+                FROM batch_search_job_lookups
+                WHERE job_id = ? AND result_json IS NULL
+                ORDER BY rowid
+                """,
+                (job_id,),
+            )
+        ]
+
+    def record_batch_search_job_result(
+        self,
+        job_id: str,
+        lookup_key: str,
+        result: dict[str, Any],
+    ) -> Optional[dict[str, Any]]:
+        """Store one lookup result and roll its rows into the job counters.
+
+        Returns the updated job, or ``None`` when the job was purged or the
+        lookup already had a result (a resumed job racing a late worker).
+        """
+        now = utc_now_iso()
+        result_json = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        if result.get("upstream_error"):
+            counter_column = "upstream_error_rows"
+        elif result.get("found"):
+            counter_column = "found_rows"
+        else:
+            counter_column = "not_found_rows"
+        with self._immediate_transaction() as conn:
+            lookup = conn.execute(
+                """
+                SELECT row_count
+                FROM batch_search_job_lookups
+                WHERE job_id = ? AND lookup_key = ? AND result_json IS NULL
+                """,
+                (job_id, lookup_key),
+            ).fetchone()
+            if lookup is None:
+                return None
+            conn.execute(
+                """
+                UPDATE batch_search_job_lookups
+                SET result_json = ?, completed_at = ?
+                WHERE job_id = ? AND lookup_key = ?
+                """,
+                (result_json, now, job_id, lookup_key),
+            )
+            conn.execute(
+                f"""
+                UPDATE batch_search_jobs
+                SET completed_lookups = completed_lookups + 1,
+                    {counter_column} = {counter_column} + ?,
+                    status = CASE
+                      WHEN completed_lookups + 1 >= unique_lookups THEN ?
+                      ELSE ?
+                    END,
+                    completed_at = CASE
+                      WHEN completed_lookups + 1 >= unique_lookups THEN ?
+                      ELSE completed_at
+                    END,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    int(lookup["row_count"]),
+                    BATCH_SEARCH_JOB_COMPLETED_STATUS,
+                    BATCH_SEARCH_JOB_ACTIVE_STATUSES[1],
+                    now,
+                    now,
+                    job_id,
+                ),
+            )
+        return self.get_batch_search_job(job_id)
+
+    def list_batch_search_job_rows(
+        self,
+        job_id: str,
+        *,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Return submitted rows in order, with ``result`` ``None`` until looked up.
+
+        Each row's ``result.cas_number`` is the row's own query, exactly as
+        the synchronous batch search would have returned it.
+        """
+        offset = max(0, int(offset))
+        limit = max(1, int(limit))
+        rows = self._fetchall(
+            """
+            SELECT r.row_index, r.query, l.result_json
+            FROM batch_search_job_rows AS r
+            JOIN batch_search_job_lookups AS l
+              ON l.job_id = r.job_id AND l.lookup_key = r.lookup_key
+            WHERE r.job_id = ? AND r.row_index >= ? AND r.row_index < ?
+            ORDER BY r.row_index
+            """,
+            (job_id, offset, offset + limit),
+        )
+        items = []
+        for row in rows:
+            result = None
+            if row["result_json"] is not None:
+                result = json.loads(row["result_json"])
+                result["cas_number"] = row["query"]
+            items.append(
+                {"index": int(row["row_index"]), "query": row["query"], "result": result}
+            )
+        return items
+
+    def purge_expired_batch_search_jobs(
+        self,
+        *,
+        retention_hours: int = DEFAULT_BATCH_SEARCH_JOB_RETENTION_HOURS,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Delete finished jobs (and their rows) last touched before the
+        retention window. Queued or running jobs are kept however old they
+        are, so jobs interrupted by a long outage still resume on startup."""
+        hours = int(retention_hours)
+        if hours < 1:
+            raise ValueError("retention_hours must be at least 1")
+        current = now or datetime.now(timezone.utc)
+        if current.tzinfo is None:
+            current = current.replace(tzinfo=timezone.utc)
+        cutoff_at = (current - timedelta(hours=hours)).isoformat()
+        with self._immediate_transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM batch_search_jobs WHERE updated_at < ? AND status NOT IN (?, ?)",
+                (cutoff_at, *BATCH_SEARCH_JOB_ACTIVE_STATUSES),
+            )
+            return int(cursor.rowcount or 0)
+
     # Reporting -----------------------------------------------------------
     def get_dictionary_summary(self, *, limit: int = 10) -> dict[str, Any]:
         pending_manual_entries = []
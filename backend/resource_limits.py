@@ -5,13 +5,25 @@ from typing import Awaitable, Callable, Optional
 DEFAULT_PUBLIC_JSON_BODY_BYTES = 512 * 1024
 WORKSPACE_JSON_BODY_BYTES = 1024 * 1024
 PRINT_PDF_JSON_BODY_BYTES = 8 * 1024 * 1024
+# 200 CAS queries of up to 64 characters each plus layout options.
+LABEL_DOCUMENT_JSON_BODY_BYTES = 32 * 1024
 EXPORT_JSON_BODY_BYTES = 20 * 1024 * 1024
+# 10,000 CAS queries of up to 64 characters each, JSON-quoted.
+BATCH_SEARCH_JOB_JSON_BODY_BYTES = 1024 * 1024
+# 50,000 triage tokens of up to 64 characters each, JSON-quoted.
+CAS_TRIAGE_JSON_BODY_BYTES = 4 * 1024 * 1024
+# 1,000,000 characters of mostly-CJK text encodes to ~3 MB of UTF-8.
+MENTION_EXTRACTION_JSON_BODY_BYTES = 8 * 1024 * 1024
 
 _MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH"})
 _EXACT_ROUTE_LIMITS = {
     "/api/print/pdf": PRINT_PDF_JSON_BODY_BYTES,
+    "/api/print/labels/pdf": LABEL_DOCUMENT_JSON_BODY_BYTES,
     "/api/export/xlsx": EXPORT_JSON_BODY_BYTES,
     "/api/export/csv": EXPORT_JSON_BODY_BYTES,
+    "/api/extract-mentions": MENTION_EXTRACTION_JSON_BODY_BYTES,
+    "/api/search/jobs": BATCH_SEARCH_JOB_JSON_BODY_BYTES,
+    "/api/search/triage": CAS_TRIAGE_JSON_BODY_BYTES,
 }
 
 _TOO_LARGE_BODY = json.dumps(
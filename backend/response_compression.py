@@ -0,0 +1,145 @@
+"""Negotiated compression for complete (non-streaming) API responses.
+
+A 100-row batch search with secondary classifications, full H/P statement
+text and reference links is several hundred KB of highly repetitive JSON.
+Responses above ``minimum_size`` are compressed with brotli when the client
+accepts it and the optional ``brotli`` package is installed, otherwise gzip.
+
+Streaming responses (NDJSON/SSE search streams, job progress, exports) are
+passed through untouched: compressing them chunk by chunk would hold records
+back in the compressor, and XLSX/PDF bodies are already compressed.
+"""
+
+from __future__ import annotations
+
+import gzip
+from typing import Callable, Optional
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+DEFAULT_COMPRESSION_MINIMUM_BYTES = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+
+_COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/")
+
+
+def _accepted_encodings(header_value: str) -> set[str]:
+    accepted = set()
+    for item in header_value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_content_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted_encodings(accept_encoding or "")
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=DEFAULT_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=DEFAULT_GZIP_LEVEL, mtime=0)
+
+
+def _weaken_etag(value: bytes) -> bytes:
+    # A strong validator names exact bytes; the encoded body is different
+    # bytes, so it may only carry the weak form of the same tag.
+    return value if value.startswith(b"W/") else b"W/" + value
+
+
+class ResponseCompressionMiddleware:
+    """Compress single-message responses when the client negotiates it."""
+
+    def __init__(
+        self,
+        app: Callable,
+        *,
+        minimum_size: int = DEFAULT_COMPRESSION_MINIMUM_BYTES,
+    ):
+        self.app = app
+        self.minimum_size = max(1, int(minimum_size))
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope.get("headers") or ():
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_content_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_with_compression(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            if start_message is None:  # pragma: no cover - protocol violation
+                await send(message)
+                return
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._should_compress(start, body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            compressed = compress_body(body, encoding)
+            headers = [
+                (name, _weaken_etag(value) if name == b"etag" else value)
+                for name, value in start.get("headers", [])
+                if name not in (b"content-length", b"vary")
+            ]
+            vary = [value for name, value in start.get("headers", []) if name == b"vary"]
+            vary_value = b", ".join(vary + [b"Accept-Encoding"])
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", vary_value),
+            ]
+            await send({**start, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_with_compression)
+
+    def _should_compress(self, start, body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        content_type = b""
+        for name, value in start.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").lower().startswith(_COMPRESSIBLE_MEDIA_TYPES)
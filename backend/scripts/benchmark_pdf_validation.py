@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+from io import BytesIO
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pypdf import PdfWriter  # noqa: E402
+
+from pdf_render import PDF_POINTS_PER_MM, PrintPdfRequest, validate_rendered_pdf  # noqa: E402
+
+
+HEARTBEAT_SECONDS = 0.001
+
+
+def build_sample_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=210 * PDF_POINTS_PER_MM, height=297 * PDF_POINTS_PER_MM)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+async def _max_loop_stall(work) -> tuple[float, float]:
+    """Run ``work`` while a heartbeat measures the longest event-loop stall."""
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            stall = max(stall, time.perf_counter() - started - HEARTBEAT_SECONDS)
+
+    monitor = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await monitor
+    return elapsed, stall
+
+
+async def benchmark(pages: int, repeat: int) -> dict[str, Any]:
+    pdf_bytes = build_sample_pdf(pages)
+    payload = PrintPdfRequest.model_validate(
+        {
+            "html": "<!doctype html><html><body></body></html>",
+            "page": {"width_mm": 210, "height_mm": 297, "margin_mm": 10},
+            "meta": {"label_purpose": "complete", "page_count_expected": pages},
+        }
+    )
+
+    async def inline_strict() -> None:
+        validate_rendered_pdf(pdf_bytes, payload, strict=True)
+
+    def threaded(strict: bool):
+        async def run() -> None:
+            await asyncio.to_thread(validate_rendered_pdf, pdf_bytes, payload, strict=strict)
+
+        return run
+
+    modes = {
+        "inline_strict": inline_strict,
+        "thread_strict": threaded(True),
+        "thread_structural": threaded(False),
+    }
+    report: dict[str, Any] = {"pages": pages, "pdfBytes": len(pdf_bytes), "modes": {}}
+    for name, work in modes.items():
+        await work()  # warm the thread pool and pypdf's caches
+        samples = [await _max_loop_stall(work) for _ in range(repeat)]
+        report["modes"][name] = {
+            "elapsedMs": round(min(elapsed for elapsed, _ in samples) * 1000, 2),
+            "maxLoopStallMs": round(max(stall for _, stall in samples) * 1000, 2),
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure PDF validation cost and event-loop blocking per validation mode."
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(benchmark(args.pages, args.repeat)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
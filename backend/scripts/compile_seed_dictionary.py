@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Compile chemical_dict.py into the memory-mapped seed dictionary artifact."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from seed_dictionary import (  # noqa: E402
+    SEED_DICTIONARY_ARTIFACT_PATH,
+    SEED_DICTIONARY_FORMAT_VERSION,
+    SEED_DICTIONARY_SOURCE_PATH,
+    SEED_DICTIONARY_TABLES,
+    compile_seed_dictionary,
+    seed_source_digest,
+    seed_tables_from_source,
+)
+
+# Each probe runs in a fresh interpreter so import time and resident memory
+# are not polluted by modules this script already loaded.
+_MEASURE_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+
+def resident_kib():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * 4
+
+baseline = resident_kib()
+started = time.perf_counter()
+import {module} as seed
+for name in {tables!r}:
+    if hasattr(seed, name):
+        getattr(seed, name).get("64-17-5")
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(elapsed_ms, resident_kib() - baseline)
+"""
+
+
+def build_artifact() -> bytes:
+    return compile_seed_dictionary(
+        seed_tables_from_source(),
+        source_digest=seed_source_digest(SEED_DICTIONARY_SOURCE_PATH),
+    )
+
+
+def measure_import(module: str, *, repeats: int = 5) -> dict[str, float]:
+    samples: list[tuple[float, float]] = []
+    probe = _MEASURE_PROBE.format(
+        root=str(ROOT_DIR),
+        module=module,
+        tables=SEED_DICTIONARY_TABLES,
+    )
+    for _ in range(max(1, repeats)):
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        elapsed_ms, resident_kib = result.stdout.split()
+        samples.append((float(elapsed_ms), float(resident_kib)))
+    samples.sort()
+    elapsed_ms, resident_kib = samples[len(samples) // 2]
+    return {"importMs": round(elapsed_ms, 2), "residentDeltaKiB": resident_kib}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compile backend/chemical_dict.py into seed_dictionary.bin, a "
+            "sorted string table with offsets that the API memory-maps at "
+            "startup instead of executing the dictionary literals."
+        )
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=SEED_DICTIONARY_ARTIFACT_PATH,
+        help=f"Artifact path. Default: {SEED_DICTIONARY_ARTIFACT_PATH.name}",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Do not write; exit with status 1 when the artifact is stale.",
+    )
+    parser.add_argument(
+        "--measure",
+        action="store_true",
+        help="Report median import time and resident-memory delta for source vs compiled (Linux).",
+    )
+    args = parser.parse_args()
+
+    artifact = build_artifact()
+    current = args.output.read_bytes() if args.output.exists() else b""
+    report: dict[str, object] = {
+        "artifact": args.output.name,
+        "formatVersion": SEED_DICTIONARY_FORMAT_VERSION,
+        "bytes": len(artifact),
+        "upToDate": current == artifact,
+    }
+    if not args.check and current != artifact:
+        args.output.write_bytes(artifact)
+        report["written"] = True
+    if args.measure:
+        report["measurements"] = {
+            "source": measure_import("chemical_dict"),
+            "compiled": measure_import("seed_dictionary"),
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True))
+    if args.check and current != artifact:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,404 @@
+"""Compiled, memory-mapped form of the seed chemical dictionary.
+
+``chemical_dict.py`` stays the human-edited source of truth. The build step
+(``scripts/compile_seed_dictionary.py``) writes ``seed_dictionary.bin``: one
+sorted, de-duplicated UTF-8 string table with an offset array, followed by
+per-table arrays of string ids (keys sorted, values, and the source insertion
+order). The runtime maps that file read-only and decodes strings on access, so
+server processes neither execute the 5,000-line literal module nor keep every
+name resident as a Python object.
+
+The artifact records a SHA-256 digest of ``chemical_dict.py``. A missing,
+corrupt, or stale artifact falls back to importing the source module, so a
+forgotten rebuild can cost memory but never serve outdated names.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import re
+import struct
+import sys
+import threading
+from collections.abc import ItemsView, Iterator, Mapping, MutableMapping
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+SEED_DICTIONARY_SOURCE_PATH = ROOT_DIR / "chemical_dict.py"
+SEED_DICTIONARY_ARTIFACT_PATH = ROOT_DIR / "seed_dictionary.bin"
+SEED_DICTIONARY_FORMAT_VERSION = 1
+SEED_DICTIONARY_TABLES = (
+    "CAS_TO_ZH",
+    "CAS_TO_EN",
+    "CHEMICAL_NAMES_ZH_EXPANDED",
+    "ALIASES_ZH",
+    "ALIASES_EN",
+    "EN_TO_CAS",
+    "ZH_TO_CAS",
+    "CLEAN_NAME_INDEX",
+)
+
+_MAGIC = b"GHSSEED\x00"
+# magic, format version, table count, string count, chemical_dict.py digest
+_HEADER = struct.Struct("<8sIII32s")
+# table name, entry count, section offset
+_DIRECTORY_ENTRY = struct.Struct("<32sII")
+_CLEAN_NAME_RE = re.compile(r"[^a-z0-9]")
+
+
+class SeedDictionaryArtifactError(ValueError):
+    """Raised when a compiled seed dictionary cannot be trusted."""
+
+
+def clean_name_key(name: str) -> str:
+    return _CLEAN_NAME_RE.sub("", name)
+
+
+def seed_source_digest(source_path: Path = SEED_DICTIONARY_SOURCE_PATH) -> bytes:
+    return hashlib.sha256(Path(source_path).read_bytes()).digest()
+
+
+def seed_tables_from_source(module: Any = None) -> dict[str, dict[str, str]]:
+    """Return every compiled table, derived exactly as the runtime expects."""
+    if module is None:
+        import chemical_dict as module
+
+    clean_name_index: dict[str, str] = {}
+    for en_name, zh_name in module.CHEMICAL_NAMES_ZH_EXPANDED.items():
+        clean_name_index[clean_name_key(en_name)] = zh_name
+    tables = {
+        name: dict(getattr(module, name))
+        for name in SEED_DICTIONARY_TABLES
+        if name != "CLEAN_NAME_INDEX"
+    }
+    tables["CLEAN_NAME_INDEX"] = clean_name_index
+    return tables
+
+
+def _pack_u32_array(values: list[int]) -> bytes:
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def compile_seed_dictionary(
+    tables: Mapping[str, Mapping[str, str]],
+    *,
+    source_digest: bytes,
+) -> bytes:
+    """Serialize seed tables into the versioned binary artifact format."""
+    if len(source_digest) != 32:
+        raise SeedDictionaryArtifactError("source digest must be a SHA-256 digest")
+    missing = [name for name in SEED_DICTIONARY_TABLES if name not in tables]
+    if missing:
+        raise SeedDictionaryArtifactError(f"missing seed tables: {', '.join(missing)}")
+
+    # Sorting the pool by UTF-8 bytes means string ids order exactly like the
+    # strings themselves, so tables can binary-search plain integers.
+    pool = sorted(
+        {
+            text.encode("utf-8")
+            for name in SEED_DICTIONARY_TABLES
+            for item in tables[name].items()
+            for text in item
+        }
+    )
+    string_ids = {encoded: index for index, encoded in enumerate(pool)}
+    string_offsets = [0]
+    for encoded in pool:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    output = bytearray(
+        _HEADER.pack(
+            _MAGIC,
+            SEED_DICTIONARY_FORMAT_VERSION,
+            len(SEED_DICTIONARY_TABLES),
+            len(pool),
+            source_digest,
+        )
+    )
+    directory_offset = len(output)
+    output.extend(b"\x00" * (_DIRECTORY_ENTRY.size * len(SEED_DICTIONARY_TABLES)))
+    output.extend(_pack_u32_array(string_offsets))
+    output.extend(b"".join(pool))
+    output.extend(b"\x00" * (-len(output) % 4))
+
+    for table_index, name in enumerate(SEED_DICTIONARY_TABLES):
+        source_ids = [
+            (string_ids[key.encode("utf-8")], string_ids[value.encode("utf-8")])
+            for key, value in tables[name].items()
+        ]
+        by_key = sorted(range(len(source_ids)), key=lambda index: source_ids[index][0])
+        rank_of_position = {position: rank for rank, position in enumerate(by_key)}
+        _DIRECTORY_ENTRY.pack_into(
+            output,
+            directory_offset + table_index * _DIRECTORY_ENTRY.size,
+            name.encode("ascii"),
+            len(source_ids),
+            len(output),
+        )
+        output.extend(_pack_u32_array([source_ids[position][0] for position in by_key]))
+        output.extend(_pack_u32_array([source_ids[position][1] for position in by_key]))
+        output.extend(
+            _pack_u32_array([rank_of_position[position] for position in range(len(source_ids))])
+        )
+    return bytes(output)
+
+
+def _u32_array(buffer: Any, offset: int, count: int) -> Any:
+    """Zero-copy view of ``count`` little-endian u32 values where possible."""
+    if sys.byteorder == "little" and offset % 4 == 0:
+        return memoryview(buffer)[offset:offset + 4 * count].cast("I")
+    return struct.unpack_from(f"<{count}I", buffer, offset)
+
+
+class _StringPool:
+    __slots__ = ("_buffer", "_count", "_offsets", "_blob_offset")
+
+    def __init__(self, buffer: Any, offset: int, count: int):
+        self._buffer = buffer
+        self._count = count
+        self._offsets = _u32_array(buffer, offset, count + 1)
+        self._blob_offset = offset + 4 * (count + 1)
+
+    @property
+    def end_offset(self) -> int:
+        return self._blob_offset + self._offsets[self._count]
+
+    def encoded(self, string_id: int) -> bytes:
+        base = self._blob_offset
+        return self._buffer[base + self._offsets[string_id]:base + self._offsets[string_id + 1]]
+
+    def text(self, string_id: int) -> str:
+        return self.encoded(string_id).decode("utf-8")
+
+    def find(self, text: str) -> int:
+        target = text.encode("utf-8", "surrogatepass")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.encoded(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self.encoded(low) == target:
+            return low
+        return -1
+
+
+class CompiledStringMap(MutableMapping[str, str]):
+    """Read-mostly ``str -> str`` mapping backed by one artifact table.
+
+    Lookups binary-search the shared string pool and then the table's sorted
+    key ids; iteration follows the source insertion order. Writes (test
+    monkeypatching, emergency hot fixes) switch the instance to a private
+    ``dict`` copy so the shared mapped buffer stays immutable.
+    """
+
+    __slots__ = (
+        "name",
+        "_pool",
+        "_count",
+        "_key_ids",
+        "_value_ids",
+        "_source_order",
+        "_overrides",
+    )
+
+    def __init__(self, name: str, pool: _StringPool, buffer: Any, offset: int, count: int):
+        self.name = name
+        self._pool = pool
+        self._count = count
+        self._key_ids = _u32_array(buffer, offset, count)
+        self._value_ids = _u32_array(buffer, offset + 4 * count, count)
+        self._source_order = _u32_array(buffer, offset + 8 * count, count)
+        self._overrides: Optional[dict[str, str]] = None
+
+    def _rank_of(self, key: object) -> int:
+        if not isinstance(key, str):
+            return -1
+        string_id = self._pool.find(key)
+        if string_id < 0:
+            return -1
+        key_ids = self._key_ids
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if key_ids[middle] < string_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and key_ids[low] == string_id:
+            return low
+        return -1
+
+    def __getitem__(self, key: str) -> str:
+        if self._overrides is not None:
+            return self._overrides[key]
+        rank = self._rank_of(key)
+        if rank < 0:
+            raise KeyError(key)
+        return self._pool.text(self._value_ids[rank])
+
+    def __contains__(self, key: object) -> bool:
+        if self._overrides is not None:
+            return key in self._overrides
+        return self._rank_of(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        if self._overrides is not None:
+            yield from list(self._overrides)
+            return
+        for rank in self._source_order:
+            yield self._pool.text(self._key_ids[rank])
+
+    def __len__(self) -> int:
+        if self._overrides is not None:
+            return len(self._overrides)
+        return self._count
+
+    def items(self) -> "_CompiledItemsView":  # type: ignore[override]
+        return _CompiledItemsView(self)
+
+    def iter_items(self) -> Iterator[tuple[str, str]]:
+        """Yield ``(key, value)`` in source order without per-key searches."""
+        if self._overrides is not None:
+            yield from list(self._overrides.items())
+            return
+        text = self._pool.text
+        for rank in self._source_order:
+            yield text(self._key_ids[rank]), text(self._value_ids[rank])
+
+    @property
+    def modified(self) -> bool:
+        """True once a write has copied this table off the shared buffer."""
+        return self._overrides is not None
+
+    def _materialize(self) -> dict[str, str]:
+        if self._overrides is None:
+            self._overrides = dict(self.iter_items())
+        return self._overrides
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._materialize()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._materialize()[key]
+
+    def __repr__(self) -> str:
+        return f"CompiledStringMap({self.name!r}, entries={len(self)})"
+
+
+class _CompiledItemsView(ItemsView):
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return self._mapping.iter_items()
+
+
+def read_seed_dictionary(
+    buffer: Any,
+    *,
+    expected_digest: Optional[bytes] = None,
+) -> dict[str, CompiledStringMap]:
+    """Parse an artifact buffer, verifying its header and table directory."""
+    if len(buffer) < _HEADER.size:
+        raise SeedDictionaryArtifactError("artifact is truncated")
+    magic, version, table_count, string_count, digest = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise SeedDictionaryArtifactError("artifact has an unknown header")
+    if version != SEED_DICTIONARY_FORMAT_VERSION:
+        raise SeedDictionaryArtifactError(f"artifact format version {version} is unsupported")
+    if expected_digest is not None and digest != expected_digest:
+        raise SeedDictionaryArtifactError("artifact is stale for chemical_dict.py")
+    if table_count != len(SEED_DICTIONARY_TABLES):
+        raise SeedDictionaryArtifactError("artifact table directory is incomplete")
+
+    pool_offset = _HEADER.size + table_count * _DIRECTORY_ENTRY.size
+    if pool_offset + 4 * (string_count + 1) > len(buffer):
+        raise SeedDictionaryArtifactError("artifact string table is truncated")
+    pool = _StringPool(buffer, pool_offset, string_count)
+    if pool.end_offset > len(buffer):
+        raise SeedDictionaryArtifactError("artifact string table is truncated")
+
+    tables: dict[str, CompiledStringMap] = {}
+    for index in range(table_count):
+        raw_name, count, offset = _DIRECTORY_ENTRY.unpack_from(
+            buffer,
+            _HEADER.size + index * _DIRECTORY_ENTRY.size,
+        )
+        name = raw_name.rstrip(b"\x00").decode("ascii", "replace")
+        if name != SEED_DICTIONARY_TABLES[index]:
+            raise SeedDictionaryArtifactError(f"unexpected artifact table {name!r}")
+        if offset < pool.end_offset or offset + 12 * count > len(buffer):
+            raise SeedDictionaryArtifactError(f"artifact table {name} is truncated")
+        tables[name] = CompiledStringMap(name, pool, buffer, offset, count)
+    return tables
+
+
+def load_seed_dictionary(
+    artifact_path: Path = SEED_DICTIONARY_ARTIFACT_PATH,
+    *,
+    source_path: Optional[Path] = SEED_DICTIONARY_SOURCE_PATH,
+) -> dict[str, CompiledStringMap]:
+    """Memory-map the artifact; ``source_path=None`` skips the staleness check."""
+    expected_digest = seed_source_digest(source_path) if source_path is not None else None
+    with open(artifact_path, "rb") as handle:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    return read_seed_dictionary(buffer, expected_digest=expected_digest)
+
+
+_RUNTIME_TABLES: Optional[dict[str, MutableMapping[str, str]]] = None
+_RUNTIME_BACKEND = ""
+_RUNTIME_SOURCE_DIGEST = b""
+_RUNTIME_LOCK = threading.Lock()
+
+
+def _runtime_tables() -> dict[str, MutableMapping[str, str]]:
+    global _RUNTIME_TABLES, _RUNTIME_BACKEND, _RUNTIME_SOURCE_DIGEST
+    with _RUNTIME_LOCK:
+        if _RUNTIME_TABLES is None:
+            try:
+                _RUNTIME_TABLES = dict(load_seed_dictionary())
+                _RUNTIME_BACKEND = "compiled"
+                _RUNTIME_SOURCE_DIGEST = seed_source_digest()
+            except (OSError, ValueError) as exc:
+                logger.warning(
+                    "Compiled seed dictionary unavailable (%s); importing "
+                    "chemical_dict.py. Run scripts/compile_seed_dictionary.py "
+                    "to rebuild it.",
+                    exc,
+                )
+                _RUNTIME_TABLES = dict(seed_tables_from_source())
+                _RUNTIME_BACKEND = "source"
+        return _RUNTIME_TABLES
+
+
+def seed_dictionary_backend() -> str:
+    """Return ``compiled`` or ``source`` for the tables this process serves."""
+    _runtime_tables()
+    return _RUNTIME_BACKEND
+
+
+def seed_dictionary_signature() -> Optional[str]:
+    """Identify the served seed tables for caches derived from them.
+
+    Returns the ``chemical_dict.py`` digest while the compiled tables are
+    untouched, and ``None`` when this process serves the source fallback or a
+    table has been written to, since neither can be named by a digest.
+    """
+    tables = _runtime_tables()
+    if _RUNTIME_BACKEND != "compiled":
+        return None
+    if any(getattr(table, "modified", True) for table in tables.values()):
+        return None
+    return _RUNTIME_SOURCE_DIGEST.hex()
+
+
+def __getattr__(name: str) -> MutableMapping[str, str]:
+    # Tables load on first attribute access so build tooling can import the
+    # compiler helpers without mapping (or warning about) the artifact.
+    if name in SEED_DICTIONARY_TABLES:
+        return _runtime_tables()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,23 @@
 from collections import Counter, deque
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Path as ApiPath, Query
+from dataclasses import dataclass, fields
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Path as ApiPath, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
+from limits import parse as parse_rate_limit
+from pydantic import TypeAdapter
 from starlette.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from ipaddress import ip_address
+import hashlib
 import json
 import os
 import secrets
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import uuid
 from datetime import datetime, timezone
 import httpx
@@ -33,12 +36,17 @@ from pilot_store import (
     APPROVED_MANUAL_ENTRY_STATUS,
     APPROVED_ALIAS_STATUS,
     PilotStore,
+    BATCH_SEARCH_JOB_COMPLETED_STATUS,
+    BatchSearchJobLimitError,
     ReviewQueueLimitError,
     infer_locale,
     normalize_compact_text,
 )
 from api_models import (
+    AgentLabelSummaryBatchRequest,
+    BatchSearchJobRequest,
     CASQuery,
+    CASTriageRequest,
     ChemicalResult,
     DictionaryAliasPayload,
     DictionaryCorrectionRequestPayload,
@@ -50,16 +58,24 @@ from api_models import (
     DictionaryReferenceLinkPayload,
     ExportRequest,
     GHSReport,
+    LabelDocumentRequest,
     MAX_EXPORT_ROWS,
+    MentionExtractionRequest,
+    TelemetryBatchPayload,
     TelemetryEventPayload,
     WorkspaceDocumentPayload,
 )
-from agent_label_summary import AgentLabelSummaryV0, build_agent_label_summary_v0
+from agent_label_summary import (
+    SCHEMA_VERSION as AGENT_LABEL_SUMMARY_SCHEMA_VERSION,
+    AgentLabelSummaryV0,
+    build_agent_label_summary_v0,
+)
 from api_validation import (
     WORKSPACE_DOC_TYPES,
     MAX_ADMIN_NAME_LENGTH,
     MAX_ALIAS_TEXT_LENGTH,
     MAX_CORRECTION_CANDIDATE_JSON_CHARS,
+    MAX_MENTION_SPANS_PER_CAS,
     MAX_MISS_CONTEXT_JSON_CHARS,
     MAX_MISS_CONTEXT_SCALAR_CHARS,
     MAX_MISS_QUERY_LENGTH,
@@ -76,11 +92,15 @@ from api_validation import (
 )
 
 # Import expanded chemical dictionaries (1709 CAS entries, 1863 English entries)
-# + alias dictionaries for common/colloquial chemical names
-from chemical_dict import (
+# + alias dictionaries for common/colloquial chemical names. These are the
+# memory-mapped tables compiled from chemical_dict.py (see seed_dictionary.py).
+from seed_dictionary import (
     CAS_TO_ZH, CAS_TO_EN, CHEMICAL_NAMES_ZH_EXPANDED,
-    EN_TO_CAS, ZH_TO_CAS, ALIASES_ZH, ALIASES_EN,
+    EN_TO_CAS, ZH_TO_CAS, ALIASES_ZH, ALIASES_EN, CLEAN_NAME_INDEX,
+    seed_dictionary_signature,
 )
+from name_index_snapshot import read_name_index_snapshot, write_name_index_snapshot
+from mention_extraction import MentionAutomaton, build_mention_automaton, extract_mentions
 from h_code_translations import H_CODE_MISSING_TEXT_ZH, H_CODE_TRANSLATIONS
 from p_code_translations import P_CODE_TRANSLATIONS, P_CODE_TEXTS_EN
 from export_helpers import (
@@ -91,16 +111,33 @@ from export_helpers import (
     build_export_triage_sheets,
     spreadsheet_safe,
 )
+from batch_jobs import BatchSearchJobRunner
+from cas_triage import triage_cas_tokens
 from pilot_admin_routes import create_pilot_admin_router
-from observability import emit_structured_event, record_telemetry_event
+from observability import (
+    emit_structured_event,
+    event_counts,
+    record_telemetry_event,
+    record_telemetry_events,
+    start_event_log_queue,
+    stop_event_log_queue,
+)
 from pdf_render import (
+    DEFAULT_RENDER_TIMEOUT_MS,
     PdfRenderBusyError,
+    PdfRenderCache,
     PdfRenderError,
     PdfRenderUnavailableError,
+    PrintPdfMeta,
     PrintPdfRenderer,
     PrintPdfRequest,
+    pdf_output_sizes,
 )
+from label_document import build_label_sheet, label_sheet_document
+from pdf_native import NativeLabelPdfRenderer
+from pdf_render_farm import PdfRenderFarm
 from resource_limits import PublicJsonBodyLimitMiddleware
+from response_compression import ResponseCompressionMiddleware
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -174,7 +211,149 @@ RATE_LIMIT_STORAGE_URI = (
 
 # Shared httpx client (initialized in lifespan)
 shared_http_client: Optional[httpx.AsyncClient] = None
-pdf_renderer = PrintPdfRenderer()
+# Pre-warmed Chromium contexts (fonts primed, reset between jobs) so small
+# label sheets do not pay for context setup on every render.
+PDF_CONTEXT_POOL_SIZE = _bounded_env_int("PDF_CONTEXT_POOL_SIZE", 2, minimum=0, maximum=8)
+PDF_CONTEXT_MAX_RENDERS = _bounded_env_int("PDF_CONTEXT_MAX_RENDERS", 50, minimum=1, maximum=1000)
+# Renders beyond the concurrent ones wait in a short FIFO queue. The wait is
+# capped so queue time plus one render timeout stays inside the gateway budget.
+PDF_RENDER_QUEUE_DEPTH = _bounded_env_int("PDF_RENDER_QUEUE_DEPTH", 4, minimum=0, maximum=50)
+PDF_RENDER_REQUEST_BUDGET_SECONDS = _bounded_env_int(
+    "PDF_RENDER_REQUEST_BUDGET_SECONDS",
+    24,
+    minimum=DEFAULT_RENDER_TIMEOUT_MS // 1000,
+    maximum=120,
+)
+# Validated PDFs are cached by a digest of the request, browser version and
+# font configuration (0 bytes disables). The disk tier is opt-in via a dir.
+PDF_RENDER_CACHE_MAX_BYTES = _bounded_env_int(
+    "PDF_RENDER_CACHE_MAX_BYTES",
+    32 * 1024 * 1024,
+    minimum=0,
+    maximum=1024 * 1024 * 1024,
+)
+PDF_RENDER_CACHE_TTL_SECONDS = _bounded_env_int(
+    "PDF_RENDER_CACHE_TTL_SECONDS",
+    3600,
+    minimum=1,
+    maximum=7 * 86400,
+)
+PDF_RENDER_CACHE_DIR = (os.environ.get("PDF_RENDER_CACHE_DIR") or "").strip()
+PDF_RENDER_CACHE_DISK_MAX_BYTES = _bounded_env_int(
+    "PDF_RENDER_CACHE_DISK_MAX_BYTES",
+    256 * 1024 * 1024,
+    minimum=0,
+    maximum=16 * 1024 * 1024 * 1024,
+)
+
+
+def _pdf_font_config_fingerprint() -> str:
+    for path in (Path("/etc/fonts/local.conf"), ROOT_DIR / "fonts" / "local.conf"):
+        try:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            continue
+    return ""
+
+
+# Render-farm mode: N worker processes, each with its own Chromium, take the
+# renders (and PDF validation) off the API process. 0 renders in-process.
+PDF_RENDER_WORKERS = _bounded_env_int("PDF_RENDER_WORKERS", 0, minimum=0, maximum=16)
+# Documents longer than this many pages are split on page boundaries and the
+# chunks rendered on parallel slots, then merged and validated (0 disables).
+PDF_RENDER_CHUNK_PAGES = _bounded_env_int("PDF_RENDER_CHUNK_PAGES", 20, minimum=0, maximum=200)
+# Rendered output is validated off the event loop with a page-tree check;
+# every Nth render also gets the strict full parse (1 = always, 0 = never).
+PDF_STRICT_VALIDATION_EVERY = _bounded_env_int(
+    "PDF_STRICT_VALIDATION_EVERY",
+    20,
+    minimum=0,
+    maximum=10_000,
+)
+# Rendered PDFs are rewritten with pypdf to store repeated pictograms and
+# font programs once and compress page content (validated afterwards).
+PDF_OPTIMIZE_OUTPUT = (
+    (os.environ.get("PDF_OPTIMIZE_OUTPUT") or "true").strip().lower()
+    in {"1", "true", "yes", "on"}
+)
+
+# "background" launches Chromium once the app is serving; "lazy" waits for
+# the first print request. Either way a print waits up to
+# PDF_RENDER_STARTUP_WAIT_MS for the launch before answering 503.
+PDF_RENDER_STARTUP = (os.environ.get("PDF_RENDER_STARTUP") or "background").strip().lower()
+if PDF_RENDER_STARTUP not in {"background", "lazy"}:
+    PDF_RENDER_STARTUP = "background"
+PDF_RENDER_STARTUP_WAIT_MS = _bounded_env_int(
+    "PDF_RENDER_STARTUP_WAIT_MS",
+    10_000,
+    minimum=0,
+    maximum=60_000,
+)
+
+_pdf_renderer_options: Dict[str, Any] = {
+    "context_pool_size": PDF_CONTEXT_POOL_SIZE,
+    "max_renders_per_context": PDF_CONTEXT_MAX_RENDERS,
+    "max_queued_renders": PDF_RENDER_QUEUE_DEPTH,
+    "max_queue_wait_ms": PDF_RENDER_REQUEST_BUDGET_SECONDS * 1000 - DEFAULT_RENDER_TIMEOUT_MS,
+    "cache": PdfRenderCache(
+        max_bytes=PDF_RENDER_CACHE_MAX_BYTES,
+        ttl_seconds=PDF_RENDER_CACHE_TTL_SECONDS,
+        directory=PDF_RENDER_CACHE_DIR or None,
+        max_disk_bytes=PDF_RENDER_CACHE_DISK_MAX_BYTES,
+    ),
+    "font_config": _pdf_font_config_fingerprint(),
+    "chunk_pages": PDF_RENDER_CHUNK_PAGES,
+    "strict_validation_every": PDF_STRICT_VALIDATION_EVERY,
+    "optimize_output": PDF_OPTIMIZE_OUTPUT,
+    "startup_wait_ms": PDF_RENDER_STARTUP_WAIT_MS,
+}
+pdf_renderer = (
+    PdfRenderFarm(workers=PDF_RENDER_WORKERS, **_pdf_renderer_options)
+    if PDF_RENDER_WORKERS
+    else PrintPdfRenderer(**_pdf_renderer_options)
+)
+
+# Server-built label sheets can be drawn natively, without Chromium:
+# "fallback" does so only while the browser renderer is unavailable (after
+# the PDF_RENDER_STARTUP_WAIT_MS a starting browser gets), "prefer" for
+# every sheet, "off" never. Client HTML (/api/print/pdf) always needs the
+# browser.
+PDF_NATIVE_LABELS = (os.environ.get("PDF_NATIVE_LABELS") or "fallback").strip().lower()
+if PDF_NATIVE_LABELS not in {"off", "fallback", "prefer"}:
+    PDF_NATIVE_LABELS = "fallback"
+# TrueType face for native sheets; defaults to the first .ttf/.ttc in fonts/.
+PDF_NATIVE_FONT_PATH = (os.environ.get("PDF_NATIVE_FONT_PATH") or "").strip()
+native_label_renderer = (
+    NativeLabelPdfRenderer(font_path=PDF_NATIVE_FONT_PATH or None)
+    if PDF_NATIVE_LABELS != "off"
+    else None
+)
+
+# Inventory-scale batch jobs. Workers share the PubChem semaphore below, so
+# keep the pool smaller than PUBCHEM_CONCURRENCY to leave room for
+# interactive searches.
+BATCH_JOB_WORKERS = _bounded_env_int("BATCH_JOB_WORKERS", 2, minimum=1, maximum=8)
+BATCH_JOB_MAX_ACTIVE = _bounded_env_int("BATCH_JOB_MAX_ACTIVE", 4, minimum=1, maximum=50)
+BATCH_JOB_RETENTION_HOURS = _bounded_env_int(
+    "BATCH_JOB_RETENTION_HOURS",
+    72,
+    minimum=1,
+    maximum=24 * 90,
+)
+BATCH_JOB_PROGRESS_POLL_SECONDS = 1.0
+# Lookups one batch label-summary request may have in flight; they also share
+# the process-wide PubChem semaphore with every other route.
+AGENT_SUMMARY_BATCH_CONCURRENCY = 8
+BATCH_JOB_MAX_RESULTS_PAGE = 500
+batch_search_job_runner = BatchSearchJobRunner(
+    get_store=lambda: pilot_store,
+    lookup=lambda query: _run_batch_job_lookup(query),
+    lookup_key=lambda query: _batch_lookup_key(query),
+    workers=BATCH_JOB_WORKERS,
+    max_active_jobs=BATCH_JOB_MAX_ACTIVE,
+    retention_hours=BATCH_JOB_RETENTION_HOURS,
+    on_purged=lambda count: _record_ops_counter("batch_job.purged", count),
+)
 
 # In-memory caches (TTL = 24 hours)
 PUBCHEM_RESPONSE_MAX_BYTES = _bounded_env_int(
@@ -214,6 +393,19 @@ ghs_cache: TTLCache = TTLCache(
     ttl=86400,
     getsizeof=_ghs_cache_entry_size,
 )
+# Finished search results, keyed by everything that feeds them: the GHS cache
+# entry (cid + retrieved_at) and the local dictionary data. A refetch or a
+# dictionary edit changes the key, so stale entries are simply never hit again.
+CHEMICAL_RESULT_CACHE_MAX_ENTRIES = _bounded_env_int(
+    "CHEMICAL_RESULT_CACHE_MAX_ENTRIES",
+    4096,
+    minimum=0,
+    maximum=100_000,
+)
+chemical_result_cache: TTLCache = TTLCache(
+    maxsize=max(1, CHEMICAL_RESULT_CACHE_MAX_ENTRIES),
+    ttl=86400,
+)
 ops_counters: Counter = Counter()
 ops_recent_events = deque(maxlen=50)
 OPS_STALE_THRESHOLD_HOURS = float(os.environ.get("OPS_STALE_THRESHOLD_HOURS", "12"))
@@ -221,6 +413,22 @@ SEARCH_CHEMICAL_TIMEOUT_SECONDS = float(
     os.environ.get("SEARCH_CHEMICAL_TIMEOUT_SECONDS", "24")
 )
 
+# Name search (HTTP autocomplete and the search-as-you-type WebSocket). The
+# channel meters every query message and every speculative warm against the
+# same per-client rates as the equivalent HTTP routes.
+NAME_SEARCH_MAX_RESULTS = 20
+NAME_SEARCH_RATE_LIMIT = "60/minute"
+NAME_SEARCH_WS_MAX_MESSAGE_CHARS = 4 * 1024
+NAME_SEARCH_WS_WARM_TOP = (
+    (os.environ.get("NAME_SEARCH_WS_WARM_TOP") or "true").strip().lower()
+    in {"1", "true", "yes", "on"}
+)
+NAME_SEARCH_WS_WARM_RATE_LIMIT = "30/minute"
+NAME_SEARCH_WS_WARM_DELAY_SECONDS = 0.3
+NAME_SEARCH_WS_WARM_TIMEOUT_SECONDS = float(
+    os.environ.get("NAME_SEARCH_WS_WARM_TIMEOUT_SECONDS", "5")
+)
+
 # ─── Outbound PubChem concurrency gate ──────────────────────
 #
 # Limits how many concurrent PubChem requests this process can have in
@@ -365,6 +573,23 @@ class _NameAutocompleteEntry:
     alias: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class _CasDisplayRecord:
+    """Names and cid-less reference links shown for one CAS number.
+
+    Built with the name index so autocomplete and search rows never re-resolve
+    names or query the pilot store per result. The link dicts are shared
+    between requests and must be treated as read-only.
+    """
+
+    cas_number: str
+    name_en: str
+    name_zh: str
+    reference_links: tuple[Dict[str, Any], ...]
+    store_links: tuple[Dict[str, Any], ...]
+    manual_entry: bool = False
+
+
 @dataclass(frozen=True)
 class _NameResolutionIndex:
     manual_pairs: Dict[str, list[tuple[str, str]]]
@@ -377,6 +602,14 @@ class _NameResolutionIndex:
     combined_compact: Dict[str, Dict[str, str]]
     autocomplete_entries: list[_NameAutocompleteEntry]
     names_by_cas: Dict[str, Dict[str, str]]
+    display_records: Dict[str, _CasDisplayRecord]
+
+
+_NameIndexSources = tuple[
+    list[dict[str, Any]],
+    Dict[str, list[dict[str, Any]]],
+    list[dict[str, Any]],
+]
 
 
 _NAME_RESOLUTION_INDEX_CACHE: Dict[str, Any] = {
@@ -388,6 +621,23 @@ _NAME_RESOLUTION_INDEX_CACHE: Dict[str, Any] = {
 _NAME_RESOLUTION_INDEX_LOCK = threading.RLock()
 
 
+NAME_INDEX_SNAPSHOT_ENABLED = (
+    (os.environ.get("NAME_INDEX_SNAPSHOT") or "on").strip().lower()
+    not in {"0", "false", "no", "off"}
+)
+NAME_INDEX_SNAPSHOT_PATH = (os.environ.get("NAME_INDEX_SNAPSHOT_PATH") or "").strip()
+# Covers the index shape and the code that derives it, so a deploy that changes
+# normalization never loads a snapshot written by the previous build.
+_NAME_INDEX_SCHEMA_HASH = hashlib.sha256(
+    "|".join(
+        [field.name for field in fields(_NameResolutionIndex)]
+        + [field.name for field in fields(_NameAutocompleteEntry)]
+    ).encode("utf-8")
+    + Path(__file__).read_bytes()
+    + (ROOT_DIR / "pilot_store.py").read_bytes()
+).hexdigest()
+
+
 def _seed_dictionary_signature() -> tuple[int, int, int, int, int, int]:
     return (
         len(ZH_TO_CAS),
@@ -475,7 +725,7 @@ def _compact_lookup_from_exact(exact_map: Dict[str, str], locale: str) -> Dict[s
     ])
 
 
-def _build_name_resolution_index() -> _NameResolutionIndex:
+def _read_name_index_sources() -> _NameIndexSources:
     manual_entries = pilot_store.list_manual_entries(
         status=APPROVED_MANUAL_ENTRY_STATUS,
         public_only=True,
@@ -488,6 +738,16 @@ def _build_name_resolution_index() -> _NameResolutionIndex:
         )
         for locale in ("zh", "en")
     }
+    reference_links = pilot_store.list_reference_links()
+    return manual_entries, aliases_by_locale, reference_links
+
+
+def _build_name_resolution_index(
+    sources: Optional[_NameIndexSources] = None,
+) -> _NameResolutionIndex:
+    manual_entries, aliases_by_locale, reference_links = (
+        sources if sources is not None else _read_name_index_sources()
+    )
 
     manual_pairs = {
         locale: _manual_pairs_from_entries(manual_entries, locale)
@@ -499,8 +759,8 @@ def _build_name_resolution_index() -> _NameResolutionIndex:
     }
 
     seed_exact = {
-        "zh": dict(ZH_TO_CAS),
-        "en": dict(EN_TO_CAS),
+        "zh": dict(ZH_TO_CAS.items()),
+        "en": dict(EN_TO_CAS.items()),
     }
     manual_exact = {
         locale: _last_valid_match_map(manual_pairs[locale])
@@ -560,13 +820,14 @@ def _build_name_resolution_index() -> _NameResolutionIndex:
             names_by_cas.setdefault(normalized, {})["name_zh"] = name_zh
 
     autocomplete_entries: list[_NameAutocompleteEntry] = []
-    for name, cas in ZH_TO_CAS.items():
+    seed_aliases = {"zh": set(ALIASES_ZH), "en": set(ALIASES_EN)}
+    for name, cas in seed_exact["zh"].items():
         autocomplete_entries.append(
-            _NameAutocompleteEntry("zh", name, cas, name if name in ALIASES_ZH else None)
+            _NameAutocompleteEntry("zh", name, cas, name if name in seed_aliases["zh"] else None)
         )
-    for name, cas in EN_TO_CAS.items():
+    for name, cas in seed_exact["en"].items():
         autocomplete_entries.append(
-            _NameAutocompleteEntry("en", name, cas, name if name in ALIASES_EN else None)
+            _NameAutocompleteEntry("en", name, cas, name if name in seed_aliases["en"] else None)
         )
     for name, cas in manual_pairs["zh"]:
         autocomplete_entries.append(_NameAutocompleteEntry("zh", name, cas))
@@ -577,6 +838,41 @@ def _build_name_resolution_index() -> _NameResolutionIndex:
     for alias_text, cas in alias_pairs["en"]:
         autocomplete_entries.append(_NameAutocompleteEntry("en", alias_text, cas, alias_text))
 
+    manual_cas_numbers = {
+        normalized
+        for entry in manual_entries
+        for normalized in [_normalize_valid_lookup_cas(entry.get("cas_number"))]
+        if normalized
+    }
+    store_links_by_cas: Dict[str, list[Dict[str, Any]]] = {}
+    for link in reference_links:
+        normalized = _normalize_valid_lookup_cas(link.get("casNumber"))
+        store_link = _store_reference_link(link)
+        if normalized and store_link:
+            store_links_by_cas.setdefault(normalized, []).append(store_link)
+    display_cas_numbers = dict.fromkeys(names_by_cas)
+    display_cas_numbers.update(dict.fromkeys(store_links_by_cas))
+    for entry in autocomplete_entries:
+        normalized = _normalize_valid_lookup_cas(entry.cas_number)
+        if normalized:
+            display_cas_numbers[normalized] = None
+    display_records: Dict[str, _CasDisplayRecord] = {}
+    for cas in display_cas_numbers:
+        names = names_by_cas.get(cas, {})
+        store_links = tuple(store_links_by_cas.get(cas, ()))
+        display_records[cas] = _CasDisplayRecord(
+            cas_number=cas,
+            name_en=names.get("name_en") or "",
+            name_zh=names.get("name_zh") or "",
+            reference_links=tuple(
+                _merge_reference_links(
+                    _static_reference_links(cas, None, names.get("name_en")) + list(store_links)
+                )
+            ),
+            store_links=store_links,
+            manual_entry=cas in manual_cas_numbers,
+        )
+
     return _NameResolutionIndex(
         manual_pairs=manual_pairs,
         alias_pairs=alias_pairs,
@@ -588,7 +884,110 @@ def _build_name_resolution_index() -> _NameResolutionIndex:
         combined_compact=combined_compact,
         autocomplete_entries=autocomplete_entries,
         names_by_cas=names_by_cas,
+        display_records=display_records,
+    )
+
+
+def _name_index_snapshot_path() -> Path:
+    if NAME_INDEX_SNAPSHOT_PATH:
+        return Path(NAME_INDEX_SNAPSHOT_PATH)
+    db_path = Path(getattr(pilot_store, "db_path", PILOT_STORE_PATH))
+    return db_path.with_name(f"{db_path.name}.name-index")
+
+
+def _name_index_sources_digest(
+    sources: _NameIndexSources,
+) -> str:
+    encoded = json.dumps(
+        sources,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _name_index_to_snapshot(index: _NameResolutionIndex) -> Dict[str, Any]:
+    payload = {field.name: getattr(index, field.name) for field in fields(index)}
+    payload["autocomplete_entries"] = [
+        (entry.locale, entry.name, entry.cas_number, entry.alias)
+        for entry in index.autocomplete_entries
+    ]
+    payload["display_records"] = {
+        cas: tuple(getattr(record, field.name) for field in fields(record))
+        for cas, record in index.display_records.items()
+    }
+    return payload
+
+
+def _name_index_from_snapshot(payload: Dict[str, Any]) -> _NameResolutionIndex:
+    values = dict(payload)
+    values["autocomplete_entries"] = [
+        _NameAutocompleteEntry(*entry) for entry in values["autocomplete_entries"]
+    ]
+    values["display_records"] = {
+        cas: _CasDisplayRecord(*record)
+        for cas, record in values["display_records"].items()
+    }
+    return _NameResolutionIndex(**values)
+
+
+def _timed_name_resolution_index_build(
+    sources: _NameIndexSources,
+) -> _NameResolutionIndex:
+    started = time.perf_counter()
+    index = _build_name_resolution_index(sources)
+    _record_ops_counter("dictionary.name_index.build")
+    _record_ops_counter(
+        "dictionary.name_index.build_ms",
+        round((time.perf_counter() - started) * 1000),
     )
+    return index
+
+
+def _load_or_build_name_resolution_index() -> _NameResolutionIndex:
+    """Load the persisted index for the current inputs, or rebuild and persist it.
+
+    The store rows are still read on every call: their digest is what proves a
+    snapshot describes this database even when the data version alone cannot,
+    e.g. after ``pilot.db`` is restored from a backup with a lower version.
+    """
+    sources = _read_name_index_sources()
+    seed_signature = seed_dictionary_signature() if NAME_INDEX_SNAPSHOT_ENABLED else None
+    if seed_signature is None:
+        return _timed_name_resolution_index_build(sources)
+
+    snapshot_path = _name_index_snapshot_path()
+    snapshot_key = {
+        "schema": _NAME_INDEX_SCHEMA_HASH,
+        "seed": seed_signature,
+        "dataVersion": _dictionary_data_version(),
+        "store": _name_index_sources_digest(sources),
+    }
+    started = time.perf_counter()
+    try:
+        index = _name_index_from_snapshot(read_name_index_snapshot(snapshot_path, snapshot_key))
+    except FileNotFoundError:
+        _record_ops_counter("dictionary.name_index.snapshot_miss")
+    except (OSError, ValueError, TypeError, KeyError) as exc:
+        _record_ops_counter("dictionary.name_index.snapshot_rejected")
+        logger.info("Rebuilding name index; snapshot %s not usable: %s", snapshot_path, exc)
+    else:
+        _record_ops_counter("dictionary.name_index.snapshot_load")
+        _record_ops_counter(
+            "dictionary.name_index.snapshot_load_ms",
+            round((time.perf_counter() - started) * 1000),
+        )
+        return index
+
+    index = _timed_name_resolution_index_build(sources)
+    try:
+        write_name_index_snapshot(snapshot_path, snapshot_key, _name_index_to_snapshot(index))
+    except OSError as exc:
+        _record_ops_counter("dictionary.name_index.snapshot_write_failed")
+        logger.warning("Could not persist name index snapshot to %s: %s", snapshot_path, exc)
+    return index
 
 
 def _get_name_resolution_index() -> _NameResolutionIndex:
@@ -614,7 +1013,7 @@ def _get_name_resolution_index() -> _NameResolutionIndex:
         ):
             return cached_index
 
-        index = _build_name_resolution_index()
+        index = _load_or_build_name_resolution_index()
         _NAME_RESOLUTION_INDEX_CACHE.update(
             {
                 "store_id": store_id,
@@ -626,6 +1025,32 @@ def _get_name_resolution_index() -> _NameResolutionIndex:
         return index
 
 
+_MENTION_AUTOMATON_CACHE: Dict[str, Any] = {"index": None, "automaton": None}
+_MENTION_AUTOMATON_LOCK = threading.Lock()
+
+
+def _get_mention_automaton(index: _NameResolutionIndex) -> MentionAutomaton:
+    """Return the automaton compiled from ``index``; a new index (data version
+    or seed change) compiles a new one."""
+    if _MENTION_AUTOMATON_CACHE["index"] is index:
+        return _MENTION_AUTOMATON_CACHE["automaton"]
+    with _MENTION_AUTOMATON_LOCK:
+        if _MENTION_AUTOMATON_CACHE["index"] is index:
+            return _MENTION_AUTOMATON_CACHE["automaton"]
+        started = time.perf_counter()
+        automaton = build_mention_automaton(
+            [("en", index.combined_exact["en"]), ("zh", index.combined_exact["zh"])],
+            _normalize_valid_lookup_cas,
+        )
+        _record_ops_counter("dictionary.mention_automaton.build")
+        _record_ops_counter(
+            "dictionary.mention_automaton.build_ms",
+            round((time.perf_counter() - started) * 1000),
+        )
+        _MENTION_AUTOMATON_CACHE.update({"index": index, "automaton": automaton})
+        return automaton
+
+
 def _manual_name_pairs(locale: str) -> list[tuple[str, str]]:
     return list(_get_name_resolution_index().manual_pairs.get(locale, []))
 
@@ -638,19 +1063,24 @@ def _combined_lookup_map(locale: str) -> Dict[str, str]:
     return dict(_get_name_resolution_index().combined_exact.get(locale, {}))
 
 
-def _compact_exact_match(query: str, locale: str) -> Optional[str]:
+def _compact_exact_match(
+    query: str,
+    locale: str,
+    index: Optional[_NameResolutionIndex] = None,
+) -> Optional[str]:
     compact_query = normalize_compact_text(query, locale=locale)
     if not compact_query:
         return None
 
-    return _get_name_resolution_index().combined_compact.get(locale, {}).get(compact_query)
+    index = index or _get_name_resolution_index()
+    return index.combined_compact.get(locale, {}).get(compact_query)
 
 
-def _build_reference_links(
+def _static_reference_links(
     cas_number: Optional[str],
     cid: Optional[int],
     name_en: Optional[str] = None,
-) -> List[Dict[str, Any]]:
+) -> list[Dict[str, Any]]:
     links: list[dict[str, Any]] = []
 
     if cid:
@@ -692,22 +1122,23 @@ def _build_reference_links(
                 "priority": 60,
             }
         )
+    return links
 
-    if cas_number:
-        for link in pilot_store.list_reference_links(cas_number):
-            url = link["url"]
-            if not _is_safe_reference_url(url):
-                continue
-            links.append(
-                {
-                    "label": link["label"],
-                    "url": url,
-                    "link_type": _safe_reference_link_type(link.get("linkType")),
-                    "source": str(link.get("source") or "manual").strip() or "manual",
-                    "priority": link["priority"],
-                }
-            )
 
+def _store_reference_link(link: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    url = link["url"]
+    if not _is_safe_reference_url(url):
+        return None
+    return {
+        "label": link["label"],
+        "url": url,
+        "link_type": _safe_reference_link_type(link.get("linkType")),
+        "source": str(link.get("source") or "manual").strip() or "manual",
+        "priority": link["priority"],
+    }
+
+
+def _merge_reference_links(links: list[Dict[str, Any]]) -> List[Dict[str, Any]]:
     deduped_by_url: dict[str, dict[str, Any]] = {}
     for link in links:
         current = deduped_by_url.get(link["url"])
@@ -725,6 +1156,39 @@ def _build_reference_links(
     )
 
 
+def _cas_display_record(
+    cas_number: Optional[str],
+    index: Optional[_NameResolutionIndex] = None,
+) -> Optional[_CasDisplayRecord]:
+    if not cas_number:
+        return None
+    records = (index or _get_name_resolution_index()).display_records
+    text = str(cas_number).strip()
+    record = records.get(text)
+    if record is None:
+        normalized = normalize_cas(text)
+        if normalized and normalized != text:
+            record = records.get(normalized)
+    return record
+
+
+def _build_reference_links(
+    cas_number: Optional[str],
+    cid: Optional[int],
+    name_en: Optional[str] = None,
+    *,
+    record: Optional[_CasDisplayRecord] = None,
+) -> List[Dict[str, Any]]:
+    if cas_number and record is None:
+        record = _cas_display_record(cas_number)
+    if record is not None and not cid:
+        return list(record.reference_links)
+    links = _static_reference_links(cas_number, cid, name_en)
+    if record is not None:
+        links.extend(record.store_links)
+    return _merge_reference_links(links)
+
+
 def _record_dictionary_miss(query: str, query_kind: str, endpoint: str, *, context: Optional[Dict[str, Any]] = None) -> None:
     if not CAPTURE_DICTIONARY_MISSES:
         return
@@ -800,6 +1264,7 @@ limiter = Limiter(
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown events."""
     global shared_http_client
+    start_event_log_queue()
     pilot_store.connect()
     review_purge = pilot_store.purge_stale_review_rows()
     _record_ops_counter(
@@ -810,8 +1275,19 @@ async def lifespan(app: FastAPI):
         "dictionary.review_queue.correction_rows_purged",
         review_purge["deletedCorrectionCount"],
     )
-    if pdf_renderer is not None and hasattr(pdf_renderer, "startup"):
-        await pdf_renderer.startup()
+    # Load (or build and persist) the name index before serving traffic so the
+    # first name search in each worker does not pay for it.
+    try:
+        await asyncio.to_thread(_get_name_resolution_index)
+    except Exception:
+        logger.exception("Name index warm-up failed; it will build on first search")
+    # Chromium launches in the background (or on the first print, when
+    # lazy) so search traffic is served without waiting for it; /api/health
+    # reports readiness "degraded" until it is up.
+    if PDF_RENDER_STARTUP == "background" and pdf_renderer is not None:
+        pdf_renderer.start_in_background()
+    if native_label_renderer is not None:
+        await native_label_renderer.startup()
     shared_http_client = httpx.AsyncClient(
         timeout=30.0,
         limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
@@ -823,12 +1299,15 @@ async def lifespan(app: FastAPI):
             ),
         },
     )
+    _record_ops_counter("batch_job.resumed", await batch_search_job_runner.startup())
     yield
     # Shutdown
+    await batch_search_job_runner.shutdown()
     await shared_http_client.aclose()
     if pdf_renderer is not None and hasattr(pdf_renderer, "shutdown"):
         await pdf_renderer.shutdown()
     pilot_store.close()
+    stop_event_log_queue()
 
 # Create the main app with lifespan
 app = FastAPI(title="GHS Label Quick Search API", lifespan=lifespan)
@@ -838,6 +1317,17 @@ app = FastAPI(title="GHS Label Quick Search API", lifespan=lifespan)
 # rather than a generic 500.
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Innermost, so it sees each route's complete body before SlowAPI's
+# BaseHTTPMiddleware re-chunks it.
+app.add_middleware(
+    ResponseCompressionMiddleware,
+    minimum_size=_bounded_env_int(
+        "RESPONSE_COMPRESSION_MIN_BYTES",
+        1024,
+        minimum=256,
+        maximum=1024 * 1024,
+    ),
+)
 app.add_middleware(SlowAPIMiddleware)
 app.add_middleware(PublicJsonBodyLimitMiddleware)
 
@@ -869,11 +1359,9 @@ GHS_PICTOGRAMS = {
 H_CODE_PATTERN = re.compile(r'\bH\d{3}[A-Za-z]*\b')
 GHS_TEXT_ONLY_REVIEW_ERROR = "PubChem GHS 資料含文字危害但未提供 pictogram；使用或列印前請核對 SDS。"
 
-# Pre-computed cleaned-name index for O(1) fuzzy lookups (built once at startup)
-_CLEAN_NAME_INDEX: Dict[str, str] = {}
-for _en_name, _zh_name in CHEMICAL_NAMES_ZH_EXPANDED.items():
-    _clean = re.sub(r'[^a-z0-9]', '', _en_name)
-    _CLEAN_NAME_INDEX[_clean] = _zh_name
+# Pre-computed cleaned-name index for O(1) fuzzy lookups (compiled with the
+# seed dictionary artifact instead of one regex per entry at import)
+_CLEAN_NAME_INDEX = CLEAN_NAME_INDEX
 
 class PubChemError(Exception):
     """Raised when PubChem cannot provide a trustworthy response."""
@@ -1044,19 +1532,24 @@ async def pubchem_get_json(
         await asyncio.sleep(delay)
 
 
-def resolve_name_to_cas(query: str) -> Optional[str]:
+def resolve_name_to_cas(
+    query: str,
+    index: Optional[_NameResolutionIndex] = None,
+) -> Optional[str]:
     """Resolve English or Chinese chemical name to CAS number.
     Returns the first matching CAS number, or None.
     Priority: manual exact formal name → seed exact formal name →
               approved exact alias → compact exact match →
               word-boundary English → unique prefix English → unique prefix Chinese
+    Batch callers pass one ``index`` for every query instead of re-checking
+    the dictionary version per name.
     """
     q = query.strip()
     if not q:
         return None
 
     locale = infer_locale(q)
-    index = _get_name_resolution_index()
+    index = index or _get_name_resolution_index()
     q_lower = q.lower()
     compact_q = normalize_compact_text(q, locale=locale)
 
@@ -1087,7 +1580,7 @@ def resolve_name_to_cas(query: str) -> Optional[str]:
         if exact_alias:
             return exact_alias
 
-    compact_match = _compact_exact_match(q, locale)
+    compact_match = _compact_exact_match(q, locale, index)
     if compact_match:
         return compact_match
 
@@ -1478,37 +1971,31 @@ def extract_all_ghs_classifications(ghs_data: dict) -> List[Dict[str, Any]]:
     return reports
 
 
-def get_chinese_name_from_cas(cas_number: str) -> Optional[str]:
-    """Get Chinese name directly from CAS number (most accurate method)"""
+def _display_names_from_cas(
+    cas_number: Optional[str],
+    record: Optional[_CasDisplayRecord] = None,
+) -> tuple[Optional[str], Optional[str]]:
+    """Return ``(name_en, name_zh)`` from the display record, then the seed tables."""
     if not cas_number:
-        return None
-    cas_normalized = normalize_cas(cas_number.strip()) or cas_number.strip()
+        return None, None
+    if record is None:
+        record = _cas_display_record(cas_number)
+    name_en = record.name_en if record is not None else ""
+    name_zh = record.name_zh if record is not None else ""
+    if not (name_en and name_zh):
+        cas_normalized = normalize_cas(cas_number.strip()) or cas_number.strip()
+        name_en = name_en or CAS_TO_EN.get(cas_normalized) or ""
+        name_zh = name_zh or CAS_TO_ZH.get(cas_normalized) or ""
+    return name_en or None, name_zh or None
 
-    indexed = _get_name_resolution_index().names_by_cas.get(cas_normalized, {})
-    if indexed.get("name_zh"):
-        return indexed["name_zh"]
-    
-    # Direct CAS lookup - highest priority
-    if cas_normalized in CAS_TO_ZH:
-        return CAS_TO_ZH[cas_normalized]
-    
-    return None
+
+def get_chinese_name_from_cas(cas_number: str) -> Optional[str]:
+    """Get Chinese name directly from CAS number (most accurate method)"""
+    return _display_names_from_cas(cas_number)[1]
 
 def get_english_name_from_cas(cas_number: str) -> Optional[str]:
     """Get English name from CAS number via local dictionary"""
-    if not cas_number:
-        return None
-    cas_normalized = normalize_cas(cas_number.strip()) or cas_number.strip()
-
-    indexed = _get_name_resolution_index().names_by_cas.get(cas_normalized, {})
-    if indexed.get("name_en"):
-        return indexed["name_en"]
-    
-    # Direct lookup from CAS_TO_EN dictionary
-    if cas_normalized in CAS_TO_EN:
-        return CAS_TO_EN[cas_normalized]
-    
-    return None
+    return _display_names_from_cas(cas_number)[0]
 
 def get_chinese_name_from_dict(name_en: str) -> Optional[str]:
     """Get Chinese name from English name dictionary (optimized with pre-built index)."""
@@ -1844,8 +2331,8 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
         )
 
     # ===== NEW: Try to get Chinese and English name from CAS dictionary FIRST (most accurate) =====
-    name_zh_from_cas = get_chinese_name_from_cas(normalized_cas)
-    name_en_from_cas = get_english_name_from_cas(normalized_cas)
+    display_record = _cas_display_record(normalized_cas)
+    name_en_from_cas, name_zh_from_cas = _display_names_from_cas(normalized_cas, display_record)
     if name_zh_from_cas:
         logger.info(f"Found Chinese name from CAS dictionary for {normalized_cas}: {name_zh_from_cas}")
     if name_en_from_cas:
@@ -1881,7 +2368,12 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
                 signal_word=None,
                 signal_word_zh=None,
                 found=True,
-                reference_links=_build_reference_links(normalized_cas, None, name_en_from_cas),
+                reference_links=_build_reference_links(
+                    normalized_cas,
+                    None,
+                    name_en_from_cas,
+                    record=display_record,
+                ),
                 error="PubChem 無 GHS 資料，僅提供本地字典名稱"
             )
         # Provide more helpful error message
@@ -1891,6 +2383,17 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
             error=f"在 PubChem 資料庫中找不到 CAS {normalized_cas}，請確認號碼是否正確"
         )
     
+    cached_ghs = ghs_cache.get(cid)
+    if cached_ghs is not None:
+        cached_entry = chemical_result_cache.get(
+            _chemical_result_cache_key(normalized_cas, cid, cached_ghs[1])
+        )
+        if cached_entry is not None:
+            _observe_ghs_cache_hit(cid, cached_ghs[1])
+            _record_ops_counter("cache.result.hit")
+            return _batch_row_result(cached_entry.result, cas_number)
+    _record_ops_counter("cache.result.miss")
+
     # Get compound name and GHS data. When the local dictionary already
     # has both display names, avoid PubChem name/synonym calls entirely:
     # the safety-critical data is the GHS payload, and waiting on best-
@@ -1994,6 +2497,7 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
         name_en = extract_iupac_name(ghs_data)
     
     # If still no name, use CAS number as name
+    name_from_cid_fallback = not name_en
     if not name_en:
         name_en = f"CID-{cid}"
         logger.warning(f"No name found for CAS {cas_number}, using CID as fallback")
@@ -2009,7 +2513,7 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
     else:
         name_zh = get_chinese_name_from_dict(name_en)
     
-    return ChemicalResult(
+    result = ChemicalResult(
         cas_number=cas_number,
         cid=cid,
         name_en=name_en,
@@ -2026,9 +2530,162 @@ async def search_chemical(cas_number: str, http_client: httpx.AsyncClient) -> Ch
         primary_report_count=primary_report_count,
         retrieved_at=retrieved_at,
         cache_hit=cache_hit,
-        reference_links=_build_reference_links(normalized_cas, cid, name_en),
+        reference_links=_build_reference_links(
+            normalized_cas,
+            cid,
+            name_en,
+            record=display_record,
+        ),
         error=GHS_TEXT_ONLY_REVIEW_ERROR if text_only_review_required else None,
     )
+    if not name_from_cid_fallback:
+        _store_chemical_result(normalized_cas, result)
+    return result
+
+
+@dataclass(frozen=True)
+class _ChemicalResultCacheEntry:
+    """A finished search result under its normalized CAS, plus its JSON body.
+
+    Shared between requests; callers must copy before changing fields.
+    """
+
+    result: ChemicalResult
+    body: bytes
+    etag: str
+
+
+def _chemical_result_cache_key(normalized_cas: str, cid: int, retrieved_at: Optional[str]) -> tuple:
+    return (
+        normalized_cas,
+        cid,
+        retrieved_at,
+        id(pilot_store),
+        _dictionary_data_version(),
+        _seed_dictionary_signature(),
+    )
+
+
+def _store_chemical_result(normalized_cas: str, result: ChemicalResult) -> None:
+    # Only results rebuilt from a cached GHS payload can be hit again: a 404
+    # or an oversize payload is never cached, so its key would never recur.
+    cached_ghs = ghs_cache.get(result.cid)
+    if (
+        not CHEMICAL_RESULT_CACHE_MAX_ENTRIES
+        or cached_ghs is None
+        or cached_ghs[1] != result.retrieved_at
+    ):
+        return
+    cached = result.model_copy(update={"cas_number": normalized_cas, "cache_hit": True})
+    body = cached.model_dump_json().encode("utf-8")
+    chemical_result_cache[
+        _chemical_result_cache_key(normalized_cas, result.cid, result.retrieved_at)
+    ] = _ChemicalResultCacheEntry(cached, body, _content_etag(body))
+
+
+def _cached_chemical_result_entry(result: ChemicalResult) -> Optional[_ChemicalResultCacheEntry]:
+    """Return the cache entry when ``result`` is the cached instance itself.
+
+    Copies made for another spelling of the CAS are not the cached instance
+    and have to be serialized on their own.
+    """
+    if not result.found or result.cid is None:
+        return None
+    normalized_cas = normalize_cas(result.cas_number)
+    if not normalized_cas:
+        return None
+    entry = chemical_result_cache.get(
+        _chemical_result_cache_key(normalized_cas, result.cid, result.retrieved_at)
+    )
+    if entry is None or entry.result is not result:
+        return None
+    return entry
+
+
+# ─── HTTP caching for lookup routes ─────────────────────────
+#
+# Lookup bodies are identified by a strong ETag over their JSON bytes, so a
+# dictionary edit or a GHS refetch changes the tag, and clients, agents or a
+# CDN revalidate with If-None-Match instead of downloading the body again.
+# Upstream errors are never stored; misses are kept briefly so a newly added
+# dictionary entry shows up quickly.
+LOOKUP_FOUND_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=3600"
+LOOKUP_MISS_CACHE_CONTROL = "public, max-age=60"
+LOOKUP_UPSTREAM_ERROR_CACHE_CONTROL = "no-store"
+NAME_SEARCH_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+STATIC_REFERENCE_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _content_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2); the compression
+    # middleware weakens tags on encoded bodies.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _conditional_json_response(
+    request: Request,
+    body: bytes,
+    *,
+    cache_control: str,
+    etag: Optional[str] = None,
+) -> Response:
+    if cache_control == LOOKUP_UPSTREAM_ERROR_CACHE_CONTROL:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Cache-Control": cache_control},
+        )
+    headers = {"ETag": etag or _content_etag(body), "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        _record_ops_counter("http.not_modified")
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _lookup_cache_control(result: ChemicalResult) -> str:
+    if result.upstream_error:
+        return LOOKUP_UPSTREAM_ERROR_CACHE_CONTROL
+    return LOOKUP_FOUND_CACHE_CONTROL if result.found else LOOKUP_MISS_CACHE_CONTROL
+
+
+def _chemical_result_response(request: Request, result: ChemicalResult) -> Response:
+    """Serialize one lookup result with validators, reusing cached bytes."""
+    entry = _cached_chemical_result_entry(result)
+    if entry is not None:
+        body, etag = entry.body, entry.etag
+    else:
+        body, etag = result.model_dump_json().encode("utf-8"), None
+    return _conditional_json_response(
+        request,
+        body,
+        cache_control=_lookup_cache_control(result),
+        etag=etag,
+    )
+
+
+_CHEMICAL_RESULTS_ADAPTER = TypeAdapter(List[ChemicalResult])
+
+
+def _chemical_results_json(results: List[ChemicalResult]) -> bytes:
+    """Encode rows we built ourselves without FastAPI re-validating them.
+
+    Produces the same bytes as the ``response_model`` path through
+    pydantic-core's serializer, minus the validation pass over every nested
+    report and statement.
+    """
+    return _CHEMICAL_RESULTS_ADAPTER.dump_json(results)
 
 
 async def bounded_search_chemical(
@@ -2055,10 +2712,11 @@ async def bounded_search_chemical(
             normalized_cas or cas_number,
             SEARCH_CHEMICAL_TIMEOUT_SECONDS,
         )
+        name_en, name_zh = _display_names_from_cas(normalized_cas)
         return ChemicalResult(
             cas_number=cas_number,
-            name_en=get_english_name_from_cas(normalized_cas),
-            name_zh=get_chinese_name_from_cas(normalized_cas),
+            name_en=name_en,
+            name_zh=name_zh,
             found=False,
             upstream_error=True,
             error=(
@@ -2082,16 +2740,42 @@ async def collect_telemetry(request: Request, payload: TelemetryEventPayload):
         raise HTTPException(status_code=422, detail=str(exc)) from exc
     return {"ok": True, "eventId": event["id"]}
 
+
+@api_router.post("/telemetry/batch")
+@limiter.limit("30/minute")
+async def collect_telemetry_batch(request: Request, payload: TelemetryBatchPayload):
+    """Accept a burst of frontend events (e.g. one print session) in one call.
+
+    Unsupported event types are reported per item instead of failing the
+    whole batch.
+    """
+    accepted, rejected = record_telemetry_events(
+        [event.model_dump() for event in payload.events]
+    )
+    _record_ops_counter("telemetry.batch.accepted", len(accepted))
+    _record_ops_counter("telemetry.batch.rejected", len(rejected))
+    return {
+        "ok": not rejected,
+        "accepted": len(accepted),
+        "eventIds": [event["id"] for event in accepted],
+        "rejected": rejected,
+    }
+
 @api_router.get("/health")
 async def health_check():
     """Health check endpoint for monitoring and load balancers."""
     pdf_available = bool(
         pdf_renderer and getattr(pdf_renderer, "available", False)
     )
+    pdf_capability: Dict[str, Any] = {"available": pdf_available}
+    if hasattr(pdf_renderer, "startup_state"):
+        pdf_capability["startup"] = pdf_renderer.startup_state
+    if hasattr(pdf_renderer, "worker_health"):
+        pdf_capability["workers"] = pdf_renderer.worker_health()
     return {
         "status": "healthy",
         "readiness": "ready" if pdf_available else "degraded",
-        "capabilities": {"pdf": {"available": pdf_available}},
+        "capabilities": {"pdf": pdf_capability},
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": APP_VERSION,
         "gitSha": BUILD_GIT_SHA,
@@ -2130,11 +2814,17 @@ async def health_pdf_canary(request: Request):
         }
     )
     try:
-        pdf_bytes = await renderer.render(payload)
+        # Always a live render: a cached canary would prove nothing.
+        pdf_bytes = await renderer.render(payload, use_cache=False)
     except PdfRenderUnavailableError as exc:
         raise _pdf_service_unavailable(exc.code, str(exc)) from exc
     except PdfRenderBusyError as exc:
-        raise _pdf_service_unavailable(exc.code, str(exc)) from exc
+        _record_ops_counter("pdf.render_busy")
+        raise _pdf_service_unavailable(
+            exc.code,
+            str(exc),
+            retry_after_seconds=exc.retry_after_seconds,
+        ) from exc
     except PdfRenderError as exc:
         raise _pdf_service_unavailable(exc.code, str(exc)) from exc
 
@@ -2165,6 +2855,8 @@ api_router.include_router(
         ops_recent_events=ops_recent_events,
         is_dictionary_miss_capture_enabled=lambda: CAPTURE_DICTIONARY_MISSES,
         record_ops_counter=_record_ops_counter,
+        event_counts=event_counts,
+        pdf_render_stats=lambda: _pdf_render_stats(),
     )
 )
 
@@ -2176,21 +2868,321 @@ async def search_chemicals(request: Request, query: CASQuery):
     # Keep the public batch route inside the gateway budget. The outbound
     # PubChem semaphore still limits upstream concurrency, while each item has
     # its own explicit timeout and degrades to an upstream_error row.
-    tasks = [bounded_search_chemical(cas, http_client) for cas in query.cas_numbers]
-    results = await asyncio.gather(*tasks)
-    for raw_query, result in zip(query.cas_numbers, results):
-        if result.found or result.upstream_error:
-            continue
-        _record_dictionary_miss(
-            raw_query,
-            "cas",
-            "search_batch",
-            context={"normalizedCas": normalize_cas(raw_query)},
+    lookup_groups = _plan_batch_lookups(query.cas_numbers)
+    lookup_results = await asyncio.gather(*(
+        bounded_search_chemical(query.cas_numbers[rows[0]], http_client)
+        for rows in lookup_groups
+    ))
+    results: List[Optional[ChemicalResult]] = [None] * len(query.cas_numbers)
+    for rows, result in zip(lookup_groups, lookup_results):
+        for index in rows:
+            raw_query = query.cas_numbers[index]
+            results[index] = _batch_row_result(result, raw_query)
+            _record_batch_search_miss(raw_query, results[index])
+    return Response(content=_chemical_results_json(results), media_type="application/json")
+
+
+def _batch_lookup_key(raw_query: str) -> str:
+    return normalize_cas(raw_query) or raw_query
+
+
+def _plan_batch_lookups(cas_numbers: List[str]) -> List[List[int]]:
+    """Group batch rows that resolve to the same CAS so each is looked up once.
+
+    Inventory pastes repeat the same chemical, often in different spellings
+    (``64175``, ``64-17-5``, `` 064-17-5``). Returns the row indexes of each
+    group in first-seen order; the group's first row is the one looked up.
+    """
+    groups: Dict[str, List[int]] = {}
+    for index, raw_query in enumerate(cas_numbers):
+        groups.setdefault(_batch_lookup_key(raw_query), []).append(index)
+    _record_ops_counter("search.batch.rows", len(cas_numbers))
+    _record_ops_counter("search.batch.lookups", len(groups))
+    _record_ops_counter("search.batch.deduped_rows", len(cas_numbers) - len(groups))
+    return list(groups.values())
+
+
+def _batch_row_result(result: ChemicalResult, raw_query: str) -> ChemicalResult:
+    """Return a shared lookup result under the row's own ``cas_number``."""
+    if result.cas_number == raw_query:
+        return result
+    return result.model_copy(update={"cas_number": raw_query})
+
+
+def _record_batch_search_miss(raw_query: str, result: ChemicalResult) -> None:
+    if result.found or result.upstream_error:
+        return
+    _record_dictionary_miss(
+        raw_query,
+        "cas",
+        "search_batch",
+        context={"normalizedCas": normalize_cas(raw_query)},
+    )
+
+
+def _json_response(payload: Any, *, status_code: int = 200) -> Response:
+    return Response(
+        content=json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _format_stream_record(record: Dict[str, Any], *, sse: bool) -> bytes:
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    if sse:
+        return f"event: {record['type']}\ndata: {payload}\n\n".encode("utf-8")
+    return f"{payload}\n".encode("utf-8")
+
+
+@api_router.post("/search/stream")
+@limiter.limit("10/minute")
+async def search_chemicals_stream(request: Request, query: CASQuery):
+    """Stream batch search rows as each lookup finishes.
+
+    Emits one ``{"type": "result", "index", "query", "result"}`` record per
+    row in completion order, so cache and local-dictionary hits arrive before
+    rows still waiting on PubChem, then one ``{"type": "summary"}`` record.
+    Rows naming the same CAS share one lookup and arrive together.
+    The body is newline-delimited JSON unless the client accepts
+    ``text/event-stream``, in which case the same records are sent as SSE.
+    """
+    http_client = shared_http_client
+    cas_numbers = list(query.cas_numbers)
+    sse = "text/event-stream" in (request.headers.get("accept") or "")
+
+    async def lookup(rows: List[int]) -> tuple[List[int], ChemicalResult]:
+        return rows, await bounded_search_chemical(cas_numbers[rows[0]], http_client)
+
+    async def records():
+        started = time.perf_counter()
+        counts = {"found": 0, "not_found": 0, "upstream_error": 0}
+        tasks = [
+            asyncio.create_task(lookup(rows))
+            for rows in _plan_batch_lookups(cas_numbers)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                rows, lookup_result = await next_result
+                for index in rows:
+                    raw_query = cas_numbers[index]
+                    result = _batch_row_result(lookup_result, raw_query)
+                    _record_batch_search_miss(raw_query, result)
+                    if result.upstream_error:
+                        counts["upstream_error"] += 1
+                    elif result.found:
+                        counts["found"] += 1
+                    else:
+                        counts["not_found"] += 1
+                    yield _format_stream_record(
+                        {
+                            "type": "result",
+                            "index": index,
+                            "query": raw_query,
+                            "result": result.model_dump(mode="json"),
+                        },
+                        sse=sse,
+                    )
+            yield _format_stream_record(
+                {
+                    "type": "summary",
+                    "total": len(cas_numbers),
+                    **counts,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000),
+                },
+                sse=sse,
+            )
+        finally:
+            # A client that disconnects mid-stream must not leave lookups
+            # holding PubChem semaphore slots.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        records(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+async def _run_batch_job_lookup(query: str) -> Dict[str, Any]:
+    result = await bounded_search_chemical(query, shared_http_client)
+    _record_batch_search_miss(query, result)
+    _record_ops_counter("batch_job.lookups")
+    return result.model_dump(mode="json")
+
+
+def _require_batch_search_job(job_id: str) -> Dict[str, Any]:
+    job = pilot_store.get_batch_search_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch search job not found")
+    return job
+
+
+def _is_ghs_cached(normalized_cas: str) -> bool:
+    cid = cid_cache.get(normalized_cas)
+    return cid is not None and cid in ghs_cache
+
+
+def _ghs_cached_cas_snapshot() -> frozenset[str]:
+    """CAS numbers whose GHS record is cached, read on the event loop.
+
+    TTLCache lookups reorder the cache internally, so triage threads get
+    this read-only set rather than touching the caches themselves.
+    """
+    return frozenset(cas for cas in list(cid_cache) if _is_ghs_cached(cas))
+
+
+@api_router.post("/search/triage")
+@limiter.limit("20/minute")
+async def triage_cas_numbers(request: Request, query: CASTriageRequest):
+    """Classify inventory CAS tokens locally before spending PubChem budget.
+
+    Every row is ``invalid`` (format or checksum), a ``duplicate`` of an
+    earlier row, already ``cached``, or ``needs_upstream``; no upstream
+    call is made. ``upstream_cas_numbers`` lists the distinct lookups a
+    batch job would actually send to PubChem.
+    """
+    known_cas = _get_name_resolution_index().names_by_cas
+    cached_snapshot = _ghs_cached_cas_snapshot()
+    triage = await asyncio.to_thread(
+        triage_cas_tokens,
+        query.cas_numbers,
+        known_cas=known_cas,
+        cached_cas=lambda cas_numbers: cas_numbers & cached_snapshot,
+    )
+    _record_ops_counter("triage.rows", len(query.cas_numbers))
+    _record_ops_counter("triage.needs_upstream", triage["counts"]["needs_upstream"])
+    return _json_response(triage)
+
+
+@api_router.post("/search/jobs", status_code=202)
+@limiter.limit("5/minute")
+async def create_batch_search_job(request: Request, payload: BatchSearchJobRequest):
+    """Queue an inventory-scale CAS list and return its job id immediately.
+
+    Poll ``GET /api/search/jobs/{job_id}`` (or stream ``/events``), page rows
+    from ``/results`` and download ``/export/{xlsx|csv}`` once completed.
+    Duplicate CAS numbers in one job are looked up once.
+    """
+    try:
+        job = batch_search_job_runner.submit(payload.cas_numbers)
+    except BatchSearchJobLimitError as exc:
+        _record_ops_counter("batch_job.rejected")
+        raise HTTPException(status_code=503, detail=exc.as_detail()) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "code": "batch_job_runner_unavailable",
+                "message": "Batch search jobs are not available right now",
+            },
+        ) from exc
+    _record_ops_counter("batch_job.created")
+    _record_ops_counter("batch_job.rows", job["total"])
+    return job
+
+
+@api_router.get("/search/jobs/{job_id}")
+@limiter.limit("120/minute")
+async def get_batch_search_job(request: Request, job_id: str):
+    """Return a batch search job's status and row counters."""
+    return _require_batch_search_job(job_id)
+
+
+@api_router.get("/search/jobs/{job_id}/results")
+@limiter.limit("120/minute")
+async def get_batch_search_job_results(
+    request: Request,
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=BATCH_JOB_MAX_RESULTS_PAGE),
+):
+    """Page through a job's rows in submission order.
+
+    Rows whose lookup has not finished yet have ``"result": null``.
+    """
+    job = _require_batch_search_job(job_id)
+    rows = pilot_store.list_batch_search_job_rows(job_id, offset=offset, limit=limit)
+    next_offset = offset + limit
+    # Rows are plain dicts decoded from SQLite; encoding them directly avoids
+    # jsonable_encoder walking every nested statement of up to 500 results.
+    return _json_response({
+        "job": job,
+        "offset": offset,
+        "limit": limit,
+        "results": rows,
+        "next_offset": next_offset if next_offset < job["total"] else None,
+    })
+
+
+@api_router.get("/search/jobs/{job_id}/events")
+@limiter.limit("30/minute")
+async def stream_batch_search_job_progress(request: Request, job_id: str):
+    """Stream ``progress`` records until the job completes.
+
+    Uses the same NDJSON / SSE framing as ``/api/search/stream``; a record is
+    sent whenever the job's counters change, and a final ``completed`` record
+    ends the stream.
+    """
+    job = _require_batch_search_job(job_id)
+    sse = "text/event-stream" in (request.headers.get("accept") or "")
+
+    async def records():
+        current = job
+        last_sent = None
+        while current is not None:
+            if current["status"] == BATCH_SEARCH_JOB_COMPLETED_STATUS:
+                yield _format_stream_record({"type": "completed", **current}, sse=sse)
+                return
+            if current["updated_at"] != last_sent:
+                last_sent = current["updated_at"]
+                yield _format_stream_record({"type": "progress", **current}, sse=sse)
+            await asyncio.sleep(BATCH_JOB_PROGRESS_POLL_SECONDS)
+            current = pilot_store.get_batch_search_job(job_id)
+
+    return StreamingResponse(
+        records(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@api_router.get("/search/jobs/{job_id}/export/{fmt}")
+@limiter.limit("10/minute")
+async def export_batch_search_job(request: Request, job_id: str, fmt: str):
+    """Export a completed job straight from storage, without a client round trip."""
+    if fmt not in _EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Unsupported export format")
+    job = _require_batch_search_job(job_id)
+    if job["status"] != BATCH_SEARCH_JOB_COMPLETED_STATUS:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "code": "batch_job_not_completed",
+                "message": "Batch search job has not finished yet",
+            },
+        )
+    rows = pilot_store.list_batch_search_job_rows(job_id, limit=job["total"])
+    results = [row["result"] for row in rows]
+    if fmt == "xlsx":
+        # Thousands of rows take a noticeable amount of CPU in openpyxl.
+        output = await asyncio.to_thread(
+            _build_xlsx_export,
+            results,
+            export_scope="batch-job",
+            export_scope_label="Batch search job",
+            export_count=len(results),
+            source_total_count=len(results),
+            visible_count=len(results),
         )
-    return results
+    else:
+        output = await asyncio.to_thread(_build_csv_export, results)
+    _record_ops_counter(f"batch_job.export.{fmt}")
+    return _export_response(output, fmt=fmt, scope="batch-job", count=len(results))
+
 
 @api_router.get("/search-by-name/{query}")
-@limiter.limit("60/minute")
+@limiter.limit(NAME_SEARCH_RATE_LIMIT)
 async def search_by_name(
     request: Request,
     query: str = ApiPath(..., max_length=MAX_PUBLIC_SEARCH_QUERY_LENGTH),
@@ -2200,59 +3192,247 @@ async def search_by_name(
     Used for autocomplete / name lookup before full GHS search.
     The `alias` field is set when matched via a common name (e.g., "酒精" → 乙醇).
     """
+    payload = _name_search_payload(query, endpoint="search_by_name")
+    return _name_search_response(request, payload)
+
+
+def _name_search_payload(query: str, *, endpoint: str) -> Dict[str, Any]:
     q = query.strip()
     if not q or len(q) < 2:
         return {"results": [], "query": q}
 
     q_lower = q.lower()
     index = _get_name_resolution_index()
-    matches = []
+    display_records = index.display_records
+    matches: list[tuple[_CasDisplayRecord, Optional[str]]] = []
     seen_rows = set()
 
-    def append_match(cas: str, *, alias: Optional[str] = None) -> None:
-        normalized = _normalize_valid_lookup_cas(cas)
-        if not normalized:
-            return
-        key = (normalized, alias or "")
-        if key in seen_rows:
-            return
-        seen_rows.add(key)
-        names = index.names_by_cas.get(normalized, {})
-        name_en = names.get("name_en") or CAS_TO_EN.get(normalized) or ""
-        name_zh = names.get("name_zh") or CAS_TO_ZH.get(normalized) or ""
-        matches.append({
-            "cas_number": normalized,
-            "name_en": name_en,
-            "name_zh": name_zh,
-            "alias": alias,
-            "reference_links": _build_reference_links(
-                normalized,
-                None,
-                name_en,
-            ),
-        })
-
     for entry in index.autocomplete_entries:
         if entry.locale == "zh":
-            if q in entry.name:
-                append_match(entry.cas_number, alias=entry.alias)
-        elif q_lower in entry.name:
-            append_match(entry.cas_number, alias=entry.alias)
+            if q not in entry.name:
+                continue
+        elif q_lower not in entry.name:
+            continue
+        record = display_records.get(entry.cas_number) or _cas_display_record(entry.cas_number, index)
+        if record is None:
+            continue
+        key = (record.cas_number, entry.alias or "")
+        if key in seen_rows:
+            continue
+        seen_rows.add(key)
+        matches.append((record, entry.alias))
 
     # Sort: exact match first, then alias matches, then by name length
-    matches.sort(key=lambda m: (
-        0 if m["name_en"].lower() == q_lower or m["name_zh"] == q else
-        0 if m.get("alias") and (m["alias"] == q or m["alias"].lower() == q_lower) else 1,
-        len(m["name_en"])
+    matches.sort(key=lambda match: (
+        0 if match[0].name_en.lower() == q_lower or match[0].name_zh == q else
+        0 if match[1] and (match[1] == q or match[1].lower() == q_lower) else 1,
+        len(match[0].name_en)
     ))
 
-    results = matches[:20]
+    results = [
+        {
+            "cas_number": record.cas_number,
+            "name_en": record.name_en,
+            "name_zh": record.name_zh,
+            "alias": alias,
+            "reference_links": list(record.reference_links),
+        }
+        for record, alias in matches[:NAME_SEARCH_MAX_RESULTS]
+    ]
     if len(results) == 0:
-        _record_dictionary_miss(q, "autocomplete", "search_by_name")
+        _record_dictionary_miss(q, "autocomplete", endpoint)
 
     return {"results": results, "query": q}
 
 
+def _name_search_response(request: Request, payload: Dict[str, Any]) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _conditional_json_response(request, body, cache_control=NAME_SEARCH_CACHE_CONTROL)
+
+
+_NAME_SEARCH_WS_QUERY_LIMIT = parse_rate_limit(NAME_SEARCH_RATE_LIMIT)
+_NAME_SEARCH_WS_WARM_LIMIT = parse_rate_limit(NAME_SEARCH_WS_WARM_RATE_LIMIT)
+
+
+def _hit_channel_rate_limit(item, scope: str, client_key: str) -> Optional[int]:
+    """Meter one channel message; return the retry delay when over the limit.
+
+    Uses the slowapi limiter's storage so the budget is per client across
+    connections (and shared between workers when a redis store is set).
+    """
+    if not limiter.enabled:
+        return None
+    if limiter.limiter.hit(item, scope, client_key):
+        return None
+    reset_at, _remaining = limiter.limiter.get_window_stats(item, scope, client_key)
+    return max(1, int(reset_at - time.time()) + 1)
+
+
+async def _warm_name_search_suggestion(cas_number: str, client_key: str) -> Optional[bool]:
+    normalized_cas = normalize_cas(cas_number)
+    if not normalized_cas:
+        return None
+    if _is_ghs_cached(normalized_cas):
+        return None
+    if _hit_channel_rate_limit(_NAME_SEARCH_WS_WARM_LIMIT, "search-by-name-ws-warm", client_key) is not None:
+        _record_ops_counter("search.ws.warm.budget_exhausted")
+        return None
+    _record_ops_counter("search.ws.warm.started")
+    try:
+        result = await asyncio.wait_for(
+            search_chemical(normalized_cas, shared_http_client),
+            timeout=NAME_SEARCH_WS_WARM_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        _record_ops_counter("search.ws.warm.timeout")
+        return None
+    except Exception as exc:
+        _record_ops_counter("search.ws.warm.failed")
+        logger.debug("Speculative warm failed for %s: %s", normalized_cas, exc)
+        return None
+    return result.found
+
+
+async def _answer_name_search_channel_query(send, query: str, seq: Optional[int], client_key: str) -> None:
+    try:
+        payload = _name_search_payload(query, endpoint="search_by_name_ws")
+        await send({"type": "results", "seq": seq, **payload})
+        if not NAME_SEARCH_WS_WARM_TOP or not payload["results"]:
+            return
+        # Only warm once typing pauses; the next keystroke cancels this task.
+        await asyncio.sleep(NAME_SEARCH_WS_WARM_DELAY_SECONDS)
+        cas_number = payload["results"][0]["cas_number"]
+        found = await _warm_name_search_suggestion(cas_number, client_key)
+        if found is not None:
+            await send({"type": "warmed", "seq": seq, "cas_number": cas_number, "found": found})
+    except (WebSocketDisconnect, RuntimeError):
+        # The socket closed underneath us; the receive loop cleans up.
+        return
+
+
+def _parse_name_search_channel_message(raw: str) -> tuple[Optional[str], Optional[int], Optional[str]]:
+    """Return ``(query, seq, error_code)`` for one client message."""
+    if len(raw) > NAME_SEARCH_WS_MAX_MESSAGE_CHARS:
+        return None, None, "message_too_large"
+    try:
+        message = json.loads(raw)
+    except ValueError:
+        return None, None, "invalid_message"
+    if not isinstance(message, dict) or not isinstance(message.get("q"), str):
+        return None, None, "invalid_message"
+    seq = message.get("seq")
+    if not isinstance(seq, int) or isinstance(seq, bool):
+        seq = None
+    if len(message["q"]) > MAX_PUBLIC_SEARCH_QUERY_LENGTH:
+        return None, seq, "query_too_long"
+    return message["q"], seq, None
+
+
+@api_router.websocket("/ws/search-by-name")
+async def search_by_name_channel(websocket: WebSocket):
+    """Search-as-you-type over one connection per session.
+
+    The client sends ``{"q": "...", "seq": n}`` per keystroke. A new query
+    cancels whatever the previous one still had in flight, so only the latest
+    query's top results come back as ``{"type": "results", "seq": n, ...}``
+    (same ``results``/``query`` shape as ``GET /search-by-name/{query}``).
+    When typing pauses, the top suggestion's GHS record may be fetched ahead
+    of time within the search-single rate budget; a ``warmed`` message then
+    tells the client the detail lookup will be served from cache.
+    """
+    origin = websocket.headers.get("origin")
+    if origin and origin not in _cors_origins:
+        _record_ops_counter("search.ws.rejected_origin")
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    _record_ops_counter("search.ws.connections")
+    client_key = _client_ip(websocket)
+    send_lock = asyncio.Lock()
+    in_flight: Optional[asyncio.Task] = None
+
+    async def send(message: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_text(json.dumps(message, ensure_ascii=False, separators=(",", ":")))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            raw = message.get("text")
+            if raw is None:
+                # Binary frames are not part of the protocol.
+                await send({"type": "error", "seq": None, "code": "invalid_message"})
+                continue
+            query, seq, error_code = _parse_name_search_channel_message(raw)
+            if error_code is not None:
+                await send({"type": "error", "seq": seq, "code": error_code})
+                continue
+            _record_ops_counter("search.ws.queries")
+            # A rejected query must not cancel the answer still in flight.
+            retry_after = _hit_channel_rate_limit(_NAME_SEARCH_WS_QUERY_LIMIT, "search-by-name-ws", client_key)
+            if retry_after is not None:
+                _record_ops_counter("search.ws.rate_limited")
+                await send({"type": "error", "seq": seq, "code": "rate_limited", "retry_after": retry_after})
+                continue
+            if in_flight is not None and not in_flight.done():
+                in_flight.cancel()
+                _record_ops_counter("search.ws.superseded")
+            in_flight = asyncio.create_task(
+                _answer_name_search_channel_query(send, query, seq, client_key)
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if in_flight is not None:
+            in_flight.cancel()
+
+
+def _extract_text_mentions(text: str) -> Dict[str, Any]:
+    index = _get_name_resolution_index()
+    mentions = extract_mentions(text, _get_mention_automaton(index), _normalize_valid_lookup_cas)
+    results: Dict[str, Dict[str, Any]] = {}
+    for mention in mentions:
+        result = results.get(mention.cas_number)
+        if result is None:
+            names = index.names_by_cas.get(mention.cas_number, {})
+            result = results[mention.cas_number] = {
+                "cas_number": mention.cas_number,
+                "name_en": names.get("name_en") or CAS_TO_EN.get(mention.cas_number) or "",
+                "name_zh": names.get("name_zh") or CAS_TO_ZH.get(mention.cas_number) or "",
+                "count": 0,
+                "spans": [],
+            }
+        result["count"] += 1
+        if len(result["spans"]) < MAX_MENTION_SPANS_PER_CAS:
+            result["spans"].append({
+                "start": mention.start,
+                "end": mention.end,
+                "text": text[mention.start:mention.end],
+                "kind": mention.kind,
+            })
+    return {
+        "results": list(results.values()),
+        "cas_numbers": list(results),
+        "mention_count": len(mentions),
+        "text_length": len(text),
+    }
+
+
+@api_router.post("/extract-mentions")
+@limiter.limit("10/minute")
+async def extract_mentions_from_text(request: Request, payload: MentionExtractionRequest):
+    """Find every dictionary name, approved alias and valid CAS number in free text.
+
+    Results are de-duplicated by CAS in order of first mention; ``cas_numbers``
+    can be sent to ``/api/search`` in chunks of 100. Span offsets are code
+    point indices into ``text`` (at most 50 spans are returned per CAS).
+    """
+    _record_ops_counter("dictionary.mention_extraction.requests")
+    return await asyncio.to_thread(_extract_text_mentions, payload.text)
+
+
 async def _search_single_query(query: str) -> ChemicalResult:
     query = (query or "").strip()
     if not query:
@@ -2290,7 +3470,8 @@ async def search_single_chemical_query(
     request: Request,
     q: str = Query(..., max_length=MAX_PUBLIC_SEARCH_QUERY_LENGTH),
 ):
-    return await _search_single_query(q)
+    result = await _search_single_query(q)
+    return _chemical_result_response(request, result)
 
 
 @api_router.get("/search/{cas_number}", response_model=ChemicalResult)
@@ -2301,7 +3482,8 @@ async def search_single_chemical(
 ):
     """Search by CAS number or chemical name.
     Auto-detects whether input is a CAS number or name."""
-    return await _search_single_query(cas_number)
+    result = await _search_single_query(cas_number)
+    return _chemical_result_response(request, result)
 
 
 @api_router.get("/agent/label-summary", response_model=AgentLabelSummaryV0)
@@ -2312,16 +3494,164 @@ async def agent_label_summary(
 ):
     """Return a read-only structured lookup summary for agents and scripts."""
     result = await _search_single_query(q)
-    return build_agent_label_summary_v0(result)
+    return _conditional_json_response(
+        request,
+        build_agent_label_summary_v0(result).model_dump_json().encode("utf-8"),
+        cache_control=_lookup_cache_control(result),
+    )
+
 
+def _plan_agent_summary_lookups(
+    queries: List[str],
+) -> tuple[Dict[str, List[int]], Dict[int, Dict[str, str]]]:
+    """Resolve a mixed CAS/name batch against one name index snapshot.
 
-def _pdf_service_unavailable(code: str, message: str) -> HTTPException:
+    Returns the rows grouped by the CAS each one looks up, and per-row
+    errors for queries that cannot be looked up at all.
+    """
+    index = _get_name_resolution_index()
+    groups: Dict[str, List[int]] = {}
+    errors: Dict[int, Dict[str, str]] = {}
+    for row, raw_query in enumerate(queries):
+        query = raw_query.strip()
+        if not query:
+            errors[row] = {"code": "query_required", "message": "Query is required."}
+            continue
+        if re.match(r'^[\d-]+$', query):
+            groups.setdefault(_batch_lookup_key(query), []).append(row)
+            continue
+        resolved_cas = resolve_name_to_cas(query, index)
+        if resolved_cas:
+            groups.setdefault(resolved_cas, []).append(row)
+            continue
+        _record_dictionary_miss(query, "name", "agent_label_summary_batch")
+        errors[row] = {
+            "code": "name_not_resolved",
+            "message": f"No chemical found for name: {query}",
+        }
+    _record_ops_counter("agent.summary_batch.rows", len(queries))
+    _record_ops_counter("agent.summary_batch.lookups", len(groups))
+    return groups, errors
+
+
+@api_router.post("/agent/label-summary/batch")
+@limiter.limit("10/minute")
+async def agent_label_summary_batch(request: Request, payload: AgentLabelSummaryBatchRequest):
+    """Stream ``AgentLabelSummaryV0`` records for many CAS numbers or names.
+
+    Names are resolved against one index snapshot, rows naming the same CAS
+    share one lookup, and at most ``AGENT_SUMMARY_BATCH_CONCURRENCY`` lookups
+    run at once. Emits NDJSON in completion order:
+    ``{"type": "summary", "index", "query", "summary"}`` per looked-up row,
+    ``{"type": "error", "index", "query", "error"}`` per row that could not be
+    looked up, then one ``{"type": "manifest"}`` record.
+    """
+    http_client = shared_http_client
+    queries = list(payload.queries)
+    groups, errors = _plan_agent_summary_lookups(queries)
+    semaphore = asyncio.Semaphore(AGENT_SUMMARY_BATCH_CONCURRENCY)
+
+    async def lookup(cas_number: str, rows: List[int]) -> tuple[List[int], ChemicalResult]:
+        async with semaphore:
+            return rows, await bounded_search_chemical(cas_number, http_client)
+
+    async def records():
+        started = time.perf_counter()
+        counts = {"found": 0, "not_found": 0, "upstream_error": 0}
+        for row, error in errors.items():
+            yield _format_stream_record(
+                {"type": "error", "index": row, "query": queries[row], "error": error},
+                sse=False,
+            )
+        tasks = [
+            asyncio.create_task(lookup(cas_number, rows))
+            for cas_number, rows in groups.items()
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                rows, lookup_result = await next_result
+                for row in rows:
+                    query = queries[row].strip()
+                    is_cas_query = re.match(r'^[\d-]+$', query) is not None
+                    result = _batch_row_result(
+                        lookup_result,
+                        query if is_cas_query else lookup_result.cas_number,
+                    )
+                    if is_cas_query and not result.found and not result.upstream_error:
+                        _record_dictionary_miss(
+                            query,
+                            "cas",
+                            "agent_label_summary_batch",
+                            context={"normalizedCas": normalize_cas(query)},
+                        )
+                    if result.upstream_error:
+                        counts["upstream_error"] += 1
+                    elif result.found:
+                        counts["found"] += 1
+                    else:
+                        counts["not_found"] += 1
+                    yield _format_stream_record(
+                        {
+                            "type": "summary",
+                            "index": row,
+                            "query": queries[row],
+                            "summary": build_agent_label_summary_v0(result).model_dump(mode="json"),
+                        },
+                        sse=False,
+                    )
+            yield _format_stream_record(
+                {
+                    "type": "manifest",
+                    "schema_version": AGENT_LABEL_SUMMARY_SCHEMA_VERSION,
+                    "total": len(queries),
+                    "summaries": len(queries) - len(errors),
+                    "errors": len(errors),
+                    "unique_lookups": len(groups),
+                    **counts,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000),
+                },
+                sse=False,
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        records(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+def _pdf_render_stats() -> Dict[str, Any]:
+    renderer = pdf_renderer
+    stats = (
+        renderer.stats()
+        if renderer is not None and hasattr(renderer, "stats")
+        else {"available": False}
+    )
+    if native_label_renderer is not None:
+        stats = {**stats, "nativeLabels": native_label_renderer.stats()}
+    return stats
+
+
+def _pdf_service_unavailable(
+    code: str,
+    message: str,
+    *,
+    retry_after_seconds: Optional[int] = None,
+) -> HTTPException:
     return HTTPException(
         status_code=503,
         detail={
             "code": code,
             "message": message,
         },
+        headers=(
+            {"Retry-After": str(retry_after_seconds)}
+            if retry_after_seconds is not None
+            else None
+        ),
     )
 
 
@@ -2329,30 +3659,149 @@ def _pdf_service_unavailable(code: str, message: str) -> HTTPException:
 @limiter.limit("10/minute")
 async def print_pdf(request: Request, payload: PrintPdfRequest):
     """Render a self-contained label print document to PDF."""
+    return await _browser_label_pdf_response(payload)
+
+
+@api_router.post("/print/labels/pdf")
+@limiter.limit("10/minute")
+async def print_label_document(request: Request, payload: LabelDocumentRequest):
+    """Build a label sheet from CAS numbers server-side and render it to PDF.
+
+    Labels are built from the same lookups as ``/search`` (cached results
+    first), so the client uploads a few KB of options instead of markup.
+    Every CAS must resolve: a sheet with silently missing labels is worse
+    than an error the client can show.
+    """
+    native = await _native_label_renderer_for_request()
+    if native is None and pdf_renderer is None:
+        raise _pdf_service_unavailable(
+            "pdf_renderer_unavailable",
+            "PDF renderer is unavailable",
+        )
+    raw_by_key: Dict[str, str] = {}
+    for raw_query in payload.cas_numbers:
+        raw_by_key.setdefault(_batch_lookup_key(raw_query), raw_query)
+    lookups = await asyncio.gather(*(
+        bounded_search_chemical(raw_query, shared_http_client)
+        for raw_query in raw_by_key.values()
+    ))
+    result_by_key = dict(zip(raw_by_key, lookups))
+    if any(result.upstream_error for result in lookups):
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "code": "label_lookup_unavailable",
+                "message": "Chemical data is temporarily unavailable; retry shortly",
+            },
+        )
+    unresolved = [
+        raw_query
+        for raw_query in payload.cas_numbers
+        if not result_by_key[_batch_lookup_key(raw_query)].found
+    ]
+    if unresolved:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "code": "label_cas_unresolved",
+                "message": "Some CAS numbers have no chemical record",
+                "cas_numbers": unresolved,
+            },
+        )
+    rows = [
+        result_by_key[_batch_lookup_key(raw_query)].model_dump()
+        for raw_query in payload.cas_numbers
+        for _ in range(payload.copies)
+    ]
+    sheet = build_label_sheet(
+        rows,
+        template=payload.template,
+        label_size=payload.label_size,
+        page_size=payload.page_size,
+        orientation=payload.orientation,
+        columns=payload.columns,
+        rows=payload.rows,
+        margin_mm=payload.margin_mm,
+        locale=payload.locale,
+    )
+    _record_ops_counter("print.labels.documents")
+    _record_ops_counter("print.labels.labels", len(rows))
+    if native is not None:
+        _record_ops_counter("print.labels.native")
+        return await _render_label_pdf_response(
+            lambda: native.render(sheet),
+            sheet.meta,
+            renderer_name="native",
+        )
+    return await _browser_label_pdf_response(label_sheet_document(sheet))
+
+
+async def _native_label_renderer_for_request() -> Optional[NativeLabelPdfRenderer]:
+    native = native_label_renderer
+    if native is None or not native.available:
+        return None
+    if PDF_NATIVE_LABELS == "prefer":
+        return native
+    renderer = pdf_renderer
+    if renderer is not None and hasattr(renderer, "wait_for_startup"):
+        # Give a browser that is starting (or, when lazy, not yet started)
+        # the same bounded wait a print request gets before falling back.
+        browser_available = await renderer.wait_for_startup()
+    else:
+        browser_available = bool(renderer and getattr(renderer, "available", False))
+    return None if browser_available else native
+
+
+async def _browser_label_pdf_response(payload: PrintPdfRequest) -> Response:
     renderer = pdf_renderer
     if renderer is None:
         raise _pdf_service_unavailable(
             "pdf_renderer_unavailable",
             "PDF renderer is unavailable",
         )
+    return await _render_label_pdf_response(
+        lambda: renderer.render(payload),
+        payload.meta,
+        renderer_name="browser",
+        html_bytes=len(payload.html.encode("utf-8")),
+    )
+
+
+async def _render_label_pdf_response(
+    render: Callable[[], Awaitable[bytes]],
+    meta: PrintPdfMeta,
+    *,
+    renderer_name: str,
+    html_bytes: Optional[int] = None,
+) -> Response:
     started_at = time.monotonic()
     try:
-        pdf_bytes = await renderer.render(payload)
+        with pdf_output_sizes() as sizes:
+            pdf_bytes = await render()
     except PdfRenderUnavailableError as exc:
         raise _pdf_service_unavailable(exc.code, str(exc)) from exc
     except PdfRenderBusyError as exc:
-        raise _pdf_service_unavailable(exc.code, str(exc)) from exc
+        _record_ops_counter("pdf.render_busy")
+        raise _pdf_service_unavailable(
+            exc.code,
+            str(exc),
+            retry_after_seconds=exc.retry_after_seconds,
+        ) from exc
     except PdfRenderError as exc:
         raise _pdf_service_unavailable(exc.code, str(exc)) from exc
     elapsed_ms = int((time.monotonic() - started_at) * 1000)
     logger.info(
         "Rendered label PDF",
         extra={
-            "html_bytes": len(payload.html.encode("utf-8")),
+            "renderer": renderer_name,
+            "html_bytes": html_bytes,
+            # Browser output before optimization; None for cache hits and
+            # native sheets, which are not post-processed.
+            "pdf_bytes_raw": sizes["rawBytes"] or None,
             "pdf_bytes": len(pdf_bytes),
             "elapsed_ms": elapsed_ms,
-            "label_purpose": payload.meta.label_purpose,
-            "page_count_expected": payload.meta.page_count_expected,
+            "label_purpose": meta.label_purpose,
+            "page_count_expected": meta.page_count_expected,
         },
     )
     filename = f"ghs-labels-{datetime.now(timezone.utc).date().isoformat()}.pdf"
@@ -2366,10 +3815,15 @@ async def print_pdf(request: Request, payload: PrintPdfRequest):
     )
 
 
-@api_router.post("/export/xlsx")
-@limiter.limit("10/minute")
-async def export_xlsx(request: Request, payload: ExportRequest):
-    """Export results to an XLSX workbook with lab-manager triage sheets."""
+def _build_xlsx_export(
+    results: List[Dict[str, Any]],
+    *,
+    export_scope: str,
+    export_scope_label: str,
+    export_count: Optional[int],
+    source_total_count: Optional[int],
+    visible_count: Optional[int],
+) -> BytesIO:
     wb = Workbook()
     ws = wb.active
     thin_border = Border(
@@ -2384,53 +3838,38 @@ async def export_xlsx(request: Request, payload: ExportRequest):
     add_export_results_sheet(
         wb,
         "GHS Results",
-        payload.results,
+        results,
         thin_border,
         worksheet=ws,
     )
-    for sheet_name, rows in build_export_triage_sheets(payload.results).items():
+    for sheet_name, rows in build_export_triage_sheets(results).items():
         add_export_results_sheet(wb, sheet_name, rows, thin_border)
 
     _add_export_pilot_summary_sheet(
         wb,
-        payload.results,
+        results,
         thin_border,
-        export_scope=payload.export_scope,
-        export_scope_label=payload.export_scope_label,
-        export_count=payload.export_count,
-        source_total_count=payload.source_total_count,
-        visible_count=payload.visible_count,
+        export_scope=export_scope,
+        export_scope_label=export_scope_label,
+        export_count=export_count,
+        source_total_count=source_total_count,
+        visible_count=visible_count,
     )
 
     output = BytesIO()
     wb.save(output)
     output.seek(0)
+    return output
 
-    safe_scope = re.sub(
-        r"[^a-zA-Z0-9_-]+",
-        "-",
-        payload.export_scope or "visible",
-    ).strip("-")
-    safe_scope = safe_scope or "visible"
-    filename = f"ghs_batch_{safe_scope}_{len(payload.results)}.xlsx"
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
 
-
-@api_router.post("/export/csv")
-@limiter.limit("10/minute")
-async def export_csv(request: Request, payload: ExportRequest):
-    """Export results to CSV with the same readable data columns as XLSX."""
+def _build_csv_export(results: List[Dict[str, Any]]) -> BytesIO:
     from io import StringIO
 
     string_output = StringIO()
     writer = csv.writer(string_output)
     writer.writerow(EXPORT_DATA_HEADERS)
 
-    for result in payload.results:
+    for result in results:
         writer.writerow(
             [spreadsheet_safe(value) for value in build_export_data_row(result)]
         )
@@ -2440,24 +3879,78 @@ async def export_csv(request: Request, payload: ExportRequest):
     output.write(bytes([0xEF, 0xBB, 0xBF]))
     output.write(csv_content.encode("utf-8"))
     output.seek(0)
+    return output
 
+
+_EXPORT_MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_response(output: BytesIO, *, fmt: str, scope: str, count: int) -> StreamingResponse:
     safe_scope = re.sub(
         r"[^a-zA-Z0-9_-]+",
         "-",
-        payload.export_scope or "visible",
+        scope or "visible",
     ).strip("-")
     safe_scope = safe_scope or "visible"
-    filename = f"ghs_batch_{safe_scope}_{len(payload.results)}.csv"
+    filename = f"ghs_batch_{safe_scope}_{count}.{fmt}"
     return StreamingResponse(
         output,
-        media_type="text/csv; charset=utf-8",
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
+
+@api_router.post("/export/xlsx")
+@limiter.limit("10/minute")
+async def export_xlsx(request: Request, payload: ExportRequest):
+    """Export results to an XLSX workbook with lab-manager triage sheets."""
+    output = _build_xlsx_export(
+        payload.results,
+        export_scope=payload.export_scope,
+        export_scope_label=payload.export_scope_label,
+        export_count=payload.export_count,
+        source_total_count=payload.source_total_count,
+        visible_count=payload.visible_count,
+    )
+    return _export_response(
+        output,
+        fmt="xlsx",
+        scope=payload.export_scope,
+        count=len(payload.results),
+    )
+
+
+@api_router.post("/export/csv")
+@limiter.limit("10/minute")
+async def export_csv(request: Request, payload: ExportRequest):
+    """Export results to CSV with the same readable data columns as XLSX."""
+    return _export_response(
+        _build_csv_export(payload.results),
+        fmt="csv",
+        scope=payload.export_scope,
+        count=len(payload.results),
+    )
+
+_GHS_PICTOGRAMS_BODY = json.dumps(
+    GHS_PICTOGRAMS,
+    ensure_ascii=False,
+    separators=(",", ":"),
+).encode("utf-8")
+_GHS_PICTOGRAMS_ETAG = _content_etag(_GHS_PICTOGRAMS_BODY)
+
+
 @api_router.get("/ghs-pictograms")
-async def get_ghs_pictograms():
+async def get_ghs_pictograms(request: Request):
     """Get all GHS pictogram information"""
-    return GHS_PICTOGRAMS
+    return _conditional_json_response(
+        request,
+        _GHS_PICTOGRAMS_BODY,
+        cache_control=STATIC_REFERENCE_CACHE_CONTROL,
+        etag=_GHS_PICTOGRAMS_ETAG,
+    )
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -332,3 +332,69 @@ def test_agent_label_summary_endpoint_is_visible_in_openapi():
     assert "authority_boundary" in model_schema["properties"]
     assert "qr_target" in model_schema["properties"]
     assert "candidate" not in model_schema["properties"]
+
+
+async def test_agent_label_summary_batch_streams_deduped_summaries_and_manifest(monkeypatch):
+    calls = []
+
+    async def fake_search_chemical(cas_number, _http_client):
+        calls.append(cas_number)
+        if cas_number == "7732-18-5":
+            return ChemicalResult(cas_number=cas_number, upstream_error=True)
+        return ChemicalResult(cas_number=cas_number, found=True, name_en="Ethanol")
+
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "_record_dictionary_miss", lambda *args, **kwargs: None)
+
+    queries = ["64-17-5", "ethanol", "64175", "7732-18-5", "  ", "qqqq-not-a-chemical"]
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/agent/label-summary/batch", json={"queries": queries})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert records[-1]["type"] == "manifest"
+    assert {key: records[-1][key] for key in (
+        "schema_version", "total", "summaries", "errors", "unique_lookups", "found", "upstream_error",
+    )} == {
+        "schema_version": "agent_label_summary.v0",
+        "total": 6,
+        "summaries": 4,
+        "errors": 2,
+        "unique_lookups": 2,
+        "found": 3,
+        "upstream_error": 1,
+    }
+    assert sorted(calls) == ["64-17-5", "7732-18-5"]
+
+    by_index = {record["index"]: record for record in records[:-1]}
+    assert sorted(by_index) == list(range(6))
+    assert by_index[1]["summary"]["cas_number"] == "64-17-5"
+    assert by_index[2]["summary"]["cas_number"] == "64175"
+    assert by_index[3]["summary"]["upstream"]["upstream_error"] is True
+    assert by_index[4]["error"]["code"] == "query_required"
+    assert by_index[5]["error"]["code"] == "name_not_resolved"
+    AgentLabelSummaryV0.model_validate(by_index[0]["summary"])
+
+
+async def test_agent_label_summary_batch_bounds_concurrent_lookups(monkeypatch):
+    in_flight = {"now": 0, "peak": 0}
+
+    async def slow_search_chemical(cas_number, _http_client):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await server.asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return ChemicalResult(cas_number=cas_number, found=True)
+
+    monkeypatch.setattr(server, "search_chemical", slow_search_chemical)
+    monkeypatch.setattr(server, "AGENT_SUMMARY_BATCH_CONCURRENCY", 3)
+
+    queries = [f"{first}-00-0" for first in range(50, 62)]
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/agent/label-summary/batch", json={"queries": queries})
+
+    assert json.loads(response.text.splitlines()[-1])["summaries"] == 12
+    assert in_flight["peak"] == 3
@@ -0,0 +1,226 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import server
+from api_validation import MAX_BATCH_JOB_ROWS
+from batch_jobs import BatchSearchJobRunner
+from pilot_store import BatchSearchJobLimitError, PilotStore
+from resource_limits import get_public_json_body_limit
+
+
+def _fake_lookup(calls):
+    async def fake_search_chemical(cas_number, _http_client):
+        calls.append(cas_number)
+        if cas_number == "upstream":
+            return server.ChemicalResult(cas_number=cas_number, upstream_error=True)
+        if cas_number == "missing":
+            return server.ChemicalResult(cas_number=cas_number, found=False)
+        return server.ChemicalResult(cas_number=cas_number, found=True, name_en=f"Name {cas_number}")
+
+    return fake_search_chemical
+
+
+@pytest.fixture
+def job_store(tmp_path, monkeypatch):
+    store = PilotStore(str(tmp_path / "jobs.db")).connect()
+    monkeypatch.setattr(server, "pilot_store", store)
+    monkeypatch.setattr(server, "_record_dictionary_miss", lambda *args, **kwargs: None)
+    yield store
+    store.close()
+
+
+async def test_job_dedupes_lookups_pages_rows_and_exports(job_store, monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, "search_chemical", _fake_lookup(calls))
+    runner = server.batch_search_job_runner
+    await runner.startup()
+    try:
+        transport = ASGITransport(app=server.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/search/jobs",
+                json={"cas_numbers": ["64-17-5", "missing", "64-17-5", "upstream", " 64-17-5 "]},
+            )
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] == "queued"
+            assert (job["total"], job["unique_lookups"]) == (5, 3)
+
+            await runner.join()
+            assert sorted(calls) == ["64-17-5", "missing", "upstream"]
+
+            status = (await ac.get(f"/api/search/jobs/{job['job_id']}")).json()
+            assert status["status"] == "completed"
+            assert (status["found"], status["not_found"], status["upstream_error"]) == (3, 1, 1)
+
+            page = (await ac.get(
+                f"/api/search/jobs/{job['job_id']}/results",
+                params={"offset": 1, "limit": 3},
+            )).json()
+            assert [row["index"] for row in page["results"]] == [1, 2, 3]
+            assert page["results"][1]["result"]["name_en"] == "Name 64-17-5"
+            assert page["next_offset"] == 4
+
+            events = await ac.get(f"/api/search/jobs/{job['job_id']}/events")
+            records = [json.loads(line) for line in events.text.splitlines()]
+            assert [record["type"] for record in records] == ["completed"]
+
+            exported = await ac.get(f"/api/search/jobs/{job['job_id']}/export/csv")
+            assert exported.status_code == 200
+            rows = list(csv.reader(io.StringIO(exported.content.decode("utf-8-sig"))))
+            assert len(rows) == 6
+            xlsx = await ac.get(f"/api/search/jobs/{job['job_id']}/export/xlsx")
+            assert xlsx.status_code == 200
+            assert xlsx.content[:2] == b"PK"
+
+            assert (await ac.get("/api/search/jobs/unknown")).status_code == 404
+    finally:
+        await runner.shutdown()
+
+
+async def test_runner_resumes_only_lookups_without_results(tmp_path):
+    store = PilotStore(str(tmp_path / "resume.db")).connect()
+    try:
+        job = store.create_batch_search_job(
+            [("64-17-5", "64-17-5"), ("7732-18-5", "7732-18-5"), ("67-64-1", "67-64-1")]
+        )
+        store.record_batch_search_job_result(
+            job["job_id"], "64-17-5", {"cas_number": "64-17-5", "found": True}
+        )
+        assert store.get_batch_search_job(job["job_id"])["status"] == "running"
+
+        looked_up = []
+
+        async def lookup(query):
+            looked_up.append(query)
+            return {"cas_number": query, "found": query != "67-64-1"}
+
+        runner = BatchSearchJobRunner(get_store=lambda: store, lookup=lookup, lookup_key=str)
+        assert await runner.startup() == 1
+        await runner.join()
+        await runner.shutdown()
+
+        assert sorted(looked_up) == ["67-64-1", "7732-18-5"]
+        finished = store.get_batch_search_job(job["job_id"])
+        assert finished["status"] == "completed"
+        assert (finished["found"], finished["not_found"]) == (2, 1)
+        assert store.list_active_batch_search_job_ids() == []
+    finally:
+        store.close()
+
+
+async def test_runner_reports_failed_lookups_as_upstream_errors(tmp_path):
+    store = PilotStore(str(tmp_path / "failing.db")).connect()
+    try:
+        async def lookup(query):
+            raise RuntimeError("boom")
+
+        runner = BatchSearchJobRunner(get_store=lambda: store, lookup=lookup, lookup_key=str)
+        await runner.startup()
+        job = runner.submit(["64-17-5"])
+        await runner.join()
+        await runner.shutdown()
+
+        assert store.get_batch_search_job(job["job_id"])["upstream_error"] == 1
+        [row] = store.list_batch_search_job_rows(job["job_id"])
+        assert row["result"]["upstream_error"] is True
+    finally:
+        store.close()
+
+
+def test_store_caps_active_jobs_and_purges_expired_ones(tmp_path):
+    store = PilotStore(str(tmp_path / "limits.db")).connect()
+    try:
+        first = store.create_batch_search_job([("64-17-5", "64-17-5")], max_active_jobs=1)
+        with pytest.raises(BatchSearchJobLimitError):
+            store.create_batch_search_job([("7732-18-5", "7732-18-5")], max_active_jobs=1)
+
+        later = datetime.now(timezone.utc) + timedelta(hours=5)
+        # Unfinished jobs outlive the retention window so they can resume.
+        assert store.purge_expired_batch_search_jobs(retention_hours=4, now=later) == 0
+        store.record_batch_search_job_result(first["job_id"], "64-17-5", {"cas_number": "64-17-5", "found": True})
+        assert store.purge_expired_batch_search_jobs(retention_hours=6, now=later) == 0
+        assert store.purge_expired_batch_search_jobs(retention_hours=4, now=later) == 1
+        assert store.get_batch_search_job(first["job_id"]) is None
+        assert store.list_batch_search_job_rows(first["job_id"]) == []
+        assert store.list_pending_batch_search_lookups(first["job_id"]) == []
+    finally:
+        store.close()
+
+
+async def test_runner_resumes_unfinished_jobs_older_than_the_retention_window(tmp_path):
+    store = PilotStore(str(tmp_path / "outage.db")).connect()
+    try:
+        job = store.create_batch_search_job([("64-17-5", "64-17-5")])
+        stale = (datetime.now(timezone.utc) - timedelta(hours=5)).isoformat()
+        store._execute("UPDATE batch_search_jobs SET updated_at = ?", (stale,))
+
+        async def lookup(query):
+            return {"cas_number": query, "found": True}
+
+        runner = BatchSearchJobRunner(get_store=lambda: store, lookup=lookup, lookup_key=str, retention_hours=1)
+        assert await runner.startup() == 1
+        await runner.join()
+        await runner.shutdown()
+
+        assert store.get_batch_search_job(job["job_id"])["status"] == "completed"
+    finally:
+        store.close()
+
+
+async def test_runner_purges_expired_jobs_while_running(tmp_path):
+    store = PilotStore(str(tmp_path / "purge.db")).connect()
+    purged = []
+    try:
+        async def lookup(query):
+            return {"cas_number": query, "found": True}
+
+        runner = BatchSearchJobRunner(
+            get_store=lambda: store,
+            lookup=lookup,
+            lookup_key=str,
+            retention_hours=1,
+            purge_interval_seconds=0.01,
+            on_purged=purged.append,
+        )
+        await runner.startup()
+        try:
+            job = runner.submit(["64-17-5"])
+            await runner.join()
+            stale = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+            store._execute("UPDATE batch_search_jobs SET updated_at = ?", (stale,))
+
+            for _ in range(100):
+                if store.get_batch_search_job(job["job_id"]) is None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await runner.shutdown()
+
+        assert store.get_batch_search_job(job["job_id"]) is None
+        assert purged[0] == 0 and 1 in purged
+    finally:
+        store.close()
+
+
+def test_job_routes_admit_inventory_sized_lists_under_their_own_limits():
+    body = json.dumps({"cas_numbers": ["1234567-12-3" + "x" * 52] * MAX_BATCH_JOB_ROWS})
+    assert len(body.encode("utf-8")) <= get_public_json_body_limit("POST", "/api/search/jobs")
+
+    def limits_for(endpoint_name):
+        return [
+            str(limit.limit)
+            for key, route_limits in server.limiter._route_limits.items()
+            if key.endswith(f".{endpoint_name}")
+            for limit in route_limits
+        ]
+
+    assert limits_for("create_batch_search_job") == ["5 per 1 minute"]
+    assert limits_for("get_batch_search_job_results") == ["120 per 1 minute"]
+    assert limits_for("export_batch_search_job") == ["10 per 1 minute"]
@@ -0,0 +1,113 @@
+import json
+import threading
+
+from httpx import ASGITransport, AsyncClient
+
+import server
+from api_validation import MAX_CAS_TRIAGE_ROWS, is_valid_cas
+from cas_triage import triage_cas_tokens, valid_checksums
+from resource_limits import get_public_json_body_limit
+
+
+def test_triage_assigns_one_category_per_row():
+    tokens = [
+        "64-17-5",
+        "７７３２－１８－５",
+        "CAS No. 64-17-5",
+        "64175",
+        "64-17-6",
+        "",
+        "n/a",
+        "67-64-1",
+    ]
+
+    triage = triage_cas_tokens(
+        tokens,
+        known_cas={"64-17-5", "7732-18-5"},
+        cached_cas=lambda cas_numbers: {"67-64-1", "50-00-0"} & cas_numbers,
+    )
+
+    assert [(row["category"], row["reason"]) for row in triage["rows"]] == [
+        ("needs_upstream", None),
+        ("needs_upstream", None),
+        ("duplicate", None),
+        ("duplicate", None),
+        ("invalid", "checksum"),
+        ("invalid", "empty"),
+        ("invalid", "format"),
+        ("cached", None),
+    ]
+    assert [row["duplicate_of"] for row in triage["rows"][2:4]] == [0, 0]
+    assert triage["rows"][1]["cas_number"] == "7732-18-5"
+    assert [row["in_dictionary"] for row in triage["rows"]] == [True, True, True, True, False, False, False, False]
+    assert triage["upstream_cas_numbers"] == ["64-17-5", "7732-18-5"]
+    assert triage["counts"] == {
+        "invalid": 3,
+        "duplicate": 2,
+        "cached": 1,
+        "needs_upstream": 2,
+        "in_dictionary": 4,
+        "total": 8,
+        "unique": 3,
+    }
+
+
+def test_batch_checksum_matches_single_token_validation():
+    candidates = [f"{first}-{middle:02d}-{check}" for first in (50, 64, 7732, 1234567) for middle in (0, 17, 18) for check in range(10)]
+    assert valid_checksums(candidates) == {cas for cas in candidates if is_valid_cas(cas)}
+
+
+async def test_triage_route_uses_local_dictionary_and_ghs_cache_only(monkeypatch):
+    async def no_upstream(*_args, **_kwargs):
+        raise AssertionError("triage must not call PubChem")
+
+    monkeypatch.setattr(server, "search_chemical", no_upstream)
+    monkeypatch.setattr(server, "pubchem_get_json", no_upstream)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+    server.cid_cache["67-64-1"] = 180
+    server.ghs_cache[180] = ({}, "2026-01-01T00:00:00+00:00")
+    try:
+        transport = ASGITransport(app=server.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/search/triage",
+                json={"cas_numbers": ["64-17-5", "67-64-1", "64-17-5", "bad"]},
+            )
+    finally:
+        server.cid_cache.pop("67-64-1", None)
+        server.ghs_cache.pop(180, None)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["category"] for row in body["rows"]] == ["needs_upstream", "cached", "duplicate", "invalid"]
+    assert body["rows"][0]["in_dictionary"] is True
+    assert body["upstream_cas_numbers"] == ["64-17-5"]
+    assert server.ops_counters["triage.rows"] == 4
+
+
+async def test_triage_route_reads_the_ghs_caches_on_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    touched_from = set()
+
+    class RecordingCache(server.TTLCache):
+        def __getitem__(self, key):
+            touched_from.add(threading.get_ident())
+            return super().__getitem__(key)
+
+    cid_cache = RecordingCache(maxsize=10, ttl=60)
+    cid_cache["67-64-1"] = 180
+    monkeypatch.setattr(server, "cid_cache", cid_cache)
+    monkeypatch.setitem(server.ghs_cache, 180, ({}, "2026-01-01T00:00:00+00:00"))
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/search/triage", json={"cas_numbers": ["67-64-1", "64-17-5"]})
+
+    assert response.status_code == 200
+    assert [row["category"] for row in response.json()["rows"]] == ["cached", "needs_upstream"]
+    assert touched_from == {loop_thread}
+
+
+def test_triage_route_admits_inventory_sized_lists():
+    body = json.dumps({"cas_numbers": ["1234567-12-3" + "x" * 52] * MAX_CAS_TRIAGE_ROWS})
+    assert len(body.encode("utf-8")) <= get_public_json_body_limit("POST", "/api/search/triage")
@@ -0,0 +1,104 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import server
+from pilot_store import PilotStore
+
+CID = 702
+GHS_DATA = {
+    "Record": {
+        "RecordTitle": "Ethanol",
+        "Section": [{
+            "TOCHeading": "Safety and Hazards",
+            "Section": [{
+                "TOCHeading": "Hazards Identification",
+                "Section": [{
+                    "TOCHeading": "GHS Classification",
+                    "Information": [
+                        {"Name": "Signal", "Value": {"StringWithMarkup": [{"String": "Danger"}]}},
+                    ],
+                }],
+            }],
+        }],
+    }
+}
+
+
+@pytest.fixture
+def result_cache(tmp_path, monkeypatch):
+    store = PilotStore(str(tmp_path / "results.db")).connect()
+    calls = {"ghs": 0, "extract": 0}
+    real_extract = server.extract_all_ghs_classifications
+
+    async def fake_get_cid_from_cas(_cas, _client):
+        return CID
+
+    async def fake_pubchem_get_json(*_args, **_kwargs):
+        calls["ghs"] += 1
+        return 200, GHS_DATA
+
+    def counting_extract(data):
+        calls["extract"] += 1
+        return real_extract(data)
+
+    monkeypatch.setattr(server, "pilot_store", store)
+    monkeypatch.setattr(server, "get_cid_from_cas", fake_get_cid_from_cas)
+    monkeypatch.setattr(server, "pubchem_get_json", fake_pubchem_get_json)
+    monkeypatch.setattr(server, "extract_all_ghs_classifications", counting_extract)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+    server.ghs_cache.clear()
+    server.chemical_result_cache.clear()
+    yield store, calls
+    server.ghs_cache.clear()
+    server.chemical_result_cache.clear()
+    store.close()
+
+
+async def test_repeat_lookup_is_served_from_result_cache(result_cache):
+    _store, calls = result_cache
+
+    first = await server.search_chemical("64-17-5", http_client=None)
+    parsed_after_first = calls["extract"]
+    second = await server.search_chemical("64-17-5", http_client=None)
+    respelled = await server.search_chemical("64175", http_client=None)
+
+    assert first.found is True and first.cache_hit is False
+    assert second.cache_hit is True
+    assert second.signal_word == first.signal_word == "Danger"
+    assert respelled.cas_number == "64175"
+    assert second.cas_number == "64-17-5"
+    assert calls["ghs"] == 1
+    assert calls["extract"] == parsed_after_first
+    assert server.ops_counters["cache.result.hit"] == 2
+    assert server.ops_counters["cache.ghs.hit"] == 2
+
+
+async def test_dictionary_edit_or_ghs_refresh_invalidates_cached_result(result_cache):
+    store, _calls = result_cache
+
+    before = await server.search_chemical("64-17-5", http_client=None)
+    store.upsert_dictionary_entry("64-17-5", name_en=before.name_en, name_zh="測試乙醇")
+    edited = await server.search_chemical("64-17-5", http_client=None)
+    assert edited.name_zh == "測試乙醇"
+    assert edited is not before
+
+    cached = await server.search_chemical("64-17-5", http_client=None)
+    server.ghs_cache[CID] = (GHS_DATA, "2099-01-01T00:00:00+00:00")
+    refreshed = await server.search_chemical("64-17-5", http_client=None)
+    assert refreshed.retrieved_at == "2099-01-01T00:00:00+00:00"
+    assert cached.retrieved_at != refreshed.retrieved_at
+
+
+async def test_single_search_route_writes_cached_body_verbatim(result_cache):
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/api/search/64-17-5")
+        second = await ac.get("/api/search/64-17-5")
+        respelled = await ac.get("/api/search/64175")
+
+    assert first.json()["cache_hit"] is False
+    body = second.json()
+    assert body == {**first.json(), "cache_hit": True}
+    [entry] = server.chemical_result_cache.values()
+    assert second.content == entry.body
+    assert respelled.json()["cas_number"] == "64175"
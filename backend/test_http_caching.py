@@ -0,0 +1,96 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import server
+from pilot_store import APPROVED_ALIAS_STATUS, PilotStore
+
+
+@pytest.fixture
+def lookup_store(tmp_path, monkeypatch):
+    store = PilotStore(str(tmp_path / "http-cache.db")).connect()
+    monkeypatch.setattr(server, "pilot_store", store)
+    yield store
+    store.close()
+
+
+def _fake_search(monkeypatch, **fields):
+    async def fake_search_chemical(cas_number, _http_client):
+        return server.ChemicalResult(cas_number=cas_number, **fields)
+
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+
+
+async def test_lookup_routes_answer_revalidation_with_304(monkeypatch):
+    _fake_search(monkeypatch, found=True, name_en="Ethanol")
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for path, params in (
+            ("/api/search/64-17-5", None),
+            ("/api/search-single", {"q": "64-17-5"}),
+            ("/api/agent/label-summary", {"q": "64-17-5"}),
+        ):
+            first = await ac.get(path, params=params)
+            etag = first.headers["etag"]
+            assert etag.startswith('"')
+            assert first.headers["cache-control"] == server.LOOKUP_FOUND_CACHE_CONTROL
+
+            revalidated = await ac.get(path, params=params, headers={"if-none-match": etag})
+            assert revalidated.status_code == 304
+            assert revalidated.content == b""
+            assert revalidated.headers["etag"] == etag
+
+            weak = await ac.get(
+                path,
+                params=params,
+                headers={"if-none-match": f'"other", W/{etag}'},
+            )
+            assert weak.status_code == 304
+
+            stale = await ac.get(path, params=params, headers={"if-none-match": '"other"'})
+            assert stale.status_code == 200
+            assert stale.json() == first.json()
+
+
+async def test_upstream_errors_are_never_cached(monkeypatch):
+    _fake_search(monkeypatch, found=False, upstream_error=True)
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/search/64-17-5", headers={"if-none-match": "*"})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+async def test_name_search_etag_changes_when_dictionary_changes(lookup_store):
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        before = await ac.get("/api/search-by-name/zz-solvent")
+        assert before.headers["cache-control"] == server.NAME_SEARCH_CACHE_CONTROL
+        etag = before.headers["etag"]
+
+        lookup_store.upsert_alias("zz-solvent", "en", "64-17-5", status=APPROVED_ALIAS_STATUS)
+        after = await ac.get("/api/search-by-name/zz-solvent", headers={"if-none-match": etag})
+
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert after.json()["results"][0]["cas_number"] == "64-17-5"
+
+
+async def test_pictograms_are_immutable_and_compressed_bodies_carry_weak_etags():
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        plain = await ac.get("/api/ghs-pictograms", headers={"accept-encoding": "identity"})
+        compressed = await ac.get("/api/ghs-pictograms", headers={"accept-encoding": "gzip"})
+        revalidated = await ac.get(
+            "/api/ghs-pictograms",
+            headers={"accept-encoding": "gzip", "if-none-match": compressed.headers["etag"]},
+        )
+
+    assert plain.headers["cache-control"] == "public, max-age=86400, immutable"
+    assert plain.json()["GHS02"]["name"] == "Flammable"
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == f"W/{plain.headers['etag']}"
+    assert revalidated.status_code == 304
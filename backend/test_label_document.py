@@ -0,0 +1,133 @@
+import json
+from pathlib import Path
+
+from starlette.testclient import TestClient
+
+import server
+from api_models import LabelDocumentRequest
+from label_document import PICTOGRAM_CODES, PICTOGRAM_DIR, build_label_document
+from pdf_render import PrintPdfRequest, split_print_document
+from resource_limits import get_public_json_body_limit
+
+FRONTEND_PICTOGRAM_DIR = Path(__file__).resolve().parents[1] / "frontend" / "src" / "assets" / "ghs"
+
+ETHANOL = {
+    "cas_number": "64-17-5",
+    "name_en": "Ethanol",
+    "name_zh": "乙醇",
+    "found": True,
+    "signal_word": "Danger",
+    "signal_word_zh": "危險",
+    "ghs_pictograms": [{"code": "GHS02", "name": "Flammable"}, {"code": "GHS07", "name": "Irritant"}],
+    "hazard_statements": [
+        {"code": "H225", "text_en": "Highly flammable liquid and vapour", "text_zh": "高度易燃液體和蒸氣"},
+        {"code": "H319", "text_en": "Causes serious eye irritation", "text_zh": "造成嚴重眼睛刺激"},
+        {"code": "H336", "text_en": "May cause drowsiness or dizziness", "text_zh": "可能造成困倦或暈眩"},
+    ],
+    "precautionary_statements": [{"code": "P210", "text_en": "Keep away from heat.", "text_zh": "遠離熱源。"}],
+}
+
+
+def test_backend_pictograms_mirror_the_frontend_assets():
+    for code in PICTOGRAM_CODES:
+        assert (PICTOGRAM_DIR / f"{code}.svg").read_bytes() == (FRONTEND_PICTOGRAM_DIR / f"{code}.svg").read_bytes()
+
+
+def test_document_embeds_each_used_pictogram_once_and_paginates():
+    results = [ETHANOL] * 9 + [{**ETHANOL, "cas_number": "7732-18-5", "ghs_pictograms": []}]
+
+    document = build_label_document(results, columns=2, rows=2)
+
+    assert document.meta.page_count_expected == 3
+    assert (document.page.width_mm, document.page.height_mm) == (210, 297)
+    assert document.html.count('<div class="page">') == 3
+    assert document.html.count("data:image/svg+xml;base64,") == 2
+    assert document.html.count('class="ghs-pic ghs-GHS02"') == 9
+    assert "第 3 / 3 頁" in document.html
+    assert "高度易燃液體和蒸氣" in document.html
+    assert "可能造成困倦或暈眩" not in document.html
+    assert "另有 1 項，請參閱 SDS" in document.html
+    assert [chunk.meta.page_count_expected for chunk in split_print_document(document, 2)] == [2, 1]
+
+
+def test_document_escapes_chemical_text_and_passes_the_markup_contract():
+    hostile = {
+        **ETHANOL,
+        "name_en": '<script>alert(1)</script>',
+        "name_zh": None,
+        "hazard_statements": [{"code": "H225", "text_en": '<img src=x onerror="x">'}],
+    }
+
+    document = build_label_document([hostile], template="full", locale="en")
+
+    assert "<script>" not in document.html
+    assert "&lt;script&gt;" in document.html
+    assert "&lt;img src=x onerror=&quot;x&quot;&gt;" in document.html
+    PrintPdfRequest.model_validate(document.model_dump())
+
+
+class RecordingRenderer:
+    available = True
+
+    def __init__(self):
+        self.requests = []
+
+    async def render(self, request):
+        self.requests.append(request)
+        return b"%PDF-LABELS"
+
+
+def test_label_document_endpoint_builds_and_renders_from_lookups(monkeypatch):
+    lookups = []
+
+    async def fake_search_chemical(cas_number, _http_client):
+        lookups.append(cas_number)
+        return server.ChemicalResult(**ETHANOL)
+
+    renderer = RecordingRenderer()
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "pdf_renderer", renderer)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+    server.limiter.reset()
+
+    response = TestClient(server.app).post(
+        "/api/print/labels/pdf",
+        json={"cas_numbers": ["64-17-5", "64175"], "copies": 3, "columns": 2, "rows": 2, "locale": "en"},
+    )
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF-LABELS"
+    assert response.headers["content-type"] == "application/pdf"
+    assert lookups == ["64-17-5"]
+    [document] = renderer.requests
+    assert document.meta.page_count_expected == 2
+    assert document.html.count('<section class="label">') == 6
+    assert "Ethanol" in document.html
+    assert server.ops_counters["print.labels.labels"] == 6
+
+
+def test_label_document_endpoint_refuses_partial_sheets(monkeypatch):
+    async def fake_search_chemical(cas_number, _http_client):
+        return server.ChemicalResult(cas_number=cas_number, found=cas_number == "64-17-5")
+
+    renderer = RecordingRenderer()
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "pdf_renderer", renderer)
+    server.limiter.reset()
+
+    response = TestClient(server.app).post(
+        "/api/print/labels/pdf",
+        json={"cas_numbers": ["64-17-5", "50-00-0"]},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["code"] == "label_cas_unresolved"
+    assert response.json()["detail"]["cas_numbers"] == ["50-00-0"]
+    assert renderer.requests == []
+
+
+def test_label_document_request_is_a_few_kilobytes():
+    body = json.dumps(
+        LabelDocumentRequest(cas_numbers=["1234567-12-3" + "x" * 52] * 200, columns=1, rows=1).model_dump()
+    )
+    assert len(body.encode("utf-8")) <= get_public_json_body_limit("POST", "/api/print/labels/pdf") <= 32 * 1024
@@ -0,0 +1,137 @@
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+import server
+from api_validation import MAX_MENTION_TEXT_CHARS
+from mention_extraction import (
+    MentionAutomaton,
+    build_mention_automaton,
+    extract_mentions,
+    fold_mention_text,
+)
+from pilot_store import APPROVED_ALIAS_STATUS, PilotStore
+from resource_limits import get_public_json_body_limit
+
+
+def _spans(text, mentions):
+    return [(text[m.start:m.end], m.cas_number, m.kind) for m in mentions]
+
+
+def test_automaton_reports_leftmost_longest_matches_on_word_boundaries():
+    automaton = MentionAutomaton({
+        "ethanol": "64-17-5",
+        "methanol": "67-56-1",
+        "sodium": "7440-23-5",
+        "sodium hydroxide": "1310-73-2",
+        "甲苯": "108-88-3",
+        "二甲苯": "1330-20-7",
+    })
+    text = "Methanol, ethanolamine and Sodium  Hydroxide; 二甲苯與甲苯"
+
+    assert _spans(text, automaton.find(text)) == [
+        ("Methanol", "67-56-1", "name"),
+        ("Sodium", "7440-23-5", "name"),
+        ("二甲苯", "1330-20-7", "name"),
+        ("甲苯", "108-88-3", "name"),
+    ]
+    spaced = "sodium hydroxide\nsodium\thydroxide"
+    assert _spans(spaced, automaton.find(spaced)) == [
+        ("sodium hydroxide", "1310-73-2", "name"),
+        ("sodium\thydroxide", "1310-73-2", "name"),
+    ]
+
+
+def test_fold_keeps_offsets_for_characters_that_expand_when_lowercased():
+    text = "İ Ethanol"
+    assert len(fold_mention_text(text)) == len(text)
+    automaton = MentionAutomaton({"ethanol": "64-17-5"})
+    assert _spans(text, automaton.find(text)) == [("Ethanol", "64-17-5", "name")]
+
+
+def test_extract_mentions_validates_cas_checksums_and_prefers_cas_spans():
+    automaton = build_mention_automaton(
+        [
+            ("en", {"ethanol": "64-17-5", "ab": "64-17-5", "bad seed": "64-17-6"}),
+            ("zh", {"水": "7732-18-5"}),
+        ],
+        server._normalize_valid_lookup_cas,
+    )
+    text = "Ethanol 64-17-5, not 64-17-6 or 1-64-17-5; 水 ab bad seed"
+
+    assert automaton.pattern_count == 1
+    assert _spans(text, extract_mentions(text, automaton, server._normalize_valid_lookup_cas)) == [
+        ("Ethanol", "64-17-5", "name"),
+        ("64-17-5", "64-17-5", "cas"),
+    ]
+
+
+def test_parenthesized_synonyms_become_keys_only_when_unambiguous():
+    automaton = build_mention_automaton(
+        [("en", {
+            "methyl alcohol (methanol)": "67-56-1",
+            "acetic acid (glacial)": "64-19-7",
+            "acetic anhydride (glacial)": "108-24-7",
+        })],
+        server._normalize_valid_lookup_cas,
+    )
+    text = "Methanol and methyl alcohol, glacial acetic acid"
+
+    assert _spans(text, automaton.find(text)) == [
+        ("Methanol", "67-56-1", "name"),
+        ("methyl alcohol", "67-56-1", "name"),
+        ("acetic acid", "64-19-7", "name"),
+    ]
+
+
+def test_seed_automaton_scans_a_megabyte_of_text_in_one_pass():
+    index = server._build_name_resolution_index()
+    automaton = server._get_mention_automaton(index)
+    paragraph = (
+        "Composition: Ethanol 70%, methanol, Acetone, sodium hydroxide. "
+        "採購單：丙酮 500 mL、二甲苯、乙醇 95%。Lot CAS 7732-18-5. "
+    )
+    text = (paragraph * (MAX_MENTION_TEXT_CHARS // len(paragraph) + 1))[:MAX_MENTION_TEXT_CHARS]
+
+    started = time.perf_counter()
+    mentions = extract_mentions(text, automaton, server._normalize_valid_lookup_cas)
+    elapsed = time.perf_counter() - started
+
+    assert {m.cas_number for m in mentions} >= {"64-17-5", "67-56-1", "67-64-1", "1310-73-2", "7732-18-5"}
+    assert elapsed < 3.0
+
+
+async def test_extract_mentions_endpoint_groups_hits_and_follows_alias_approvals(tmp_path, monkeypatch):
+    store = PilotStore(str(tmp_path / "mentions.db")).connect()
+    try:
+        monkeypatch.setattr(server, "pilot_store", store)
+        text = "Add acetone (67-64-1), then Acetone again and some lab grade solvent X."
+        transport = ASGITransport(app=server.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post("/api/extract-mentions", json={"text": text})
+            assert response.status_code == 200
+            data = response.json()
+            assert data["cas_numbers"] == ["67-64-1"]
+            assert data["mention_count"] == 3
+            assert data["results"][0]["name_en"]
+            assert [span["text"] for span in data["results"][0]["spans"]] == ["acetone", "67-64-1", "Acetone"]
+
+            store.upsert_alias("lab grade solvent x", "en", "64-17-5", status=APPROVED_ALIAS_STATUS)
+            response = await ac.post("/api/extract-mentions", json={"text": text})
+            assert response.json()["cas_numbers"] == ["67-64-1", "64-17-5"]
+
+            response = await ac.post("/api/extract-mentions", json={"text": ""})
+            assert response.status_code == 422
+    finally:
+        store.close()
+
+
+def test_extract_mentions_route_admits_a_full_text_body():
+    assert get_public_json_body_limit("POST", "/api/extract-mentions") > 3 * MAX_MENTION_TEXT_CHARS
+    limits = [
+        str(limit.limit)
+        for key, route_limits in server.limiter._route_limits.items()
+        if key.endswith(".extract_mentions_from_text")
+        for limit in route_limits
+    ]
+    assert limits == ["10 per 1 minute"]
@@ -48,6 +48,16 @@ def count_method_calls(monkeypatch, obj, method_name):
     return calls
 
 
+def use_reference_link_rows(monkeypatch, rows):
+    """Serve ``rows`` as the store's active reference links and drop the cached index."""
+
+    def fake_reference_links(cas_number=None, **_kwargs):
+        return [row for row in rows if cas_number in (None, row["casNumber"])]
+
+    monkeypatch.setattr(server.pilot_store, "list_reference_links", fake_reference_links)
+    monkeypatch.setitem(server._NAME_RESOLUTION_INDEX_CACHE, "index", None)
+
+
 # ─── Unit tests: resolve_name_to_cas ───────────────────────
 
 class TestResolveNameToCas:
@@ -141,6 +151,104 @@ class TestResolveNameToCas:
         finally:
             store.close()
 
+    def test_name_resolution_index_follows_writes_from_other_processes(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "shared.db"
+        api_worker = PilotStore(db_path).connect()
+        admin_script = PilotStore(db_path).connect()
+        try:
+            monkeypatch.setattr(server, "pilot_store", api_worker)
+            assert resolve_name_to_cas("cross worker alias") is None
+            cached_index = server._get_name_resolution_index()
+            assert server._get_name_resolution_index() is cached_index
+
+            admin_script.upsert_alias("Cross Worker Alias", "en", "64-17-5", status=APPROVED_ALIAS_STATUS)
+
+            assert api_worker.dictionary_data_version == admin_script.dictionary_data_version == 1
+            assert resolve_name_to_cas("cross worker alias") == "64-17-5"
+            assert server._get_name_resolution_index() is not cached_index
+        finally:
+            admin_script.close()
+            api_worker.close()
+
+    def test_name_index_snapshot_warm_starts_a_fresh_process(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(server, "NAME_INDEX_SNAPSHOT_ENABLED", True)
+        db_path = tmp_path / "snapshot.db"
+        monkeypatch.setattr(server, "seed_dictionary_signature", lambda: "seed-fixture")
+        monkeypatch.setattr(server, "ops_counters", server.Counter())
+        seed_store = PilotStore(db_path).connect()
+        try:
+            seed_store.upsert_alias("Snapshot Probe", "en", "64-17-5", status=APPROVED_ALIAS_STATUS)
+        finally:
+            seed_store.close()
+
+        first_store = PilotStore(db_path).connect()
+        try:
+            monkeypatch.setattr(server, "pilot_store", first_store)
+            built = server._get_name_resolution_index()
+        finally:
+            first_store.close()
+
+        assert (tmp_path / "snapshot.db.name-index").exists()
+        assert server.ops_counters["dictionary.name_index.build"] == 1
+        assert server.ops_counters["dictionary.name_index.snapshot_miss"] == 1
+
+        # A new process starts with data version 0 against the same database.
+        restarted_store = PilotStore(db_path).connect()
+        try:
+            monkeypatch.setattr(server, "pilot_store", restarted_store)
+            monkeypatch.setattr(server, "_build_name_resolution_index", None)
+            loaded = server._get_name_resolution_index()
+        finally:
+            restarted_store.close()
+
+        assert server.ops_counters["dictionary.name_index.snapshot_load"] == 1
+        assert loaded == built
+        assert loaded.combined_exact["en"]["snapshot probe"] == "64-17-5"
+
+    def test_name_index_snapshot_rebuilds_when_store_rows_or_payload_differ(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(server, "NAME_INDEX_SNAPSHOT_ENABLED", True)
+        db_path = tmp_path / "snapshot-stale.db"
+        snapshot_path = tmp_path / "snapshot-stale.db.name-index"
+        monkeypatch.setattr(server, "seed_dictionary_signature", lambda: "seed-fixture")
+        monkeypatch.setattr(server, "ops_counters", server.Counter())
+        store = PilotStore(db_path).connect()
+        try:
+            monkeypatch.setattr(server, "pilot_store", store)
+            server._load_or_build_name_resolution_index()
+
+            # Rows written without bumping the version (e.g. a restored backup)
+            # leave the version unchanged, so only the row digest can reject it.
+            store.upsert_alias("Other Worker Alias", "en", "67-56-1", status=APPROVED_ALIAS_STATUS)
+            store._execute("UPDATE dictionary_meta SET value = 0")
+            assert store.dictionary_data_version == 0
+
+            index = server._load_or_build_name_resolution_index()
+            assert index.combined_exact["en"]["other worker alias"] == "67-56-1"
+            assert server.ops_counters["dictionary.name_index.snapshot_rejected"] == 1
+
+            snapshot_path.write_bytes(snapshot_path.read_bytes()[:-16])
+            index = server._load_or_build_name_resolution_index()
+            assert index.combined_exact["en"]["other worker alias"] == "67-56-1"
+            assert server.ops_counters["dictionary.name_index.snapshot_rejected"] == 2
+            assert server.ops_counters["dictionary.name_index.build"] == 3
+
+            assert server._load_or_build_name_resolution_index() == index
+            assert server.ops_counters["dictionary.name_index.snapshot_load"] == 1
+        finally:
+            store.close()
+
+    def test_name_index_snapshot_skipped_when_seed_tables_are_patched(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(server, "NAME_INDEX_SNAPSHOT_ENABLED", True)
+        monkeypatch.setattr(server, "seed_dictionary_signature", lambda: None)
+        store = PilotStore(tmp_path / "patched.db").connect()
+        try:
+            monkeypatch.setattr(server, "pilot_store", store)
+            server._load_or_build_name_resolution_index()
+        finally:
+            store.close()
+
+        assert not (tmp_path / "patched.db.name-index").exists()
+
 
 # ─── Unit tests: reverse dictionaries ─────────────────────
 
@@ -231,6 +339,7 @@ async def test_search_by_name_reuses_index_and_precomputed_display_names(tmp_pat
             "list_manual_entries": count_method_calls(monkeypatch, store, "list_manual_entries"),
             "list_aliases": count_method_calls(monkeypatch, store, "list_aliases"),
             "get_manual_entry_by_cas": count_method_calls(monkeypatch, store, "get_manual_entry_by_cas"),
+            "list_reference_links": count_method_calls(monkeypatch, store, "list_reference_links"),
         }
 
         def snapshot():
@@ -272,6 +381,41 @@ async def test_search_by_name_reuses_index_and_precomputed_display_names(tmp_pat
         store.close()
 
 
+async def test_reference_link_upserts_refresh_display_records_for_autocomplete_and_search(tmp_path, monkeypatch):
+    store = PilotStore(str(tmp_path / "display-records.db")).connect()
+    try:
+        monkeypatch.setattr(server, "pilot_store", store)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/api/search-by-name/ethanol")
+            ethanol = next(row for row in response.json()["results"] if row["cas_number"] == "64-17-5")
+            assert all(link["url"] != "https://example.com/ethanol-sds" for link in ethanol["reference_links"])
+
+            version = store.dictionary_data_version
+            store.upsert_reference_link(
+                "64-17-5",
+                link_type="sds",
+                label="Supplier SDS",
+                url="https://example.com/ethanol-sds",
+            )
+            assert store.dictionary_data_version == version + 1
+
+            response = await ac.get("/api/search-by-name/ethanol")
+            ethanol = next(row for row in response.json()["results"] if row["cas_number"] == "64-17-5")
+            assert ethanol["reference_links"][0]["url"] == "https://example.com/ethanol-sds"
+
+        record = server._cas_display_record("0064-17-5")
+        assert record.cas_number == "64-17-5"
+        assert record.name_en and record.name_zh
+        links = server._build_reference_links("64-17-5", 702, record.name_en)
+        assert [link["url"] for link in links[:2]] == [
+            "https://pubchem.ncbi.nlm.nih.gov/compound/702#section=Safety-and-Hazards",
+            "https://example.com/ethanol-sds",
+        ]
+    finally:
+        store.close()
+
+
 async def test_workspace_documents_require_admin_token(monkeypatch):
     monkeypatch.setattr(server, "ADMIN_API_TOKEN", "secret")
     transport = ASGITransport(app=app)
@@ -1341,25 +1485,24 @@ async def test_reference_link_rejects_unknown_link_type(monkeypatch):
 
 
 def test_build_reference_links_skips_unsafe_manual_urls(monkeypatch):
-    def fake_reference_links(_cas_number):
-        return [
-            {
-                "label": "Unsafe SDS",
-                "url": "javascript:alert(1)",
-                "linkType": "sds",
-                "source": "manual",
-                "priority": 1,
-            },
-            {
-                "label": "Tenant SDS",
-                "url": "https://example.com/sds",
-                "linkType": "sds",
-                "source": "manual",
-                "priority": 2,
-            },
-        ]
-
-    monkeypatch.setattr(server.pilot_store, "list_reference_links", fake_reference_links)
+    use_reference_link_rows(monkeypatch, [
+        {
+            "casNumber": "64-17-5",
+            "label": "Unsafe SDS",
+            "url": "javascript:alert(1)",
+            "linkType": "sds",
+            "source": "manual",
+            "priority": 1,
+        },
+        {
+            "casNumber": "64-17-5",
+            "label": "Tenant SDS",
+            "url": "https://example.com/sds",
+            "linkType": "sds",
+            "source": "manual",
+            "priority": 2,
+        },
+    ])
 
     links = server._build_reference_links("64-17-5", None, "Ethanol")
 
@@ -1368,18 +1511,16 @@ def test_build_reference_links_skips_unsafe_manual_urls(monkeypatch):
 
 
 def test_build_reference_links_normalizes_legacy_manual_link_type(monkeypatch):
-    def fake_reference_links(_cas_number):
-        return [
-            {
-                "label": "Legacy Role SDS",
-                "url": "https://example.com/legacy-sds",
-                "linkType": "script",
-                "source": "manual",
-                "priority": 1,
-            },
-        ]
-
-    monkeypatch.setattr(server.pilot_store, "list_reference_links", fake_reference_links)
+    use_reference_link_rows(monkeypatch, [
+        {
+            "casNumber": "64-17-5",
+            "label": "Legacy Role SDS",
+            "url": "https://example.com/legacy-sds",
+            "linkType": "script",
+            "source": "manual",
+            "priority": 1,
+        },
+    ])
 
     links = server._build_reference_links("64-17-5", None, "Ethanol")
     legacy = next(link for link in links if link["url"] == "https://example.com/legacy-sds")
@@ -1390,18 +1531,16 @@ def test_build_reference_links_normalizes_legacy_manual_link_type(monkeypatch):
 def test_build_reference_links_keeps_strongest_role_for_duplicate_urls(monkeypatch):
     pubchem_sds_url = "https://pubchem.ncbi.nlm.nih.gov/compound/702#section=Safety-and-Hazards"
 
-    def fake_reference_links(_cas_number):
-        return [
-            {
-                "label": "Generic mirror of PubChem safety",
-                "url": pubchem_sds_url,
-                "linkType": "reference",
-                "source": "manual",
-                "priority": 1,
-            },
-        ]
-
-    monkeypatch.setattr(server.pilot_store, "list_reference_links", fake_reference_links)
+    use_reference_link_rows(monkeypatch, [
+        {
+            "casNumber": "64-17-5",
+            "label": "Generic mirror of PubChem safety",
+            "url": pubchem_sds_url,
+            "linkType": "reference",
+            "source": "manual",
+            "priority": 1,
+        },
+    ])
 
     links = server._build_reference_links("64-17-5", 702, "Ethanol")
     safety_link = next(link for link in links if link["url"] == pubchem_sds_url)
@@ -1411,25 +1550,24 @@ def test_build_reference_links_keeps_strongest_role_for_duplicate_urls(monkeypat
 
 
 def test_build_reference_links_orders_by_authority_role_before_priority(monkeypatch):
-    def fake_reference_links(_cas_number):
-        return [
-            {
-                "label": "Generic internal note",
-                "url": "https://example.com/internal-note",
-                "linkType": "reference",
-                "source": "manual",
-                "priority": 1,
-            },
-            {
-                "label": "Supplier SDS",
-                "url": "https://example.com/supplier-sds",
-                "linkType": "sds",
-                "source": "manual",
-                "priority": 50,
-            },
-        ]
-
-    monkeypatch.setattr(server.pilot_store, "list_reference_links", fake_reference_links)
+    use_reference_link_rows(monkeypatch, [
+        {
+            "casNumber": "64-17-5",
+            "label": "Generic internal note",
+            "url": "https://example.com/internal-note",
+            "linkType": "reference",
+            "source": "manual",
+            "priority": 1,
+        },
+        {
+            "casNumber": "64-17-5",
+            "label": "Supplier SDS",
+            "url": "https://example.com/supplier-sds",
+            "linkType": "sds",
+            "source": "manual",
+            "priority": 50,
+        },
+    ])
 
     links = server._build_reference_links("64-17-5", 702, "Ethanol")
 
@@ -1,9 +1,19 @@
+import logging
+import threading
+
 import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+import observability
 import server
-from observability import record_telemetry_event
+from observability import (
+    event_counts,
+    record_telemetry_event,
+    reset_event_counts,
+    start_event_log_queue,
+    stop_event_log_queue,
+)
 from server import (
     PubChemError,
     _record_ops_counter,
@@ -22,10 +32,12 @@ def reset_observability_state():
     ops_counters.clear()
     ops_recent_events.clear()
     ghs_cache.clear()
+    reset_event_counts()
     yield
     ops_counters.clear()
     ops_recent_events.clear()
     ghs_cache.clear()
+    reset_event_counts()
 
 
 async def test_ops_report_endpoint_returns_currentBytes_and_current_counters(monkeypatch):
@@ -48,6 +60,7 @@ async def test_ops_report_endpoint_returns_currentBytes_and_current_counters(mon
     data = response.json()
     assert data["counters"]["cache.ghs.hit"] == 1
     assert data["recentEvents"][0]["type"] == "cache_stale_hit"
+    assert data["eventCounts"] == {"backend": {"cache_stale_hit": 1}}
     assert data["cache"]["ghsEntries"] == 1
     assert data["cache"]["ghs"] == {
         "entries": 1,
@@ -227,3 +240,68 @@ async def test_pubchem_rate_slot_sleeps_when_requests_are_too_close(monkeypatch)
 
     assert sleeps == pytest.approx([0.15])
     assert server._last_pubchem_request_monotonic == pytest.approx(100.2)
+
+
+async def test_telemetry_batch_records_valid_events_and_reports_rejections(caplog):
+    caplog.set_level("INFO", logger="ghs.observability")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/telemetry/batch",
+            json={
+                "events": [
+                    {"type": "print_start"},
+                    {"type": "print_autofit_retry", "count": 3},
+                    {"type": "send_password_to_somewhere"},
+                    {"type": "print_complete", "meta": {"labelKind": "complete"}},
+                ]
+            },
+        )
+        empty = await ac.post("/api/telemetry/batch", json={"events": []})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ok"] is False
+    assert body["accepted"] == 3
+    assert len(body["eventIds"]) == 3
+    assert body["rejected"] == [{"index": 2, "detail": "unsupported telemetry event type"}]
+    assert event_counts()["frontend"] == {
+        "print_autofit_retry": 3,
+        "print_complete": 1,
+        "print_start": 1,
+    }
+    assert '"type":"print_complete"' in caplog.text
+    assert empty.status_code == 422
+
+
+def test_event_log_queue_writes_on_a_background_thread():
+    written = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            written.append((threading.current_thread(), record.getMessage()))
+
+    root = logging.getLogger()
+    handler = RecordingHandler(level=logging.INFO)
+    root.addHandler(handler)
+    try:
+        assert start_event_log_queue() is True
+        assert start_event_log_queue() is False
+        record_telemetry_event({"type": "print_start", "meta": {"stock": "A4"}})
+    finally:
+        stop_event_log_queue()
+        root.removeHandler(handler)
+
+    [(thread, message)] = written
+    assert thread is not threading.current_thread()
+    assert '"type":"print_start"' in message
+    assert observability.LOGGER.propagate is True
+
+
+def test_event_counts_cap_distinct_sources():
+    for index in range(observability.MAX_EVENT_COUNT_KEYS + 5):
+        record_telemetry_event({"type": "print_start", "source": f"tab-{index}"})
+
+    counts = event_counts()
+    assert sum(len(types) for types in counts.values()) == observability.MAX_EVENT_COUNT_KEYS + 1
+    assert counts[observability.EVENT_COUNT_OVERFLOW_SOURCE] == {"print_start": 5}
@@ -0,0 +1,145 @@
+import asyncio
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fontTools.ttLib import TTFont
+from pypdf import PdfReader
+from starlette.testclient import TestClient
+
+import server
+from label_document import build_label_sheet
+from pdf_native import LabelFont, NativeLabelPdfRenderer, _svg_path_operators, render_label_sheet
+from pdf_render import PrintPdfRenderer, PrintPdfRequest, validate_rendered_pdf
+from test_label_document import ETHANOL, RecordingRenderer
+from test_pdf_render import FakeBrowser, fake_startup
+
+TEST_FONT = Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+
+pytestmark = pytest.mark.skipif(not TEST_FONT.exists(), reason="DejaVu Sans is not installed")
+
+
+@pytest.fixture(scope="module")
+def font():
+    return LabelFont(TEST_FONT)
+
+
+def test_native_sheet_passes_the_renderer_output_contract(font):
+    sheet = build_label_sheet([ETHANOL] * 5, columns=2, rows=2, locale="en", template="full")
+
+    pdf_bytes = render_label_sheet(sheet, font)
+
+    validate_rendered_pdf(
+        pdf_bytes,
+        PrintPdfRequest.model_construct(html="", page=sheet.page, meta=sheet.meta),
+        strict=True,
+    )
+    reader = PdfReader(BytesIO(pdf_bytes), strict=True)
+    assert len(reader.pages) == 2
+    text = reader.pages[0].extract_text()
+    assert "Ethanol" in text
+    assert "H336 May cause drowsiness or dizziness" in text
+    assert "Page 1 of 2" in text
+    xobjects = reader.pages[0]["/Resources"]["/XObject"]
+    assert sorted(xobjects) == ["/P1", "/P2"]
+    assert reader.pages[1]["/Resources"]["/XObject"].raw_get("/P1") == xobjects.raw_get("/P1")
+
+
+def test_font_subset_keeps_only_used_glyphs_and_remaps_composites(font):
+    font_bytes, glyph_ids, widths = font.subset("AÄ")
+
+    subset = TTFont(BytesIO(font_bytes))
+    glyf = subset["glyf"]
+    order = subset.getGlyphOrder()
+    composite = glyf[order[glyph_ids["Ä"]]]
+    assert composite.isComposite()
+    assert {component.glyphName for component in composite.components} <= set(order)
+    assert subset["maxp"].numGlyphs == len(order) < 10
+    assert "cmap" not in subset
+    assert set(widths) == set(range(len(order)))
+    assert glyph_ids["A"] != 0
+
+
+def test_svg_path_data_converts_relative_commands_and_implicit_linetos():
+    assert _svg_path_operators("m 10,10 5,0 0,5 z M 1 2 h 3 v 4") == [
+        "10 10 m",
+        "15 10 l",
+        "15 15 l",
+        "h",
+        "1 2 m",
+        "4 2 l",
+        "4 6 l",
+    ]
+
+
+def _started_native_renderer():
+    renderer = NativeLabelPdfRenderer(font_path=TEST_FONT)
+    asyncio.run(renderer.startup())
+    assert renderer.available
+    return renderer
+
+
+class UnavailableRenderer(RecordingRenderer):
+    available = False
+
+
+@pytest.mark.parametrize(
+    ("mode", "browser", "expect_native"),
+    [
+        ("fallback", UnavailableRenderer(), True),
+        ("fallback", RecordingRenderer(), False),
+        ("prefer", RecordingRenderer(), True),
+    ],
+)
+def test_label_endpoint_uses_the_native_renderer_per_mode(monkeypatch, mode, browser, expect_native):
+    async def fake_search_chemical(cas_number, _http_client):
+        return server.ChemicalResult(**ETHANOL)
+
+    native = _started_native_renderer()
+    browser.requests = []
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "pdf_renderer", browser)
+    monkeypatch.setattr(server, "native_label_renderer", native)
+    monkeypatch.setattr(server, "PDF_NATIVE_LABELS", mode)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+    server.limiter.reset()
+
+    response = TestClient(server.app).post(
+        "/api/print/labels/pdf",
+        json={"cas_numbers": ["64-17-5"], "copies": 3, "locale": "en"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    if expect_native:
+        assert response.content.startswith(b"%PDF-")
+        assert browser.requests == []
+        assert native.stats()["renders"] == 1
+        assert server.ops_counters["print.labels.native"] == 1
+    else:
+        assert response.content == b"%PDF-LABELS"
+        assert native.stats()["renders"] == 0
+
+
+@pytest.mark.parametrize(("launch_seconds", "expect_native"), [(0.05, False), (1.0, True)])
+def test_fallback_gives_a_lazy_browser_the_startup_wait_first(monkeypatch, launch_seconds, expect_native):
+    async def fake_search_chemical(cas_number, _http_client):
+        return server.ChemicalResult(**ETHANOL)
+
+    native = _started_native_renderer()
+    browser = PrintPdfRenderer(startup_wait_ms=300)
+    launches = fake_startup(browser, launch_seconds, FakeBrowser())
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "pdf_renderer", browser)
+    monkeypatch.setattr(server, "native_label_renderer", native)
+    monkeypatch.setattr(server, "PDF_NATIVE_LABELS", "fallback")
+    server.limiter.reset()
+
+    response = TestClient(server.app).post(
+        "/api/print/labels/pdf",
+        json={"cas_numbers": ["64-17-5"], "locale": "en"},
+    )
+
+    assert response.status_code == 200
+    assert len(launches) == 1
+    assert native.stats()["renders"] == (1 if expect_native else 0)
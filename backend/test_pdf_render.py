@@ -1,19 +1,33 @@
 import asyncio
+from io import BytesIO
+import os
 import re
+import time
 
 import pytest
 from pydantic import ValidationError
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject
 from starlette.testclient import TestClient
 
+from label_document import build_label_document
 from pdf_render import (
     MAX_PRINT_PDF_HTML_BYTES,
     PdfRenderBusyError,
+    PdfRenderCache,
     PdfRenderError,
     PdfRenderUnavailableError,
+    PDF_POINTS_PER_MM,
+    PrintPdfMeta,
     PrintPdfPage,
     PrintPdfRenderer,
     PrintPdfRequest,
     block_non_data_route,
+    optimize_rendered_pdf,
+    pdf_output_sizes,
+    render_cache_key,
+    split_print_document,
+    validate_rendered_pdf,
 )
 
 
@@ -27,7 +41,12 @@ VALID_HTML = """<!DOCTYPE html>
 """
 
 
-def make_pdf_bytes(page_sizes=((595.28, 841.89),)):
+def make_pdf_bytes(page_sizes=((595.28, 841.89),), inherited_size=None):
+    inherited_box = (
+        f" /MediaBox [0 0 {inherited_size[0]:g} {inherited_size[1]:g}]"
+        if inherited_size
+        else ""
+    )
     objects = [
         b"<< /Type /Catalog /Pages 2 0 R >>",
         (
@@ -36,15 +55,13 @@ def make_pdf_bytes(page_sizes=((595.28, 841.89),)):
                 f"{index + 3} 0 R".encode("ascii")
                 for index in range(len(page_sizes))
             )
-            + f"] /Count {len(page_sizes)} >>".encode("ascii")
+            + f"] /Count {len(page_sizes)}{inherited_box} >>".encode("ascii")
         ),
     ]
-    for width, height in page_sizes:
+    for size in page_sizes:
+        own_box = f"/MediaBox [0 0 {size[0]:g} {size[1]:g}] " if size else ""
         objects.append(
-            (
-                "<< /Type /Page /Parent 2 0 R "
-                f"/MediaBox [0 0 {width:g} {height:g}] >>"
-            ).encode("ascii")
+            f"<< /Type /Page /Parent 2 0 R {own_box}>>".encode("ascii")
         )
 
     pdf = bytearray(b"%PDF-1.7\n")
@@ -71,6 +88,51 @@ def make_pdf_bytes(page_sizes=((595.28, 841.89),)):
 VALID_A4_PDF = make_pdf_bytes()
 
 
+def make_image_pdf(pages, *, full_font=False):
+    """A4 pages that each embed their own copy of one image, as a browser
+    may, with uncompressed page content."""
+    writer = PdfWriter()
+    for _ in range(pages):
+        page = writer.add_blank_page(width=210 * PDF_POINTS_PER_MM, height=297 * PDF_POINTS_PER_MM)
+        image = DecodedStreamObject()
+        image.set_data(bytes(range(256)) * 48)
+        image.update(
+            {
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Image"),
+                NameObject("/Width"): NumberObject(64),
+                NameObject("/Height"): NumberObject(64),
+                NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+                NameObject("/BitsPerComponent"): NumberObject(8),
+            }
+        )
+        content = DecodedStreamObject()
+        content.set_data(b"q 100 0 0 100 50 50 cm /Im0 Do Q\n" * 40)
+        resources = DictionaryObject(
+            {NameObject("/XObject"): DictionaryObject({NameObject("/Im0"): writer._add_object(image)})}
+        )
+        if full_font:
+            font_file = DecodedStreamObject()
+            font_file.set_data(b"\0" * 64)
+            descriptor = DictionaryObject({NameObject("/FontFile2"): writer._add_object(font_file)})
+            resources[NameObject("/Font")] = DictionaryObject(
+                {
+                    NameObject("/F1"): DictionaryObject(
+                        {
+                            NameObject("/Type"): NameObject("/Font"),
+                            NameObject("/BaseFont"): NameObject("/NotoSansCJKtc-Regular"),
+                            NameObject("/FontDescriptor"): writer._add_object(descriptor),
+                        }
+                    )
+                }
+            )
+        page[NameObject("/Resources")] = resources
+        page[NameObject("/Contents")] = writer._add_object(content)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
 def make_request(**overrides):
     payload = {
         "html": VALID_HTML,
@@ -238,6 +300,10 @@ class FakeBrowser:
     def __init__(self):
         self.context_kwargs = []
         self.contexts = []
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
 
     async def new_context(self, **kwargs):
         self.context_kwargs.append(kwargs)
@@ -335,6 +401,43 @@ async def test_renderer_rejects_malformed_or_truncated_pdf_output():
     assert exc_info.value.code == "pdf_render_invalid_output"
 
 
+@pytest.mark.parametrize("strict", [True, False])
+@pytest.mark.parametrize(
+    "pdf_bytes, pages, reason",
+    [
+        (make_pdf_bytes(((595.28, 841.89), (595.28, 841.89))), 1, "page_count_mismatch"),
+        (make_pdf_bytes(((595.28, 841.89), (1000, 1000))), 2, "page_geometry_mismatch"),
+        (b"%PDF-1.7\ntruncated", 1, "malformed_document"),
+        (b"not a pdf", 1, "invalid_header"),
+    ],
+)
+def test_structural_and_strict_validation_reject_the_same_outputs(pdf_bytes, pages, reason, strict, caplog):
+    request = make_request(meta={"label_purpose": "complete", "page_count_expected": pages})
+
+    with pytest.raises(PdfRenderError):
+        validate_rendered_pdf(pdf_bytes, request, strict=strict)
+
+    assert caplog.records[-1].validation_reason == reason
+
+
+def test_structural_validation_follows_inherited_media_boxes():
+    pdf_bytes = make_pdf_bytes((None, None, None), inherited_size=(595.28, 841.89))
+    request = make_request(meta={"label_purpose": "complete", "page_count_expected": 3})
+
+    validate_rendered_pdf(pdf_bytes, request, strict=False)
+    validate_rendered_pdf(pdf_bytes, request, strict=True)
+
+
+@pytest.mark.asyncio
+async def test_renderer_samples_strict_validation():
+    renderer = PrintPdfRenderer(browser=FakeBrowser(), strict_validation_every=2)
+
+    for _ in range(3):
+        await renderer.render(make_request())
+
+    assert renderer.stats()["validation"] == {"strictEvery": 2, "strict": 2, "structural": 1}
+
+
 @pytest.mark.asyncio
 async def test_renderer_checks_media_box_on_every_expected_page():
     pdf_bytes = make_pdf_bytes(((595.28, 841.89), (1000, 1000)))
@@ -429,13 +532,496 @@ def _pdf_media_box_points(pdf_bytes):
     return float(match.group(1)), float(match.group(2))
 
 
+async def settle_pool(renderer):
+    while renderer._pool_tasks:
+        await asyncio.gather(*renderer._pool_tasks)
+
+
+@pytest.mark.asyncio
+async def test_pooled_renderer_reuses_primed_context_and_blanks_it_between_jobs():
+    browser = FakeBrowser()
+    renderer = PrintPdfRenderer(browser=browser, context_pool_size=1)
+
+    assert await renderer.warm_pool() == 1
+    first = await renderer.render(make_request())
+    await settle_pool(renderer)
+    second = await renderer.render(make_request())
+    await settle_pool(renderer)
+
+    assert first == second == VALID_A4_PDF
+    [context] = browser.contexts
+    assert context.closed is False
+    assert context.routes[0][0] == "**/*"
+    documents = [html for html, _kwargs in context.page.content_calls]
+    assert "危險" in documents[0]
+    assert documents[1:] == [
+        "<!DOCTYPE html><html><body></body></html>",
+        VALID_HTML,
+        "<!DOCTYPE html><html><body></body></html>",
+        VALID_HTML,
+        "<!DOCTYPE html><html><body></body></html>",
+    ]
+    stats = renderer.stats()
+    assert stats["pool"]["idle"] == 1
+    assert stats["pool"]["reused"] == 2
+    assert {phase: stats["phases"][phase]["count"] for phase in ("acquire", "set_content", "pdf", "validate", "reset")} == {
+        "acquire": 2,
+        "set_content": 2,
+        "pdf": 2,
+        "validate": 2,
+        "reset": 2,
+    }
+
+    await renderer.shutdown()
+    assert context.closed is True
+
+
+@pytest.mark.asyncio
+async def test_pooled_renderer_recycles_after_reuse_limit_and_discards_on_error():
+    browser = FakeBrowser()
+    renderer = PrintPdfRenderer(browser=browser, context_pool_size=1, max_renders_per_context=2)
+    await renderer.warm_pool()
+
+    for _ in range(2):
+        await renderer.render(make_request())
+        await settle_pool(renderer)
+
+    assert browser.contexts[0].closed is True
+    assert len(browser.contexts) == 2
+    assert renderer.stats()["pool"]["recycled"] == 1
+
+    with pytest.raises(PdfRenderError):
+        await renderer.render(make_request(meta={"label_purpose": "complete", "page_count_expected": 2}))
+    await settle_pool(renderer)
+
+    assert browser.contexts[1].closed is True
+    assert browser.contexts[2].closed is False
+    assert renderer.stats()["pool"]["discarded"] == 1
+    assert renderer.stats()["pool"]["idle"] == 1
+
+
+class PacedPage(FakePage):
+    async def set_content(self, html, **kwargs):
+        await super().set_content(html, **kwargs)
+        await asyncio.sleep(0.02)
+
+
+class PacedBrowser(FakeBrowser):
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = PacedPage()
+        return context
+
+
+@pytest.mark.asyncio
+async def test_queued_renders_wait_for_resetting_contexts_instead_of_opening_cold_ones():
+    browser = PacedBrowser()
+    renderer = PrintPdfRenderer(
+        browser=browser,
+        max_concurrent=2,
+        context_pool_size=2,
+        max_renders_per_context=100,
+        max_queued_renders=40,
+    )
+    await renderer.warm_pool()
+
+    await asyncio.gather(*(renderer.render(make_request()) for _ in range(40)))
+    await settle_pool(renderer)
+
+    pool = renderer.stats()["pool"]
+    assert len(browser.contexts) == 2
+    assert {key: pool[key] for key in ("created", "reused", "recycled", "pool_full", "idle")} == {
+        "created": 2,
+        "reused": 40,
+        "recycled": 0,
+        "pool_full": 0,
+        "idle": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_full_closes_are_counted_apart_from_reuse_limit_recycling():
+    browser = GatedBrowser()
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=2, context_pool_size=1)
+
+    renders = [asyncio.create_task(renderer.render(make_request())) for _ in range(2)]
+    while len(browser.contexts) < 2:
+        await asyncio.sleep(0)
+    browser.gate.set()
+    await asyncio.gather(*renders)
+    await settle_pool(renderer)
+
+    pool = renderer.stats()["pool"]
+    assert (pool["pool_full"], pool["recycled"], pool["idle"]) == (1, 0, 1)
+
+
+class GatedPage(FakePage):
+    def __init__(self, gate, order):
+        super().__init__()
+        self.gate = gate
+        self.order = order
+
+    async def set_content(self, html, **kwargs):
+        await super().set_content(html, **kwargs)
+        self.order.append(html)
+
+    async def pdf(self, **kwargs):
+        await self.gate.wait()
+        return await super().pdf(**kwargs)
+
+
+class GatedBrowser(FakeBrowser):
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.order = []
+
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = GatedPage(self.gate, self.order)
+        return context
+
+
+@pytest.mark.asyncio
+async def test_renderer_queues_fifo_up_to_depth_then_rejects_with_retry_after():
+    browser = GatedBrowser()
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=1, max_queued_renders=2)
+    documents = [VALID_HTML.replace("鹽酸", f"job-{index}") for index in range(3)]
+
+    jobs = [asyncio.create_task(renderer.render(make_request(html=html))) for html in documents]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert renderer.stats()["queue"]["waiting"] == 2
+
+    with pytest.raises(PdfRenderBusyError) as exc_info:
+        await renderer.render(make_request())
+    assert exc_info.value.retry_after_seconds == 10
+
+    browser.gate.set()
+    assert await asyncio.gather(*jobs) == [VALID_A4_PDF] * 3
+    assert browser.order == documents
+
+    queue = renderer.stats()["queue"]
+    assert (queue["queued"], queue["rejected"], queue["waiting"]) == (2, 1, 0)
+    assert queue["depthHistogram"] == {"0": 1, "1": 1, "2": 1}
+    assert sum(queue["waitHistogramMs"].values()) == 3
+    assert queue["estimatedWaitMs"] is not None
+
+
+@pytest.mark.asyncio
+async def test_renderer_gives_up_queue_wait_at_its_budget():
+    renderer = PrintPdfRenderer(
+        browser=FakeBrowser(),
+        max_concurrent=1,
+        max_queued_renders=4,
+        max_queue_wait_ms=20,
+    )
+    await renderer._semaphore.acquire()
+
+    with pytest.raises(PdfRenderBusyError) as exc_info:
+        await renderer.render(make_request())
+
+    assert exc_info.value.retry_after_seconds >= 1
+    assert renderer.stats()["queue"]["timed_out"] == 1
+    assert renderer.stats()["queue"]["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_renderer_serves_repeat_requests_from_the_render_cache():
+    browser = FakeBrowser()
+    renderer = PrintPdfRenderer(
+        browser=browser,
+        cache=PdfRenderCache(max_bytes=1024 * 1024),
+        font_config="fonts-v1",
+    )
+
+    first = await renderer.render(make_request())
+    second = await renderer.render(make_request())
+    await renderer.render(make_request(), use_cache=False)
+    await renderer.render(make_request(meta={"label_purpose": "qr", "page_count_expected": 1}))
+
+    assert first == second == VALID_A4_PDF
+    assert len(browser.contexts) == 3
+    cache = renderer.stats()["cache"]
+    assert (cache["memory_hits"], cache["misses"], cache["stores"]) == (1, 2, 2)
+    assert cache["bytes"] == 2 * len(VALID_A4_PDF)
+    assert cache["hitRate"] == 0.3333
+
+
+def test_render_cache_key_covers_geometry_renderer_and_fonts():
+    base = render_cache_key(make_request(), renderer_version="120", font_config="a")
+
+    assert base == render_cache_key(make_request(), renderer_version="120", font_config="a")
+    assert base != render_cache_key(make_request(), renderer_version="121", font_config="a")
+    assert base != render_cache_key(make_request(), renderer_version="120", font_config="b")
+    assert base != render_cache_key(
+        make_request(page={"width_mm": 210, "height_mm": 297, "margin_mm": 5}),
+        renderer_version="120",
+        font_config="a",
+    )
+
+
+@pytest.mark.asyncio
+async def test_render_cache_disk_tier_survives_restart_and_expires(tmp_path, monkeypatch):
+    key = render_cache_key(make_request())
+    cache = PdfRenderCache(max_bytes=0, directory=tmp_path, max_disk_bytes=1024 * 1024, ttl_seconds=60)
+    await cache.put(key, VALID_A4_PDF)
+
+    restarted = PdfRenderCache(max_bytes=1024 * 1024, directory=tmp_path, max_disk_bytes=1024 * 1024, ttl_seconds=60)
+    assert await restarted.get(key) == VALID_A4_PDF
+    assert await restarted.get(key) == VALID_A4_PDF
+    assert (restarted.stats()["disk_hits"], restarted.stats()["memory_hits"]) == (1, 1)
+    assert [path.name for path in tmp_path.iterdir()] == [f"{key}.pdf"]
+
+    later = time.time() + 120
+    monkeypatch.setattr("pdf_render.time.time", lambda: later)
+    assert await cache.get(key) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_render_cache_disk_tier_evicts_oldest_beyond_its_budget(tmp_path):
+    cache = PdfRenderCache(max_bytes=0, directory=tmp_path, max_disk_bytes=len(VALID_A4_PDF) * 2)
+    keys = [render_cache_key(make_request(html=VALID_HTML + f"<!-- {index} -->")) for index in range(3)]
+    for index, key in enumerate(keys[:2]):
+        await cache.put(key, VALID_A4_PDF)
+        os.utime(tmp_path / f"{key}.pdf", (time.time(), time.time() - 10 + index))
+
+    await cache.put(keys[2], VALID_A4_PDF)
+
+    assert sorted(path.stem for path in tmp_path.iterdir()) == sorted(keys[1:])
+
+
+def paged_html(pages):
+    blocks = "".join(f'<div class="page"><p>page {index + 1}</p></div>' for index in range(pages))
+    return f'<!DOCTYPE html><html><head><style>.page {{ page-break-after: always; }}</style></head><body class="print-body">{blocks}</body></html>'
+
+
+def paged_request(pages):
+    return make_request(html=paged_html(pages), meta={"label_purpose": "complete", "page_count_expected": pages})
+
+
+class PagedPage(FakePage):
+    def __init__(self, browser):
+        super().__init__()
+        self.browser = browser
+        self.html = ""
+
+    async def set_content(self, html, **kwargs):
+        await super().set_content(html, **kwargs)
+        self.html = html
+
+    async def pdf(self, **kwargs):
+        self.browser.active += 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        await asyncio.sleep(0.02)
+        self.browser.active -= 1
+        pages = self.html.count('<div class="page">') or 1
+        return make_pdf_bytes(((595.28, 841.89),) * pages)
+
+
+class PagedBrowser(FakeBrowser):
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = PagedPage(self)
+        return context
+
+
+class ImagePage(PagedPage):
+    async def pdf(self, **kwargs):
+        return make_image_pdf(self.html.count('<div class="page">') or 1)
+
+
+class ImageBrowser(PagedBrowser):
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = ImagePage(self)
+        return context
+
+
+def test_split_print_document_keeps_head_and_page_order():
+    chunks = split_print_document(paged_request(5), 2)
+
+    assert [chunk.meta.page_count_expected for chunk in chunks] == [2, 2, 1]
+    assert all(chunk.html.startswith("<!DOCTYPE html><html><head><style>") for chunk in chunks)
+    assert all('<body class="print-body">' in chunk.html for chunk in chunks)
+    assert "page 3" in chunks[1].html and "page 5" in chunks[2].html
+    assert split_print_document(paged_request(2), 2) is None
+    mismatched = make_request(html=paged_html(4), meta={"label_purpose": "complete", "page_count_expected": 5})
+    assert split_print_document(mismatched, 2) is None
+
+
+@pytest.mark.asyncio
+async def test_renderer_renders_chunks_on_idle_slots_and_merges_them():
+    browser = PagedBrowser()
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=3, chunk_pages=2)
+
+    pdf_bytes = await renderer.render(paged_request(6))
+
+    assert len(PdfReader(BytesIO(pdf_bytes)).pages) == 6
+    assert browser.peak == 3
+    assert len(browser.contexts) == 3
+    stats = renderer.stats()
+    assert stats["chunking"] == {"chunkPages": 2, "jobs": 1, "chunks": 3, "slots": 3}
+    assert stats["phases"]["merge"]["count"] == 1
+    assert renderer._semaphore._value == 3
+
+
+@pytest.mark.asyncio
+async def test_chunked_render_only_borrows_slots_that_are_free():
+    browser = PagedBrowser()
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=2, chunk_pages=2)
+    await renderer._semaphore.acquire()
+
+    pdf_bytes = await renderer.render(paged_request(6))
+    renderer._semaphore.release()
+
+    assert len(PdfReader(BytesIO(pdf_bytes)).pages) == 6
+    assert browser.peak == 1
+    assert renderer.stats()["chunking"]["slots"] == 1
+
+
+@pytest.mark.asyncio
+async def test_chunked_render_validates_against_the_page_contract_and_frees_slots():
+    browser = PagedBrowser()
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=2, chunk_pages=2)
+    request = paged_request(4)
+    request.page.width_mm = 100
+
+    with pytest.raises(PdfRenderError) as exc_info:
+        await renderer.render(request)
+
+    assert exc_info.value.code == "pdf_render_invalid_output"
+    assert renderer._semaphore._value == 2
+
+
+@pytest.mark.asyncio
+async def test_chunked_render_keeps_server_built_sheets_trusted():
+    # Label text may trip the client-markup scan; the server escapes it.
+    record = {
+        "cas_number": "64-17-5",
+        "name_en": "javascript: onload=x",
+        "found": True,
+        "ghs_pictograms": [{"code": "GHS02", "name": "Flammable"}],
+    }
+    document = build_label_document([record] * 6, columns=1, rows=1)
+    with pytest.raises(ValidationError):
+        PrintPdfRequest.model_validate(document.model_dump())
+    renderer = PrintPdfRenderer(browser=PagedBrowser(), max_concurrent=2, chunk_pages=2)
+
+    pdf_bytes = await renderer.render(document)
+
+    assert len(PdfReader(BytesIO(pdf_bytes)).pages) == 6
+    assert renderer.stats()["chunking"]["chunks"] == 3
+
+    oversized = PrintPdfRequest.model_construct(
+        html=paged_html(4).replace("</style>", "/*" + "x" * MAX_PRINT_PDF_HTML_BYTES + "*/</style>"),
+        page=document.page,
+        meta=PrintPdfMeta.model_construct(label_purpose="complete", page_count_expected=4),
+    )
+    assert [chunk.meta.page_count_expected for chunk in split_print_document(oversized, 2)] == [2, 2]
+
+
+class SlowPagedPage(PagedPage):
+    async def pdf(self, **kwargs):
+        self.browser.rendered += 1
+        await asyncio.sleep(0.15)
+        return await super().pdf(**kwargs)
+
+
+class SlowPagedBrowser(PagedBrowser):
+    def __init__(self):
+        super().__init__()
+        self.rendered = 0
+
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = SlowPagedPage(self)
+        return context
+
+
+@pytest.mark.asyncio
+async def test_chunked_render_has_one_deadline_for_the_whole_job():
+    browser = SlowPagedBrowser()
+    # Every chunk fits the render timeout; the four rounds together do not.
+    renderer = PrintPdfRenderer(browser=browser, max_concurrent=1, chunk_pages=1, timeout_ms=400)
+
+    started = time.monotonic()
+    with pytest.raises(PdfRenderError) as exc_info:
+        await renderer.render(paged_request(4))
+
+    assert exc_info.value.code == "pdf_render_timeout"
+    assert time.monotonic() - started < 0.6
+    assert browser.rendered < 4
+    assert renderer._semaphore._value == 1
+
+
+def _image_ids(pdf_bytes):
+    reader = PdfReader(BytesIO(pdf_bytes), strict=True)
+    return {page["/Resources"]["/XObject"].raw_get("/Im0").idnum for page in reader.pages}
+
+
+def test_optimization_stores_repeated_images_once_and_compresses_content():
+    pdf_bytes = make_image_pdf(3, full_font=True)
+
+    optimized, report = optimize_rendered_pdf(pdf_bytes)
+
+    assert report == {"inputBytes": len(pdf_bytes), "outputBytes": len(optimized), "unsubsetFonts": 1}
+    assert len(optimized) < len(pdf_bytes) / 2
+    assert len(_image_ids(pdf_bytes)) == 3 and len(_image_ids(optimized)) == 1
+    assert PdfReader(BytesIO(optimized)).pages[0]["/Contents"]["/Filter"] == "/FlateDecode"
+    validate_rendered_pdf(
+        optimized,
+        make_request(meta={"label_purpose": "complete", "page_count_expected": 3}),
+        strict=True,
+    )
+    assert optimize_rendered_pdf(VALID_A4_PDF)[0] is VALID_A4_PDF
+
+
+@pytest.mark.asyncio
+async def test_chunked_render_serves_optimized_output_and_reports_raw_bytes():
+    renderer = PrintPdfRenderer(browser=ImageBrowser(), max_concurrent=3, chunk_pages=2)
+
+    with pdf_output_sizes() as sizes:
+        pdf_bytes = await renderer.render(paged_request(6))
+
+    assert sizes["rawBytes"] == 3 * len(make_image_pdf(2))
+    assert len(pdf_bytes) < sizes["rawBytes"] / 3
+    assert len(_image_ids(pdf_bytes)) == 1
+    stats = renderer.stats()
+    assert stats["optimization"]["documents"] == stats["optimization"]["rewritten"] == 3
+    assert stats["phases"]["optimize"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_renderer_serves_browser_bytes_when_optimization_is_off():
+    pdf_bytes = make_image_pdf(2)
+    renderer = PrintPdfRenderer(browser=MismatchedOutputBrowser(pdf_bytes), optimize_output=False)
+
+    with pdf_output_sizes() as sizes:
+        served = await renderer.render(
+            make_request(meta={"label_purpose": "complete", "page_count_expected": 2})
+        )
+
+    assert served == pdf_bytes
+    assert sizes["rawBytes"] == len(pdf_bytes)
+    assert renderer.stats()["optimization"]["documents"] == 0
+
+
 class EndpointRenderer:
     def __init__(self, pdf=b"%PDF-ENDPOINT"):
         self.pdf = pdf
         self.requests = []
+        self.use_cache = []
 
-    async def render(self, request):
+    async def render(self, request, *, use_cache=True):
         self.requests.append(request)
+        self.use_cache.append(use_cache)
         return self.pdf
 
 
@@ -494,6 +1080,25 @@ def test_print_pdf_endpoint_does_not_log_submitted_html(monkeypatch, caplog):
     assert VALID_HTML not in caplog.text
 
 
+def test_print_pdf_render_log_reports_bytes_before_and_after_optimization(monkeypatch, caplog):
+    import server
+
+    pdf_bytes = make_image_pdf(2)
+    monkeypatch.setattr(server, "pdf_renderer", PrintPdfRenderer(browser=MismatchedOutputBrowser(pdf_bytes)))
+    server.limiter.reset()
+    caplog.set_level("INFO", logger=server.logger.name)
+
+    response = TestClient(server.app).post(
+        "/api/print/pdf",
+        json=make_request(meta={"label_purpose": "complete", "page_count_expected": 2}).model_dump(),
+    )
+
+    assert response.status_code == 200
+    [record] = [record for record in caplog.records if record.getMessage() == "Rendered label PDF"]
+    assert record.pdf_bytes_raw == len(pdf_bytes)
+    assert record.pdf_bytes == len(response.content) < len(pdf_bytes)
+
+
 def test_health_stays_live_and_reports_degraded_when_pdf_is_unavailable(monkeypatch):
     import server
 
@@ -515,6 +1120,81 @@ def test_health_stays_live_and_reports_degraded_when_pdf_is_unavailable(monkeypa
     assert "/internal/chromium/path" not in health_response.text
 
 
+def fake_startup(renderer, seconds, browser=None):
+    """Replace the Chromium launch with one that takes ``seconds``."""
+    launches = []
+
+    async def startup():
+        launches.append(time.monotonic())
+        renderer._startup_attempts += 1
+        await asyncio.sleep(seconds)
+        if browser is None:
+            renderer._startup_failed_at = time.monotonic()
+        renderer._browser = browser
+
+    renderer.startup = startup
+    return launches
+
+
+@pytest.mark.asyncio
+async def test_first_render_starts_the_browser_on_demand_and_waits_for_it():
+    renderer = PrintPdfRenderer(startup_wait_ms=1000)
+    launches = fake_startup(renderer, 0.05, FakeBrowser())
+    assert renderer.startup_state == "not_started"
+
+    pdf, second = await asyncio.gather(renderer.render(make_request()), renderer.render(make_request()))
+
+    assert pdf == second == VALID_A4_PDF
+    assert len(launches) == 1
+    assert renderer.stats()["startup"]["state"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_render_gives_up_on_a_slow_startup_without_cancelling_it():
+    renderer = PrintPdfRenderer(startup_wait_ms=20)
+    fake_startup(renderer, 0.2, FakeBrowser())
+    task = renderer.start_in_background()
+
+    with pytest.raises(PdfRenderUnavailableError, match="still starting"):
+        await renderer.render(make_request())
+
+    assert renderer.startup_state == "starting"
+    await task
+    assert await renderer.render(make_request()) == VALID_A4_PDF
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_is_retried_on_demand_at_most_once_per_cooldown():
+    renderer = PrintPdfRenderer(startup_wait_ms=1000)
+    launches = fake_startup(renderer, 0)
+    await renderer.start_in_background()
+
+    with pytest.raises(PdfRenderUnavailableError):
+        await renderer.render(make_request())
+
+    assert len(launches) == 1
+    assert renderer.startup_state == "failed"
+    renderer._startup_failed_at -= 61
+    with pytest.raises(PdfRenderUnavailableError):
+        await renderer.render(make_request())
+    assert len(launches) == 2
+
+
+def test_health_reports_degraded_while_pdf_renderer_is_starting(monkeypatch):
+    import server
+
+    class StartingRenderer:
+        available = False
+        startup_state = "starting"
+
+    monkeypatch.setattr(server, "pdf_renderer", StartingRenderer())
+
+    body = TestClient(server.app).get("/api/health").json()
+
+    assert body["readiness"] == "degraded"
+    assert body["capabilities"] == {"pdf": {"available": False, "startup": "starting"}}
+
+
 def test_health_reports_ready_when_pdf_is_available(monkeypatch):
     import server
 
@@ -551,6 +1231,7 @@ def test_pdf_health_canary_renders_a_minimal_pdf(monkeypatch):
     assert renderer.requests[0].page.width_mm == 210
     assert renderer.requests[0].page.height_mm == 297
     assert renderer.requests[0].meta.page_count_expected == 1
+    assert renderer.use_cache == [False]
 
 
 def test_pdf_health_canary_returns_503_when_renderer_is_unavailable(monkeypatch):
@@ -604,3 +1285,20 @@ async def test_real_chromium_render_produces_single_a4_pdf():
     width_pt, height_pt = _pdf_media_box_points(pdf)
     assert width_pt == pytest.approx(595.28, abs=3)
     assert height_pt == pytest.approx(841.89, abs=3)
+
+
+def test_print_pdf_endpoint_sends_retry_after_when_render_queue_is_full(monkeypatch):
+    import server
+
+    class FullQueueRenderer:
+        async def render(self, request):
+            raise PdfRenderBusyError(retry_after_seconds=7)
+
+    monkeypatch.setattr(server, "pdf_renderer", FullQueueRenderer())
+    client = TestClient(server.app)
+
+    response = client.post("/api/print/pdf", json=make_request().model_dump())
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
+    assert response.json()["detail"]["code"] == "pdf_render_busy"
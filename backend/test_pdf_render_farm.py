@@ -0,0 +1,149 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.testclient import TestClient
+
+from pdf_render import PdfRenderError
+from pdf_render_farm import PdfRenderFarm
+from test_pdf_render import VALID_A4_PDF, FakeBrowser, FakePage, make_request
+
+CRASH_MARKER = "crash-this-worker"
+
+
+class CrashingPage(FakePage):
+    async def set_content(self, html, **kwargs):
+        if CRASH_MARKER in html:
+            os._exit(1)
+        await super().set_content(html, **kwargs)
+
+
+class CrashingBrowser(FakeBrowser):
+    version = "fake-chromium-1"
+
+    async def new_context(self, **kwargs):
+        context = await super().new_context(**kwargs)
+        context.page = CrashingPage()
+        return context
+
+
+async def crashing_browser():
+    return CrashingBrowser()
+
+
+async def _wait_until_ready(farm, timeout=30):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not all(worker["state"] == "ready" for worker in farm.worker_health()):
+        assert asyncio.get_running_loop().time() < deadline, farm.worker_health()
+        await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+async def farm():
+    farm = PdfRenderFarm(workers=1, browser_factory=crashing_browser)
+    await farm.startup()
+    yield farm
+    await farm.shutdown()
+
+
+async def test_farm_renders_in_a_separate_worker_process(farm):
+    assert farm.available
+    assert farm.renderer_version == "fake-chromium-1"
+
+    assert await farm.render(make_request()) == VALID_A4_PDF
+
+    [worker] = farm.worker_health()
+    assert worker["state"] == "ready"
+    assert worker["pid"] not in (None, os.getpid())
+    assert worker["renders"] == 1
+    assert farm.stats()["workers"] == [worker]
+
+
+async def test_farm_restarts_a_crashed_worker(farm):
+    first_pid = farm.worker_health()[0]["pid"]
+
+    with pytest.raises(PdfRenderError) as exc_info:
+        await farm.render(make_request(html=f"<main>{CRASH_MARKER}</main>"))
+    assert exc_info.value.code == "pdf_render_failed"
+
+    await _wait_until_ready(farm)
+    assert await farm.render(make_request()) == VALID_A4_PDF
+    [worker] = farm.worker_health()
+    assert worker["restarts"] == 1
+    assert worker["pid"] != first_pid
+    assert worker["lastError"] == "PDF render worker exited"
+
+
+async def test_retiring_a_worker_does_not_block_the_event_loop(monkeypatch):
+    farm = PdfRenderFarm(workers=1, browser_factory=crashing_browser)
+    [worker] = farm._workers
+    restarted = []
+
+    def slow_kill():
+        time.sleep(0.3)
+
+    async def start_worker(retired):
+        restarted.append(retired)
+
+    monkeypatch.setattr(worker, "kill", slow_kill)
+    monkeypatch.setattr(farm, "_start_worker", start_worker)
+
+    started = time.perf_counter()
+    farm._retire(worker, "render abandoned")
+    await asyncio.sleep(0)
+    assert time.perf_counter() - started < 0.1
+    assert worker.state == "restarting"
+
+    await asyncio.gather(*list(farm._pool_tasks))
+    await asyncio.gather(*list(farm._pool_tasks))
+    assert restarted == [worker]
+
+
+async def test_farm_does_not_wait_on_the_default_executor():
+    loop = asyncio.get_running_loop()
+    release = threading.Event()
+    default_executor = ThreadPoolExecutor(max_workers=1)
+    loop.set_default_executor(default_executor)
+    hog = asyncio.ensure_future(asyncio.to_thread(release.wait, 30))
+    farm = PdfRenderFarm(workers=1, browser_factory=crashing_browser)
+    try:
+        await asyncio.wait_for(farm.startup(), timeout=30)
+        assert await asyncio.wait_for(farm.render(make_request()), timeout=10) == VALID_A4_PDF
+        assert not hog.done()
+    finally:
+        release.set()
+        await hog
+        await farm.shutdown()
+        default_executor.shutdown()
+
+
+async def test_farm_reports_no_workers_after_shutdown():
+    farm = PdfRenderFarm(workers=2, browser_factory=crashing_browser)
+    await farm.startup()
+    await farm.shutdown()
+
+    assert not farm.available
+    assert [worker["state"] for worker in farm.worker_health()] == ["stopped", "stopped"]
+    assert [worker["alive"] for worker in farm.worker_health()] == [False, False]
+
+
+def test_health_lists_render_workers(monkeypatch):
+    import server
+
+    class HealthyFarm:
+        available = True
+
+        def worker_health(self):
+            return [{"index": 0, "state": "ready", "alive": True}]
+
+    monkeypatch.setattr(server, "pdf_renderer", HealthyFarm())
+
+    body = TestClient(server.app).get("/api/health").json()
+
+    assert body["capabilities"]["pdf"] == {
+        "available": True,
+        "workers": [{"index": 0, "state": "ready", "alive": True}],
+    }
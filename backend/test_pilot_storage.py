@@ -1366,3 +1366,25 @@ def test_dictionary_export_redacts_correction_context_by_default(tmp_path):
         )
     finally:
         store.close()
+
+
+def test_dictionary_data_version_persists_and_is_shared_across_connections(tmp_path):
+    db_path = tmp_path / "versioned.db"
+    store = PilotStore(db_path).connect()
+    other = PilotStore(db_path).connect()
+    try:
+        assert store.dictionary_data_version == 0
+        store.upsert_dictionary_entry("64-17-5", name_en="Versioned Ethanol")
+        other.upsert_alias("versioned alias", "en", "64-17-5")
+
+        assert store.dictionary_data_version == 2
+        assert other.dictionary_data_version == 2
+    finally:
+        other.close()
+        store.close()
+
+    reopened = PilotStore(db_path).connect()
+    try:
+        assert reopened.dictionary_data_version == 2
+    finally:
+        reopened.close()
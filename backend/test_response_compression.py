@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import response_compression
+import server
+from response_compression import choose_content_encoding
+
+STATEMENTS = [
+    {"code": f"P{200 + index}", "text_en": "Wear protective gloves.", "text_zh": "穿戴防護手套。"}
+    for index in range(20)
+]
+
+
+def _heavy_search(monkeypatch):
+    async def fake_search_chemical(cas_number, _http_client):
+        return server.ChemicalResult(
+            cas_number=cas_number,
+            found=True,
+            name_en="Ethanol",
+            name_zh="乙醇",
+            precautionary_statements=STATEMENTS,
+            other_classifications=[server.GHSReport(precautionary_statements=STATEMENTS, source="ECHA")],
+        )
+
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_gzip_is_negotiated_from_accept_encoding(monkeypatch, header, expected):
+    monkeypatch.setattr(response_compression, "brotli", None)
+    assert choose_content_encoding(header) == expected
+
+
+async def test_large_batch_search_is_gzipped_and_decodes_to_the_same_rows(monkeypatch):
+    _heavy_search(monkeypatch)
+    cas_numbers = [f"{index}-00-0" for index in range(50, 90)]
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        plain = await ac.post(
+            "/api/search",
+            json={"cas_numbers": cas_numbers},
+            headers={"accept-encoding": "identity"},
+        )
+        compressed = await ac.post(
+            "/api/search",
+            json={"cas_numbers": cas_numbers},
+            headers={"accept-encoding": "gzip"},
+        )
+
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert int(compressed.headers["content-length"]) < len(plain.content) // 10
+    assert compressed.content == plain.content
+    rows = plain.json()
+    assert [row["cas_number"] for row in rows] == cas_numbers
+    assert rows == [
+        server.ChemicalResult.model_validate(row).model_dump(mode="json") for row in rows
+    ]
+
+
+async def test_small_and_streamed_responses_are_not_compressed(monkeypatch):
+    _heavy_search(monkeypatch)
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        small = await ac.get("/api/", headers={"accept-encoding": "gzip"})
+        streamed = await ac.post(
+            "/api/search/stream",
+            json={"cas_numbers": ["50-00-0", "51-00-0"]},
+            headers={"accept-encoding": "gzip"},
+        )
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in streamed.headers
+    assert [json.loads(line)["type"] for line in streamed.text.splitlines()][-1] == "summary"
+
+
+def test_gzip_output_is_deterministic():
+    body = json.dumps(STATEMENTS).encode("utf-8")
+    assert response_compression.compress_body(body, "gzip") == response_compression.compress_body(body, "gzip")
+    assert gzip.decompress(response_compression.compress_body(body, "gzip")) == body
@@ -0,0 +1,174 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from limits import parse
+from starlette.websockets import WebSocketDisconnect
+
+import server
+
+CHANNEL = "/api/ws/search-by-name"
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    monkeypatch.setattr(server, "NAME_SEARCH_WS_WARM_TOP", False)
+    monkeypatch.setattr(server, "NAME_SEARCH_WS_WARM_DELAY_SECONDS", 0)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+    server.limiter.reset()
+    server.cid_cache.clear()
+    yield TestClient(server.app)
+    server.limiter.reset()
+
+
+async def _http_name_search(query):
+    from httpx import ASGITransport, AsyncClient
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        return (await ac.get(f"/api/search-by-name/{query}")).json()
+
+
+async def test_channel_pushes_the_same_results_as_the_http_route(channel):
+    expected = await _http_name_search("ethanol")
+
+    with channel.websocket_connect(CHANNEL) as ws:
+        ws.send_json({"q": "ethanol", "seq": 7})
+        message = ws.receive_json()
+        ws.send_text("not json")
+        invalid = ws.receive_json()
+        ws.send_json({"q": "x" * (server.MAX_PUBLIC_SEARCH_QUERY_LENGTH + 1), "seq": 8})
+        too_long = ws.receive_json()
+
+    assert message == {"type": "results", "seq": 7, **expected}
+    assert invalid == {"type": "error", "seq": None, "code": "invalid_message"}
+    assert too_long["code"] == "query_too_long"
+    assert server.ops_counters["search.ws.connections"] == 1
+
+
+def test_new_query_cancels_the_previous_speculative_warm(channel, monkeypatch):
+    events = []
+
+    async def slow_search_chemical(cas_number, _http_client):
+        events.append(("start", cas_number))
+        try:
+            await server.asyncio.sleep(30)
+        except server.asyncio.CancelledError:
+            events.append(("cancelled", cas_number))
+            raise
+
+    monkeypatch.setattr(server, "NAME_SEARCH_WS_WARM_TOP", True)
+    monkeypatch.setattr(server, "search_chemical", slow_search_chemical)
+
+    with channel.websocket_connect(CHANNEL) as ws:
+        ws.send_json({"q": "ethanol", "seq": 1})
+        first = ws.receive_json()
+        _wait_for(lambda: events)
+        ws.send_json({"q": "acetone", "seq": 2})
+        second = ws.receive_json()
+        _wait_for(lambda: len(events) >= 3)
+
+    top = first["results"][0]["cas_number"]
+    assert (first["seq"], second["seq"]) == (1, 2)
+    assert events[:2] == [("start", top), ("cancelled", top)]
+    assert server.ops_counters["search.ws.superseded"] == 1
+
+
+def test_warm_reports_cached_lookup_within_its_budget(channel, monkeypatch):
+    calls = []
+
+    async def fake_search_chemical(cas_number, _http_client):
+        calls.append(cas_number)
+        return server.ChemicalResult(cas_number=cas_number, found=True)
+
+    monkeypatch.setattr(server, "NAME_SEARCH_WS_WARM_TOP", True)
+    monkeypatch.setattr(server, "_NAME_SEARCH_WS_WARM_LIMIT", parse("1/minute"))
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+
+    with channel.websocket_connect(CHANNEL) as ws:
+        ws.send_json({"q": "ethanol", "seq": 1})
+        results = ws.receive_json()
+        warmed = ws.receive_json()
+        ws.send_json({"q": "acetone", "seq": 2})
+        ws.receive_json()
+        _wait_for(lambda: server.ops_counters["search.ws.warm.budget_exhausted"] == 1)
+
+    assert warmed == {
+        "type": "warmed",
+        "seq": 1,
+        "cas_number": results["results"][0]["cas_number"],
+        "found": True,
+    }
+    assert len(calls) == 1
+
+
+def test_channel_queries_share_the_http_rate(channel, monkeypatch):
+    monkeypatch.setattr(server, "_NAME_SEARCH_WS_QUERY_LIMIT", parse("2/minute"))
+
+    with channel.websocket_connect(CHANNEL) as ws:
+        for seq in (1, 2, 3):
+            ws.send_json({"q": "ethanol", "seq": seq})
+        replies = [ws.receive_json() for _ in range(3)]
+
+    limited = [reply for reply in replies if reply["type"] == "error"]
+    assert [reply["seq"] for reply in limited] == [3]
+    assert limited[0]["code"] == "rate_limited"
+    assert limited[0]["retry_after"] >= 1
+    assert server.NAME_SEARCH_RATE_LIMIT == "60/minute"
+    assert [str(limit.limit) for limit in server.limiter._route_limits["server.search_by_name"]] == [
+        "60 per 1 minute"
+    ]
+
+
+def test_rate_limited_query_leaves_the_answer_in_flight(channel, monkeypatch):
+    events = []
+
+    async def slow_search_chemical(cas_number, _http_client):
+        events.append(("start", cas_number))
+        try:
+            await server.asyncio.sleep(30)
+        except server.asyncio.CancelledError:
+            events.append(("cancelled", cas_number))
+            raise
+
+    monkeypatch.setattr(server, "NAME_SEARCH_WS_WARM_TOP", True)
+    monkeypatch.setattr(server, "_NAME_SEARCH_WS_QUERY_LIMIT", parse("1/minute"))
+    monkeypatch.setattr(server, "search_chemical", slow_search_chemical)
+
+    with channel.websocket_connect(CHANNEL) as ws:
+        ws.send_json({"q": "ethanol", "seq": 1})
+        ws.receive_json()
+        _wait_for(lambda: events)
+        ws.send_json({"q": "acetone", "seq": 2})
+        limited = ws.receive_json()
+        in_flight_events = list(events)
+
+    assert limited["code"] == "rate_limited"
+    assert [event for event, _ in in_flight_events] == ["start"]
+    assert server.ops_counters["search.ws.superseded"] == 0
+
+
+def test_channel_answers_binary_frames_with_an_error(channel):
+    with channel.websocket_connect(CHANNEL) as ws:
+        ws.send_bytes(b'{"q": "ethanol"}')
+        invalid = ws.receive_json()
+        ws.send_json({"q": "ethanol", "seq": 1})
+        results = ws.receive_json()
+
+    assert invalid == {"type": "error", "seq": None, "code": "invalid_message"}
+    assert results["type"] == "results"
+
+
+def test_channel_rejects_foreign_browser_origins(channel):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with channel.websocket_connect(CHANNEL, headers={"origin": "https://evil.example"}):
+            pass
+
+    assert exc_info.value.code == 1008
@@ -86,3 +86,27 @@ async def test_batch_search_runs_items_inside_one_gateway_budget(monkeypatch):
     assert len(body) == 10
     assert all(row["found"] is False for row in body)
     assert all(row["upstream_error"] is True for row in body)
+
+
+async def test_batch_search_looks_up_each_normalized_cas_once(monkeypatch):
+    calls = []
+
+    async def fake_search_chemical(cas_number, _http_client):
+        calls.append(cas_number)
+        return server.ChemicalResult(cas_number=cas_number, found=True, name_en="Ethanol")
+
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+    monkeypatch.setattr(server, "ops_counters", server.Counter())
+
+    queries = ["64175", "64-17-5", "0064-17-5", "7732-18-5", "64-17-5"]
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/search", json={"cas_numbers": queries})
+
+    assert response.status_code == 200
+    assert sorted(calls) == ["64175", "7732-18-5"]
+    assert [row["cas_number"] for row in response.json()] == queries
+    assert all(row["name_en"] == "Ethanol" for row in response.json())
+    assert server.ops_counters["search.batch.rows"] == 5
+    assert server.ops_counters["search.batch.lookups"] == 2
+    assert server.ops_counters["search.batch.deduped_rows"] == 3
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from httpx import ASGITransport, AsyncClient
+
+import server
+
+
+def _fake_search(delays):
+    async def fake_search_chemical(cas_number, _http_client):
+        await asyncio.sleep(delays.get(cas_number, 0))
+        if cas_number == "upstream":
+            return server.ChemicalResult(cas_number=cas_number, upstream_error=True)
+        if cas_number == "missing":
+            return server.ChemicalResult(cas_number=cas_number, found=False)
+        return server.ChemicalResult(cas_number=cas_number, found=True, name_en=f"Name {cas_number}")
+
+    return fake_search_chemical
+
+
+async def test_search_stream_emits_rows_in_completion_order_with_summary(monkeypatch):
+    monkeypatch.setattr(
+        server,
+        "search_chemical",
+        _fake_search({"7732-18-5": 0.2, "upstream": 0.05}),
+    )
+    misses = []
+    monkeypatch.setattr(
+        server,
+        "_record_dictionary_miss",
+        lambda query, kind, endpoint, **kwargs: misses.append((query, kind, endpoint)),
+    )
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/search/stream",
+            json={"cas_numbers": ["7732-18-5", "64-17-5", "upstream", "missing"]},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["type"] for record in records] == ["result"] * 4 + ["summary"]
+    assert [record["index"] for record in records[:4]] == [1, 3, 2, 0]
+    assert records[0]["query"] == "64-17-5"
+    assert records[0]["result"]["name_en"] == "Name 64-17-5"
+    assert records[-1]["total"] == 4
+    assert records[-1]["found"] == 2
+    assert records[-1]["not_found"] == 1
+    assert records[-1]["upstream_error"] == 1
+    assert misses == [("missing", "cas", "search_batch")]
+
+
+async def test_search_stream_supports_server_sent_events(monkeypatch):
+    monkeypatch.setattr(server, "search_chemical", _fake_search({}))
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/search/stream",
+            json={"cas_numbers": ["64-17-5"]},
+            headers={"accept": "text/event-stream"},
+        )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [chunk for chunk in response.text.split("\n\n") if chunk]
+    assert events[0].startswith("event: result\ndata: ")
+    assert json.loads(events[0].split("data: ", 1)[1])["index"] == 0
+    assert events[1].startswith("event: summary\ndata: ")
+
+
+async def test_search_stream_validates_payload_like_batch_search():
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/search/stream", json={"cas_numbers": []})
+
+    assert response.status_code == 422
+
+
+def test_search_stream_uses_batch_search_rate_limit():
+    def limits_for(endpoint_name):
+        return [
+            str(limit.limit)
+            for key, route_limits in server.limiter._route_limits.items()
+            if key.endswith(f".{endpoint_name}")
+            for limit in route_limits
+        ]
+
+    assert limits_for("search_chemicals_stream") == limits_for("search_chemicals") == ["10 per 1 minute"]
+
+
+async def test_search_stream_fans_one_lookup_out_to_repeated_rows(monkeypatch):
+    calls = []
+
+    async def fake_search_chemical(cas_number, _http_client):
+        calls.append(cas_number)
+        return server.ChemicalResult(cas_number=cas_number, found=True)
+
+    monkeypatch.setattr(server, "search_chemical", fake_search_chemical)
+
+    transport = ASGITransport(app=server.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/search/stream",
+            json={"cas_numbers": ["64-17-5", "7732-18-5", "64175"]},
+        )
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert calls == ["64-17-5", "7732-18-5"]
+    assert {(record["index"], record["result"]["cas_number"]) for record in records[:3]} == {
+        (0, "64-17-5"),
+        (1, "7732-18-5"),
+        (2, "64175"),
+    }
+    assert records[-1]["found"] == 3
@@ -0,0 +1,128 @@
+import hashlib
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import chemical_dict
+import seed_dictionary
+import server
+from seed_dictionary import (
+    SEED_DICTIONARY_ARTIFACT_PATH,
+    SEED_DICTIONARY_SOURCE_PATH,
+    SEED_DICTIONARY_TABLES,
+    CompiledStringMap,
+    SeedDictionaryArtifactError,
+    compile_seed_dictionary,
+    load_seed_dictionary,
+    read_seed_dictionary,
+    seed_source_digest,
+    seed_tables_from_source,
+)
+
+
+def test_committed_artifact_is_fresh_for_chemical_dict_source():
+    expected = compile_seed_dictionary(
+        seed_tables_from_source(chemical_dict),
+        source_digest=seed_source_digest(SEED_DICTIONARY_SOURCE_PATH),
+    )
+
+    assert SEED_DICTIONARY_ARTIFACT_PATH.read_bytes() == expected, (
+        "seed_dictionary.bin is stale; run scripts/compile_seed_dictionary.py"
+    )
+
+
+def test_compiled_tables_match_source_dictionary_exactly_and_in_order():
+    compiled = load_seed_dictionary()
+    source = seed_tables_from_source(chemical_dict)
+
+    assert list(compiled) == list(SEED_DICTIONARY_TABLES)
+    for name in SEED_DICTIONARY_TABLES:
+        table = compiled[name]
+        assert len(table) == len(source[name]), name
+        assert list(table.items()) == list(source[name].items()), name
+        assert list(table) == list(source[name]), name
+        for key, value in source[name].items():
+            assert key in table
+            assert table[key] == value
+
+
+def test_clean_name_index_matches_runtime_regex_derivation():
+    compiled = load_seed_dictionary()["CLEAN_NAME_INDEX"]
+    expected = {}
+    for en_name, zh_name in chemical_dict.CHEMICAL_NAMES_ZH_EXPANDED.items():
+        expected["".join(ch for ch in en_name if ch.isascii() and (ch.isdigit() or ch.islower()))] = zh_name
+
+    assert dict(compiled.items()) == expected
+
+
+def test_server_serves_compiled_tables():
+    assert seed_dictionary.seed_dictionary_backend() == "compiled"
+    assert isinstance(server.EN_TO_CAS, CompiledStringMap)
+    assert server.EN_TO_CAS["ethanol"] == chemical_dict.EN_TO_CAS["ethanol"]
+    assert server.get_chinese_name_from_dict("Ethanol") is not None
+
+
+def test_compiled_map_lookups_reject_missing_and_non_string_keys():
+    table = read_seed_dictionary(
+        compile_seed_dictionary(
+            {name: {} for name in SEED_DICTIONARY_TABLES} | {"ZH_TO_CAS": {"乙醇": "64-17-5", "甲醇": "67-56-1"}},
+            source_digest=b"\x00" * 32,
+        )
+    )["ZH_TO_CAS"]
+
+    assert table.get("乙醇") == "64-17-5"
+    assert table.get("丙酮") is None
+    assert 42 not in table
+    assert list(table) == ["乙醇", "甲醇"]
+    with pytest.raises(KeyError):
+        table["丙酮"]
+
+
+def test_compiled_map_writes_copy_without_touching_shared_buffer():
+    artifact = compile_seed_dictionary(
+        {name: {"a": "1", "b": "2"} for name in SEED_DICTIONARY_TABLES},
+        source_digest=b"\x00" * 32,
+    )
+    tables = read_seed_dictionary(artifact)
+    table = tables["EN_TO_CAS"]
+
+    table["c"] = "3"
+    del table["a"]
+
+    assert dict(table.items()) == {"b": "2", "c": "3"}
+    assert dict(tables["ZH_TO_CAS"].items()) == {"a": "1", "b": "2"}
+    assert dict(read_seed_dictionary(artifact)["EN_TO_CAS"].items()) == {"a": "1", "b": "2"}
+
+
+def test_loader_rejects_stale_truncated_or_foreign_artifacts(tmp_path):
+    source = tmp_path / "chemical_dict.py"
+    source.write_text("CAS_TO_ZH = {}\n", encoding="utf-8")
+    artifact = compile_seed_dictionary(
+        {name: {"k": "v"} for name in SEED_DICTIONARY_TABLES},
+        source_digest=hashlib.sha256(b"older source").digest(),
+    )
+    artifact_path = tmp_path / "seed_dictionary.bin"
+    artifact_path.write_bytes(artifact)
+
+    with pytest.raises(SeedDictionaryArtifactError, match="stale"):
+        load_seed_dictionary(artifact_path, source_path=source)
+    assert load_seed_dictionary(artifact_path, source_path=None)["EN_TO_CAS"]["k"] == "v"
+
+    with pytest.raises(SeedDictionaryArtifactError):
+        read_seed_dictionary(artifact[:80])
+    with pytest.raises(SeedDictionaryArtifactError, match="header"):
+        read_seed_dictionary(b"NOTSEED!" + artifact[8:])
+
+
+def test_server_import_serves_seed_tables_without_loading_chemical_dict():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, server; print('chemical_dict' in sys.modules)"],
+        cwd=Path(__file__).parent,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "False"